@@ -0,0 +1,228 @@
+# Arquivo: armazenamento_binario.py
+#
+# Formato binário compacto para conjuntos de instâncias. Um pacote é formado
+# por dois arquivos com o mesmo nome base:
+#
+#   <base>.bin       arrays float64 (little-endian) de todas as instâncias, em sequência
+#   <base>.idx.json  índice (codigo, replica) -> posição do bloco no .bin e configuração
+#
+# O bloco de cada instância contém, nesta ordem, a matriz de setup N_JOBS x N_JOBS
+# (inf na diagonal, como em Cenario.matriz_setup), os tempos de processamento e
+# os ready times. O .bin é lido por memory-mapping: carregar uma instância lê
+# apenas as páginas do seu bloco, sem interpretar as demais.
+#
+# Uso do conversor:
+#   python armazenamento_binario.py para_binario instancias pacotes/instancias
+#   python armazenamento_binario.py para_json pacotes/instancias instancias_json
+
+import os
+import glob
+import json
+import argparse
+
+import numpy as np
+
+from instancia import Instancia
+from matriz_setup import SetupProcedural
+from resultados import replica_do_arquivo
+
+VERSAO_FORMATO = 1
+DTYPE = np.dtype('<f8')
+
+
+def chave_da_instancia(codigo, replica):
+    return f"{codigo}_{replica}"
+
+
+class PacoteBinario:
+    """
+    Pacote de instâncias em formato binário com índice.
+
+    Parâmetros:
+        caminho_base (str): caminho sem extensão; são usados '<base>.bin' e '<base>.idx.json'.
+        modo (str): 'r' para leitura ou 'a' para acrescentar instâncias (cria o pacote se necessário).
+    """
+    def __init__(self, caminho_base, modo='r'):
+        if modo not in ('r', 'a'):
+            raise ValueError("O modo do pacote deve ser 'r' ou 'a'.")
+        self.caminho_base = caminho_base
+        self.caminho_dados = caminho_base + '.bin'
+        self.caminho_indice = caminho_base + '.idx.json'
+        self.modo = modo
+        self._dados = None
+        self._arquivo = None
+
+        if os.path.exists(self.caminho_indice):
+            with open(self.caminho_indice, 'r') as f:
+                indice = json.load(f)
+            if indice.get('versao') != VERSAO_FORMATO:
+                raise ValueError(f"Versão de pacote não suportada: {indice.get('versao')}")
+            self.entradas = indice['instancias']
+        elif modo == 'r':
+            raise FileNotFoundError(f"Índice do pacote '{self.caminho_indice}' não encontrado.")
+        else:
+            self.entradas = {}
+
+        if modo == 'a':
+            pasta = os.path.dirname(self.caminho_dados)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            self._arquivo = open(self.caminho_dados, 'ab')
+            # Descarta dados gravados após a última entrada indexada (execução interrompida)
+            self._arquivo.truncate(self._fim_indexado())
+            self._arquivo.seek(0, os.SEEK_END)
+
+    def _fim_indexado(self):
+        return max((e['offset'] + e['n_jobs'] * (e['n_jobs'] + 2) * DTYPE.itemsize
+                    for e in self.entradas.values()), default=0)
+
+    # --- ESCRITA ---
+
+    def adicionar(self, codigo, replica, configuracao, matriz_setup, tempos_processamento, ready_times):
+        """Acrescenta uma instância ao final do .bin e registra sua posição no índice."""
+        if self._arquivo is None:
+            raise ValueError("Pacote aberto somente para leitura.")
+        n = configuracao['n_jobs']
+        offset = self._arquivo.tell()
+        for array, forma in ((matriz_setup, (n, n)), (tempos_processamento, (n,)), (ready_times, (n,))):
+            self._arquivo.write(np.ascontiguousarray(array, dtype=DTYPE).reshape(forma).tobytes())
+        self.entradas[chave_da_instancia(codigo, replica)] = {
+            'codigo_cenario': codigo, 'replica': replica, 'offset': offset,
+            'n_jobs': n, 'configuracao': configuracao,
+        }
+
+    def adicionar_cenario(self, cenario, replica):
+        if cenario.matriz_setup is None: cenario.gerar_dados(verbose=False)
+        self.adicionar(cenario.codigo, replica, cenario.configuracao(), cenario.matriz_setup_densa(),
+                       cenario.tempos_processamento, cenario.ready_times)
+
+    def salvar_indice(self):
+        """Grava o índice de forma atômica. Deve ser chamado depois que os dados foram gravados."""
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        temporario = self.caminho_indice + '.tmp'
+        with open(temporario, 'w') as f:
+            json.dump({'versao': VERSAO_FORMATO, 'dtype': DTYPE.str, 'instancias': self.entradas}, f)
+        os.replace(temporario, self.caminho_indice)
+
+    # --- LEITURA ---
+
+    def chaves(self):
+        return list(self.entradas.keys())
+
+    def __contains__(self, chave):
+        return chave in self.entradas
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def _mapa(self):
+        if self._dados is None:
+            self._dados = np.memmap(self.caminho_dados, dtype=DTYPE, mode='r')
+        return self._dados
+
+    def arrays(self, chave):
+        """Retorna (configuracao, matriz_setup, tempos, ready_times) como visões do arquivo mapeado."""
+        entrada = self.entradas[chave]
+        n = entrada['n_jobs']
+        inicio = entrada['offset'] // DTYPE.itemsize
+        bloco = self._mapa()[inicio:inicio + n * (n + 2)]
+        return entrada['configuracao'], bloco[:n * n].reshape(n, n), bloco[n * n:n * n + n], bloco[n * n + n:]
+
+    def carregar(self, chave):
+        """Cria a Instancia de uma entrada do pacote, lendo apenas o seu bloco."""
+        configuracao, matriz, tempos, ready_times = self.arrays(chave)
+        return Instancia(configuracao, tempos, matriz, ready_times)
+
+    def carregar_dict(self, chave):
+        """Retorna a instância no mesmo formato de Cenario.to_dict (diagonal como None)."""
+        configuracao, matriz, tempos, ready_times = self.arrays(chave)
+        matriz_obj = np.array(matriz, dtype=np.float64).astype(object)
+        matriz_obj[np.isinf(matriz)] = None
+        return {"configuracao": configuracao, "matriz_setup": matriz_obj.tolist(),
+                "tempos_processamento": np.array(tempos).tolist(), "ready_times": np.array(ready_times).tolist()}
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self.salvar_indice()
+            self._arquivo.close()
+            self._arquivo = None
+        self._dados = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def carregar_instancia_binaria(caminho_base, codigo, replica):
+    """Carrega uma única instância de um pacote binário."""
+    return PacoteBinario(caminho_base).carregar(chave_da_instancia(codigo, replica))
+
+
+# --- CONVERSÃO ENTRE OS FORMATOS ---
+
+def converter_json_para_binario(pasta_instancias, caminho_base):
+    """
+    Grava as instâncias .json da pasta (busca recursiva) em um pacote binário.
+
+    Só são lidos os arquivos de instância (com a chave 'configuracao'); outros
+    .json da pasta, como índices de pacotes e métricas, são ignorados. Uma
+    instância cuja chave (codigo, replica) já está no pacote não é gravada de
+    novo, de modo que a conversão pode ser repetida sobre um pacote existente.
+    Retorna o número de instâncias acrescentadas.
+    """
+    arquivos = sorted(glob.glob(os.path.join(pasta_instancias, '**', '*.json'), recursive=True))
+    convertidas = 0
+    with PacoteBinario(caminho_base, modo='a') as pacote:
+        for caminho in arquivos:
+            with open(caminho, 'r') as f:
+                dados = json.load(f)
+            if not isinstance(dados, dict) or 'configuracao' not in dados:
+                continue
+            configuracao = dados['configuracao']
+            replica = replica_do_arquivo(caminho)
+            if chave_da_instancia(configuracao['codigo_cenario'], replica) in pacote:
+                continue
+            if isinstance(dados['matriz_setup'], dict):
+                # Setup procedural: o pacote guarda a matriz densa
+                matriz = SetupProcedural.de_parametros(dados['matriz_setup']).matriz_tarefas()
+            else:
+                matriz = np.array(dados['matriz_setup'], dtype=np.float64)
+                matriz[np.isnan(matriz)] = np.inf
+            pacote.adicionar(configuracao['codigo_cenario'], replica, configuracao, matriz,
+                             dados['tempos_processamento'], dados['ready_times'])
+            convertidas += 1
+    return convertidas
+
+
+def converter_binario_para_json(caminho_base, pasta_saida):
+    """Recria a árvore '<pasta>/<CODIGO>/<CODIGO>_<replica>.json' a partir de um pacote."""
+    pacote = PacoteBinario(caminho_base)
+    for chave, entrada in pacote.entradas.items():
+        pasta_cenario = os.path.join(pasta_saida, entrada['codigo_cenario'])
+        os.makedirs(pasta_cenario, exist_ok=True)
+        with open(os.path.join(pasta_cenario, f"{chave}.json"), 'w') as f:
+            json.dump(pacote.carregar_dict(chave), f, indent=4)
+    return len(pacote)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte instâncias entre o formato .json e o pacote binário.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_bin = sub.add_parser('para_binario', help='Converte uma pasta de instâncias .json em um pacote binário.')
+    p_bin.add_argument('pasta_instancias', type=str)
+    p_bin.add_argument('caminho_base', type=str, help='Caminho do pacote, sem extensão.')
+
+    p_json = sub.add_parser('para_json', help='Converte um pacote binário em uma pasta de instâncias .json.')
+    p_json.add_argument('caminho_base', type=str, help='Caminho do pacote, sem extensão.')
+    p_json.add_argument('pasta_saida', type=str)
+
+    args = parser.parse_args()
+    if args.comando == 'para_binario':
+        total = converter_json_para_binario(args.pasta_instancias, args.caminho_base)
+    else:
+        total = converter_binario_para_json(args.caminho_base, args.pasta_saida)
+    print(f"{total} instâncias convertidas.")
@@ -0,0 +1,264 @@
+# Arquivo: avaliacao_incremental.py
+
+import math
+
+# --- TIPOS DE MOVIMENTO DA BUSCA LOCAL ---
+TRANSFERENCIA = 'transferencia'
+TROCA_INTER = 'troca_inter'
+TROCA_INTRA = 'troca_intra'
+
+
+class AvaliadorIncremental:
+    """
+    Avalia movimentos da busca local sem copiar a solução.
+
+    Para cada máquina é mantida a lista de tempos de conclusão acumulados
+    (prefixos) da sua sequência. Como uma transferência ou troca altera no
+    máximo duas máquinas, o tempo de uma máquina vizinha é obtido retomando o
+    cálculo a partir do prefixo que não muda, e o makespan do vizinho a partir
+    dos tempos já conhecidos das máquinas intocadas. As operações de ponto
+    flutuante são feitas na mesma ordem de `calculate_sequence_time`, de modo
+    que os valores obtidos são idênticos aos do recálculo completo.
+
+    Com `contar`, o número de vizinhos avaliados em cada vizinhança é
+    acumulado em `avaliacoes` (métricas e comparação de estratégias). Sem ele,
+    a avaliação de um vizinho não executa nenhuma contagem.
+    """
+    def __init__(self, solucao, instancia, contar=False):
+        self.instancia = instancia
+        self.p = instancia.tempos_lista
+        self.s = instancia.setup_lista
+        self.r = instancia.liberacao_lista
+        self.solucao = {m_id: list(seq) for m_id, seq in solucao.items()}
+        self.machine_ids = list(self.solucao.keys())
+        self.prefixos = {m_id: self._calcular_prefixos(seq) for m_id, seq in self.solucao.items()}
+        self.contar = contar
+        self.avaliacoes = {TRANSFERENCIA: 0, TROCA_INTER: 0, TROCA_INTRA: 0}
+        if contar:
+            # A versão que conta substitui `avaliar` só nesta instância
+            self.avaliar = self._avaliar_contando
+
+    # --- CÁLCULO DOS TEMPOS ---
+
+    def _calcular_prefixos(self, sequencia):
+        """Retorna o tempo de conclusão após cada posição da sequência."""
+        p, s, r = self.p, self.s, self.r
+        prefixos = []
+        concl = 0
+        ultima = 0
+        for tarefa in sequencia:
+            liberacao = r[tarefa]
+            inicio = liberacao if liberacao > concl else concl
+            concl = inicio + s[ultima][tarefa] + p[tarefa]
+            prefixos.append(concl)
+            ultima = tarefa
+        return prefixos
+
+    def _estado_antes(self, m_id, posicao):
+        """Tempo de conclusão e última tarefa antes de `posicao` na máquina `m_id`."""
+        if posicao == 0:
+            return 0, 0
+        return self.prefixos[m_id][posicao - 1], self.solucao[m_id][posicao - 1]
+
+    def _ultima_tarefa(self, m_id):
+        """Última tarefa da máquina, ou o estado inicial (0) se ela estiver vazia."""
+        seq = self.solucao[m_id]
+        return seq[-1] if seq else 0
+
+    def _continuar(self, concl, ultima, tarefas, limite):
+        """
+        Continua o cálculo do tempo de conclusão a partir de (concl, ultima).
+        Interrompe assim que o valor atinge `limite`, já que o tempo de
+        conclusão nunca diminui ao longo da sequência.
+        """
+        p, s, r = self.p, self.s, self.r
+        for tarefa in tarefas:
+            liberacao = r[tarefa]
+            inicio = liberacao if liberacao > concl else concl
+            concl = inicio + s[ultima][tarefa] + p[tarefa]
+            if concl >= limite:
+                return concl
+            ultima = tarefa
+        return concl
+
+    def tempo_maquina(self, m_id):
+        prefixos = self.prefixos[m_id]
+        return prefixos[-1] if prefixos else 0
+
+    def tempos_maquinas(self):
+        return {m_id: self.tempo_maquina(m_id) for m_id in self.machine_ids}
+
+    def makespan(self):
+        tempos = self.tempos_maquinas()
+        return max(tempos.values()) if tempos else 0
+
+    def _maior_tempo_exceto(self, tempos, excluidas):
+        maior = 0
+        for m_id, tempo in tempos.items():
+            if m_id not in excluidas and tempo > maior:
+                maior = tempo
+        return maior
+
+    # --- AVALIAÇÃO DE MOVIMENTOS ---
+    # Cada função retorna o makespan da solução vizinha. Quando `limite` é
+    # informado, o valor retornado só é exato se for menor que `limite`.
+
+    def avaliar_transferencia(self, m_from, i, m_to, limite=math.inf, tempos=None):
+        """Remove a tarefa da posição `i` de `m_from` e a insere no fim de `m_to`."""
+        if tempos is None:
+            tempos = self.tempos_maquinas()
+        makespan = self._maior_tempo_exceto(tempos, (m_from, m_to))
+        if makespan >= limite:
+            return makespan
+        seq_from = self.solucao[m_from]
+        tarefa = seq_from[i]
+        novo_to = self._continuar(tempos[m_to], self._ultima_tarefa(m_to), (tarefa,), limite)
+        if novo_to >= limite:
+            return novo_to
+        concl, ultima = self._estado_antes(m_from, i)
+        novo_from = self._continuar(concl, ultima, seq_from[i + 1:], limite)
+        return max(makespan, novo_from, novo_to)
+
+    def avaliar_troca_inter(self, m1, i, m2, j, limite=math.inf, tempos=None):
+        """Troca a tarefa da posição `i` de `m1` com a da posição `j` de `m2`."""
+        if tempos is None:
+            tempos = self.tempos_maquinas()
+        makespan = self._maior_tempo_exceto(tempos, (m1, m2))
+        if makespan >= limite:
+            return makespan
+        seq1, seq2 = self.solucao[m1], self.solucao[m2]
+        concl, ultima = self._estado_antes(m1, i)
+        novo_1 = self._continuar(concl, ultima, [seq2[j]] + seq1[i + 1:], limite)
+        if novo_1 >= limite:
+            return novo_1
+        concl, ultima = self._estado_antes(m2, j)
+        novo_2 = self._continuar(concl, ultima, [seq1[i]] + seq2[j + 1:], limite)
+        return max(makespan, novo_1, novo_2)
+
+    def avaliar_troca_intra(self, m_id, i, j, limite=math.inf, tempos=None):
+        """Troca as tarefas das posições `i` < `j` dentro da máquina `m_id`."""
+        if tempos is None:
+            tempos = self.tempos_maquinas()
+        makespan = self._maior_tempo_exceto(tempos, (m_id,))
+        if makespan >= limite:
+            return makespan
+        tarefas = self.solucao[m_id][i:]
+        tarefas[0], tarefas[j - i] = tarefas[j - i], tarefas[0]
+        concl, ultima = self._estado_antes(m_id, i)
+        novo = self._continuar(concl, ultima, tarefas, limite)
+        return max(makespan, novo)
+
+    def avaliar(self, movimento, limite=math.inf, tempos=None):
+        tipo, args = movimento[0], movimento[1:]
+        if tipo == TRANSFERENCIA:
+            return self.avaliar_transferencia(*args, limite=limite, tempos=tempos)
+        if tipo == TROCA_INTER:
+            return self.avaliar_troca_inter(*args, limite=limite, tempos=tempos)
+        return self.avaliar_troca_intra(*args, limite=limite, tempos=tempos)
+
+    def _avaliar_contando(self, movimento, limite=math.inf, tempos=None):
+        self.avaliacoes[movimento[0]] += 1
+        return AvaliadorIncremental.avaliar(self, movimento, limite, tempos)
+
+    # --- APLICAÇÃO DE MOVIMENTOS ---
+    # Apenas os prefixos das máquinas afetadas, a partir da posição alterada,
+    # são recalculados.
+
+    def _atualizar_prefixos(self, m_id, posicao):
+        concl, ultima = self._estado_antes(m_id, posicao)
+        prefixos = self.prefixos[m_id][:posicao]
+        p, s, r = self.p, self.s, self.r
+        for tarefa in self.solucao[m_id][posicao:]:
+            liberacao = r[tarefa]
+            inicio = liberacao if liberacao > concl else concl
+            concl = inicio + s[ultima][tarefa] + p[tarefa]
+            prefixos.append(concl)
+            ultima = tarefa
+        self.prefixos[m_id] = prefixos
+
+    def aplicar(self, movimento):
+        tipo = movimento[0]
+        if tipo == TRANSFERENCIA:
+            _, m_from, i, m_to = movimento
+            tarefa = self.solucao[m_from].pop(i)
+            self.solucao[m_to].append(tarefa)
+            self._atualizar_prefixos(m_from, i)
+            self._atualizar_prefixos(m_to, len(self.solucao[m_to]) - 1)
+        elif tipo == TROCA_INTER:
+            _, m1, i, m2, j = movimento
+            seq1, seq2 = self.solucao[m1], self.solucao[m2]
+            seq1[i], seq2[j] = seq2[j], seq1[i]
+            self._atualizar_prefixos(m1, i)
+            self._atualizar_prefixos(m2, j)
+        else:
+            _, m_id, i, j = movimento
+            seq = self.solucao[m_id]
+            seq[i], seq[j] = seq[j], seq[i]
+            self._atualizar_prefixos(m_id, i)
+
+    # --- BUSCA NA VIZINHANÇA ---
+
+    def buscar_melhor_movimento(self):
+        """
+        Varre as vizinhanças de transferência, troca inter-máquinas e troca
+        intra-máquina na mesma ordem da busca local original e retorna
+        (makespan, movimento) do primeiro melhor vizinho estritamente melhor
+        que a solução atual, ou None se a solução for um ótimo local.
+
+        Um vizinho só pode reduzir o makespan se alterar todas as máquinas
+        críticas (com tempo igual ao makespan); os demais são descartados
+        sem avaliação, o que não muda o vizinho escolhido. Com `contar`, as
+        avaliações são somadas por par de máquinas, fora dos laços internos.
+        """
+        tempos = self.tempos_maquinas()
+        melhor_makespan = max(tempos.values()) if tempos else 0
+        criticas = {m_id for m_id, tempo in tempos.items() if tempo == melhor_makespan}
+        if len(criticas) > 2:
+            return None
+        melhor_movimento = None
+        ids = self.machine_ids
+        contar, avaliacoes = self.contar, self.avaliacoes
+
+        # Vizinhança 1: Transferência
+        for m_from in ids:
+            for m_to in ids:
+                if m_from == m_to or not criticas <= {m_from, m_to}: continue
+                if contar:
+                    avaliacoes[TRANSFERENCIA] += len(self.solucao[m_from])
+                for i in range(len(self.solucao[m_from])):
+                    valor = self.avaliar_transferencia(m_from, i, m_to, melhor_makespan, tempos)
+                    if valor < melhor_makespan:
+                        melhor_makespan = valor
+                        melhor_movimento = (TRANSFERENCIA, m_from, i, m_to)
+
+        # Vizinhança 2: Troca Inter-Máquinas
+        for idx1 in range(len(ids)):
+            for idx2 in range(idx1 + 1, len(ids)):
+                m1, m2 = ids[idx1], ids[idx2]
+                if not criticas <= {m1, m2}: continue
+                if contar:
+                    avaliacoes[TROCA_INTER] += len(self.solucao[m1]) * len(self.solucao[m2])
+                for i in range(len(self.solucao[m1])):
+                    for j in range(len(self.solucao[m2])):
+                        valor = self.avaliar_troca_inter(m1, i, m2, j, melhor_makespan, tempos)
+                        if valor < melhor_makespan:
+                            melhor_makespan = valor
+                            melhor_movimento = (TROCA_INTER, m1, i, m2, j)
+
+        # Vizinhança 3: Troca Intra-Máquina
+        for m_id in ids:
+            if not criticas <= {m_id}: continue
+            seq_len = len(self.solucao[m_id])
+            if contar:
+                avaliacoes[TROCA_INTRA] += seq_len * (seq_len - 1) // 2
+            for i in range(seq_len):
+                for j in range(i + 1, seq_len):
+                    valor = self.avaliar_troca_intra(m_id, i, j, melhor_makespan, tempos)
+                    if valor < melhor_makespan:
+                        melhor_makespan = valor
+                        melhor_movimento = (TROCA_INTRA, m_id, i, j)
+
+        if melhor_movimento is None:
+            return None
+        return melhor_makespan, melhor_movimento
+
@@ -0,0 +1,70 @@
+# Arquivo: benchmarks/bench_geracao.py
+#
+# Mede como o tempo de geração de uma instância (Cenario.gerar_dados), de sua
+# serialização (Cenario.to_dict) e a memória da matriz de setup crescem com o
+# número de tarefas, em cada forma de armazenamento da matriz.
+#
+# Uso:
+#   python benchmarks/bench_geracao.py
+#   python benchmarks/bench_geracao.py --tamanhos 100 1000 4000 --repeticoes 5
+#   python benchmarks/bench_geracao.py --tamanhos 5000 --armazenamentos float32 procedural --sem_to_dict
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cenario import Cenario
+from matriz_setup import ARMAZENAMENTOS_SETUP
+
+
+def cenario_com_tamanho(codigo, n_jobs, n_maquinas=10, armazenamento_setup='float64'):
+    """Cria um Cenario do código informado com n_maquinas máquinas e cerca de n_jobs tarefas."""
+    niveis = {'n_maquinas': n_maquinas, 'n_medio_jobs_maquina': max(1, n_jobs // n_maquinas)}
+    return Cenario(codigo, niveis=niveis, armazenamento_setup=armazenamento_setup)
+
+
+def medir(codigo, n_jobs, repeticoes, armazenamento_setup, serializar):
+    """Retorna o menor tempo (s) de geração e de serialização entre as repetições e a memória da matriz (MB)."""
+    tempos_geracao, tempos_serializacao = [], []
+    for _ in range(repeticoes):
+        cenario = cenario_com_tamanho(codigo, n_jobs, armazenamento_setup=armazenamento_setup)
+        inicio = time.perf_counter()
+        cenario.gerar_dados(verbose=False)
+        tempos_geracao.append(time.perf_counter() - inicio)
+
+        if serializar:
+            inicio = time.perf_counter()
+            cenario.to_dict()
+            tempos_serializacao.append(time.perf_counter() - inicio)
+    return min(tempos_geracao), min(tempos_serializacao, default=float('nan')), cenario.matriz_setup.nbytes / 1024 ** 2
+
+
+def main(args):
+    np.random.seed(args.seed)
+    print(f"{'Código':<9} {'Armazenamento':<13} {'n_jobs':>7} {'Geração (s)':>12} {'to_dict (s)':>12} {'Matriz (MB)':>12}")
+    for codigo in args.codigos:
+        for armazenamento in args.armazenamentos:
+            for n_jobs in args.tamanhos:
+                geracao, serializacao, memoria = medir(codigo, n_jobs, args.repeticoes, armazenamento, not args.sem_to_dict)
+                print(f"{codigo:<9} {armazenamento:<13} {n_jobs:>7} {geracao:>12.4f} {serializacao:>12.4f} {memoria:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da geração de instâncias em função de n_jobs.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[100, 500, 1000, 2000, 4000],
+                        help='Números de tarefas a medir.')
+    parser.add_argument('--codigos', type=str, nargs='+', default=['LLLLLHH', 'LLLHLHH'],
+                        help='Códigos de cenário (estrutura simétrica e assimétrica por padrão).')
+    parser.add_argument('--armazenamentos', type=str, nargs='+', choices=list(ARMAZENAMENTOS_SETUP), default=['float64'],
+                        help='Formas de armazenamento da matriz de setup a medir.')
+    parser.add_argument('--sem_to_dict', action='store_true',
+                        help='Não mede a serialização (útil para instâncias muito grandes).')
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help='Repetições por medição (é reportado o menor tempo).')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Semente do gerador aleatório.')
+    main(parser.parse_args())
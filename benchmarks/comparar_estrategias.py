@@ -0,0 +1,79 @@
+# Arquivo: benchmarks/comparar_estrategias.py
+#
+# Compara as estratégias de varredura da busca local (estrategias_busca) com a
+# melhor melhoria original: qualidade da solução (MS/DDLB) contra o número de
+# vizinhos avaliados e o tempo. Cada um dos 128 códigos de cenário gera uma
+# instância com semente fixa (a réplica 1 de run_generator com --seed), e todas
+# as estratégias partem da mesma solução FFD.
+#
+# Uso:
+#   python benchmarks/comparar_estrategias.py
+#   python benchmarks/comparar_estrategias.py --codigos LLLLLHH HHHHHHH --saida comparacao.csv
+
+import os
+import sys
+import csv
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from instancia import Instancia
+from run_generator import gerar_cenario, todos_os_codigos
+from local_search2 import solve_with_ffd, local_search, calcular_ddlb
+from estrategias_busca import ESTRATEGIAS_PREDEFINIDAS, criar_estrategia
+from instrumentacao import Metricas
+
+# Referência: melhor melhoria com varredura completa (local_search sem estratégia)
+MELHOR_MELHORIA = 'melhor_completa'
+
+
+def executar(nome, instancia, solucao_inicial, seed):
+    """Executa a busca local com a estratégia e retorna (makespan, avaliações, tempo)."""
+    estrategia = None if nome == MELHOR_MELHORIA else criar_estrategia(nome, instancia, seed=seed)
+    metricas = Metricas()
+    inicio = time.perf_counter()
+    _, makespan, _ = local_search(solucao_inicial, instancia, verbose=False, estrategia=estrategia, metricas=metricas)
+    return makespan, metricas.total_avaliacoes, time.perf_counter() - inicio
+
+
+def main(args):
+    nomes = [MELHOR_MELHORIA] + [n for n in ESTRATEGIAS_PREDEFINIDAS if n in args.estrategias]
+    linhas = []
+    for codigo in args.codigos:
+        instancia = Instancia.de_cenario(gerar_cenario(codigo.upper(), 1, args.seed))
+        solucao_inicial = solve_with_ffd(instancia)
+        ddlb = calcular_ddlb(instancia)
+        for nome in nomes:
+            makespan, avaliacoes, tempo = executar(nome, instancia, solucao_inicial, args.seed)
+            linhas.append({"codigo_cenario": codigo.upper(), "estrategia": nome, "makespan_final": makespan,
+                           "razao_ms_ddlb": makespan / ddlb if ddlb > 0 else 0, "avaliacoes": avaliacoes, "tempo_s": tempo})
+        print(f"{codigo.upper()} concluído", file=sys.stderr)
+
+    if args.saida:
+        with open(args.saida, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=list(linhas[0]))
+            escritor.writeheader()
+            escritor.writerows(linhas)
+
+    # Resumo por estratégia; Melhor/Igual/Pior comparam o makespan de cada código com o da referência
+    referencia = {l["codigo_cenario"]: l["makespan_final"] for l in linhas if l["estrategia"] == MELHOR_MELHORIA}
+    print(f"\n{'Estratégia':<32} {'MS/DDLB médio':>14} {'Avaliações':>12} {'Tempo (s)':>10} {'Melhor':>7} {'Igual':>6} {'Pior':>6}")
+    for nome in nomes:
+        dados = [l for l in linhas if l["estrategia"] == nome]
+        diferencas = [l["makespan_final"] - referencia[l["codigo_cenario"]] for l in dados]
+        print(f"{nome:<32} {sum(l['razao_ms_ddlb'] for l in dados) / len(dados):>14.4f} "
+              f"{sum(l['avaliacoes'] for l in dados):>12} {sum(l['tempo_s'] for l in dados):>10.2f} "
+              f"{sum(d < 0 for d in diferencas):>7} {sum(d == 0 for d in diferencas):>6} {sum(d > 0 for d in diferencas):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara qualidade e número de avaliações das estratégias de busca local.")
+    parser.add_argument('--codigos', type=str, nargs='+', default=todos_os_codigos(),
+                        help='Códigos de cenário (padrão: os 128).')
+    parser.add_argument('--estrategias', type=str, nargs='+', default=list(ESTRATEGIAS_PREDEFINIDAS),
+                        help='Estratégias comparadas com a melhor melhoria completa.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Semente das instâncias e das estratégias aleatorizadas.')
+    parser.add_argument('--saida', type=str, default=None,
+                        help='CSV opcional com o resultado de cada código e estratégia.')
+    main(parser.parse_args())
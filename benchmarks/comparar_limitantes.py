@@ -0,0 +1,118 @@
+# Arquivo: benchmarks/comparar_limitantes.py
+#
+# Compara a qualidade dos limitantes inferiores de limitantes.py nos 128
+# códigos de cenário: para cada instância (as réplicas de run_generator com
+# --seed), resolve com o solver e calcula MS/limitante para cada limitante;
+# quanto mais próximo de 1, mais justo o limitante. Também mede o tempo do
+# cálculo em lote contra o laço de calcular_ddlb (o menor de --repeticoes
+# execuções) e confere que os dois DDLB são idênticos.
+#
+# Um limitante acima do makespan encontrado não vale para aquela instância;
+# isso só pode acontecer com o DDLB (ver limitantes.py).
+#
+# Uso:
+#   python benchmarks/comparar_limitantes.py
+#   python benchmarks/comparar_limitantes.py --replicas 5 --sem_busca --saida limitantes.csv
+
+import os
+import sys
+import csv
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tqdm import tqdm
+
+from cenario import FATORES_E_NIVEIS
+from instancia import Instancia
+from run_generator import gerar_cenario, todos_os_codigos
+from local_search2 import solve_with_ffd, calculate_sequence_time, calcular_ddlb, resolver_instancia
+from limitantes import LIMITANTES, calcular_limitantes
+
+# Tolerância para considerar um limitante acima do makespan
+TOLERANCIA = 1e-9
+
+
+def cronometrar(funcao, repeticoes):
+    """Menor tempo de `repeticoes` execuções de `funcao` e o seu resultado."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def makespan(instancia, sem_busca, tempo_limite):
+    if sem_busca:
+        return max((calculate_sequence_time(seq, instancia) for seq in solve_with_ffd(instancia).values()), default=0)
+    return resolver_instancia(instancia, tempo_limite=tempo_limite)["makespan_final"]
+
+
+def main(args):
+    casos = [(codigo.upper(), replica) for codigo in args.codigos for replica in range(1, args.replicas + 1)]
+    instancias = [Instancia.de_cenario(gerar_cenario(codigo, replica, args.seed)) for codigo, replica in casos]
+
+    tempo_laco, ddlb_laco = cronometrar(lambda: [calcular_ddlb(instancia) for instancia in instancias], args.repeticoes)
+    tempo_lote_ddlb, ddlb_lote = cronometrar(lambda: calcular_limitantes(instancias, ['ddlb'])['ddlb'], args.repeticoes)
+    tempo_lote, limitantes = cronometrar(lambda: calcular_limitantes(instancias), args.repeticoes)
+    diferentes = sum(a != b for a, b in zip(ddlb_laco, ddlb_lote.tolist()))
+    print(f"{len(instancias)} instâncias | DDLB em laço: {tempo_laco * 1000:.1f} ms | DDLB em lote: "
+          f"{tempo_lote_ddlb * 1000:.1f} ms | Todos os limitantes em lote: {tempo_lote * 1000:.1f} ms | "
+          f"DDLB diferentes: {diferentes}", file=sys.stderr)
+
+    nomes = list(limitantes)
+    linhas = []
+    for i, ((codigo, replica), instancia) in enumerate(tqdm(list(zip(casos, instancias)), desc="Resolvendo", unit="inst")):
+        ms = makespan(instancia, args.sem_busca, args.tempo_limite)
+        linha = {"codigo_cenario": codigo, "replica": replica, "n_jobs": instancia.n_jobs,
+                 "n_maquinas": instancia.n_maquinas, "makespan": ms}
+        for nome in nomes:
+            linha[nome] = float(limitantes[nome][i])
+            linha[f"razao_{nome}"] = ms / linha[nome] if linha[nome] > 0 else 0
+        linhas.append(linha)
+
+    if args.saida:
+        with open(args.saida, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=list(linhas[0]))
+            escritor.writeheader()
+            escritor.writerows(linhas)
+
+    # Resumo por limitante. 'Maior' conta as instâncias em que ele é o maior
+    # entre os limitantes individuais (empates contam para todos)
+    individuais = list(LIMITANTES)
+    maiores = [max(l[nome] for nome in individuais) for l in linhas]
+    print(f"\n{'Limitante':<17} {'MS/LB médio':>12} {'MS/LB máx':>10} {'Maior':>7} {'Acima do MS':>12}")
+    for nome in nomes:
+        razoes = [l[f"razao_{nome}"] for l in linhas]
+        maior = sum(l[nome] >= m - TOLERANCIA for l, m in zip(linhas, maiores)) if nome in individuais else '-'
+        acima = sum(l[nome] > l["makespan"] + TOLERANCIA for l in linhas)
+        print(f"{nome:<17} {sum(razoes) / len(razoes):>12.4f} {max(razoes):>10.4f} {maior:>7} {acima:>12}")
+
+    # MS/LB médio por nível de cada fator (posição no código de cenário)
+    print(f"\n{'Fator':<28} {'Nível':>5} " + ' '.join(f"{nome:>15}" for nome in nomes))
+    for posicao, fator in enumerate(FATORES_E_NIVEIS):
+        for nivel in 'LH':
+            dados = [l for l in linhas if l["codigo_cenario"][posicao] == nivel]
+            if dados:
+                print(f"{fator:<28} {nivel:>5} " + ' '.join(
+                    f"{sum(l[f'razao_{nome}'] for l in dados) / len(dados):>15.4f}" for nome in nomes))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara a qualidade dos limitantes inferiores nos códigos de cenário.")
+    parser.add_argument('--codigos', type=str, nargs='+', default=todos_os_codigos(),
+                        help='Códigos de cenário (padrão: os 128).')
+    parser.add_argument('--replicas', type=int, default=1,
+                        help='Réplicas por código (padrão: 1).')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Semente das instâncias (a mesma de run_generator.py).')
+    parser.add_argument('--sem_busca', action='store_true',
+                        help='Usa o makespan do FFD, sem busca local (mais rápido, razões maiores).')
+    parser.add_argument('--tempo_limite', type=float, default=None,
+                        help='Tempo máximo, em segundos, da resolução de cada instância.')
+    parser.add_argument('--repeticoes', type=int, default=20,
+                        help='Repetições de cada cálculo dos limitantes; é exibido o menor tempo (padrão: 20).')
+    parser.add_argument('--saida', type=str, default=None,
+                        help='CSV opcional com os limitantes e as razões de cada instância.')
+    main(parser.parse_args())
@@ -0,0 +1,194 @@
+# Arquivo: benchmarks/suite_regressao.py
+#
+# Suíte de desempenho e regressão do gerador e do solver. Os casos são
+# instâncias de semente fixa: uma para cada um dos 128 códigos de cenário da
+# grade FATORES_E_NIVEIS e, além delas, instâncias maiores (com níveis
+# personalizados de máquinas e tarefas por máquina) de alguns códigos. Para
+# cada caso são medidos separadamente a geração (Cenario.gerar_dados), a
+# leitura (carregar_instancia_de_json), o FFD, a busca local e o DDLB, e
+# registrados o makespan final e a razão MS/DDLB.
+#
+# O modo 'gravar' salva as medições como linha de base; o modo 'comparar' mede
+# de novo e aponta regressões de tempo (por fase, no total dos casos), de taxa
+# de avaliações da busca local e de qualidade (por caso), saindo com código 1
+# se houver alguma.
+#
+# Uso:
+#   python benchmarks/suite_regressao.py gravar --linha_base linha_base.json
+#   python benchmarks/suite_regressao.py comparar --linha_base linha_base.json
+#   python benchmarks/suite_regressao.py comparar --linha_base linha_base.json --sem_escalonados
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cenario import Cenario, FATORES_E_NIVEIS
+from run_generator import todos_os_codigos, rng_da_instancia
+from local_search2 import carregar_instancia_de_json, solve_with_ffd, local_search, calcular_ddlb
+from instrumentacao import Metricas
+
+VERSAO_LINHA_BASE = 1
+FASES = ('geracao', 'carga', 'ffd', 'busca_local', 'ddlb')
+
+
+def casos_da_suite(escalonados, tamanhos, codigos_escalonados):
+    """Lista (nome, codigo, n_jobs) dos casos; n_jobs None mantém o tamanho do código."""
+    casos = [(codigo, codigo, None) for codigo in todos_os_codigos()]
+    if escalonados:
+        casos += [(f"{codigo}_n{n_jobs}", codigo, n_jobs) for n_jobs in tamanhos for codigo in codigos_escalonados]
+    return casos
+
+
+def criar_cenario(codigo, n_jobs, seed):
+    """Cenario de semente fixa; com n_jobs, usa o maior número de máquinas da grade."""
+    niveis = None
+    if n_jobs is not None:
+        n_maquinas = max(FATORES_E_NIVEIS['n_maquinas'])
+        niveis = {'n_maquinas': n_maquinas, 'n_medio_jobs_maquina': max(1, n_jobs // n_maquinas)}
+    return Cenario(codigo, rng=rng_da_instancia(seed, codigo, 1), niveis=niveis)
+
+
+def medir_caso(codigo, n_jobs, seed, pasta_temporaria):
+    """Executa o caso uma vez e retorna os tempos de cada fase e os resultados do solver."""
+    cenario = criar_cenario(codigo, n_jobs, seed)
+    inicio = time.perf_counter()
+    cenario.gerar_dados(verbose=False)
+    tempo_geracao = time.perf_counter() - inicio
+
+    caminho = os.path.join(pasta_temporaria, f"{codigo}.json")
+    cenario.salvar_em_json(caminho, verbose=False)
+    inicio = time.perf_counter()
+    instancia = carregar_instancia_de_json(caminho)
+    tempo_carga = time.perf_counter() - inicio
+
+    metricas = Metricas()
+    solucao_inicial = solve_with_ffd(instancia, metricas=metricas)
+    _, makespan, iteracoes = local_search(solucao_inicial, instancia, verbose=False, metricas=metricas)
+    ddlb = calcular_ddlb(instancia, metricas=metricas)
+    return {
+        "n_jobs": instancia.n_jobs,
+        "tempos_s": {"geracao": tempo_geracao, "carga": tempo_carga, **metricas.fases_s},
+        "avaliacoes": metricas.total_avaliacoes,
+        "iteracoes": iteracoes,
+        "makespan_final": makespan,
+        "razao_ms_ddlb": makespan / ddlb if ddlb > 0 else 0,
+    }
+
+
+def executar_suite(casos, seed, repeticoes):
+    """Mede todos os casos; o tempo de cada fase é o menor entre as repetições."""
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta_temporaria:
+        for nome, codigo, n_jobs in casos:
+            medicoes = [medir_caso(codigo, n_jobs, seed, pasta_temporaria) for _ in range(repeticoes)]
+            resultado = medicoes[0]
+            resultado["tempos_s"] = {fase: min(m["tempos_s"][fase] for m in medicoes) for fase in FASES}
+            resultados[nome] = resultado
+            print(f"{nome:<16} n_jobs={resultado['n_jobs']:<5} busca local {resultado['tempos_s']['busca_local']:.3f}s "
+                  f"MS/DDLB {resultado['razao_ms_ddlb']:.4f}", file=sys.stderr)
+    return resultados
+
+
+def totais(casos):
+    """Tempo total de cada fase e avaliações por segundo da busca local, somados sobre os casos."""
+    tempos = {fase: sum(c["tempos_s"][fase] for c in casos.values()) for fase in FASES}
+    avaliacoes = sum(c["avaliacoes"] for c in casos.values())
+    return tempos, avaliacoes / tempos['busca_local'] if tempos['busca_local'] > 0 else 0
+
+
+def comparar(linha_base, atual, limiar_tempo, limiar_qualidade):
+    """Retorna a lista de regressões (textos) do resultado atual em relação à linha de base."""
+    regressoes = []
+    comuns = [nome for nome in atual if nome in linha_base]
+    base = {nome: linha_base[nome] for nome in comuns}
+    novo = {nome: atual[nome] for nome in comuns}
+    tempos_base, taxa_base = totais(base)
+    tempos_novo, taxa_novo = totais(novo)
+
+    print(f"\n{'Fase':<14} {'Base (s)':>10} {'Atual (s)':>10} {'Variação':>9}")
+    for fase in FASES:
+        variacao = tempos_novo[fase] / tempos_base[fase] - 1 if tempos_base[fase] > 0 else 0
+        print(f"{fase:<14} {tempos_base[fase]:>10.3f} {tempos_novo[fase]:>10.3f} {variacao:>+9.1%}")
+        if variacao > limiar_tempo:
+            regressoes.append(f"Tempo da fase '{fase}' aumentou {variacao:.1%} (limiar {limiar_tempo:.0%}).")
+    variacao_taxa = taxa_novo / taxa_base - 1 if taxa_base > 0 else 0
+    print(f"{'aval./s (BL)':<14} {taxa_base:>10.0f} {taxa_novo:>10.0f} {variacao_taxa:>+9.1%}")
+    if variacao_taxa < -limiar_tempo:
+        regressoes.append(f"Avaliações por segundo da busca local caíram {-variacao_taxa:.1%} (limiar {limiar_tempo:.0%}).")
+
+    for nome in comuns:
+        piora = novo[nome]["makespan_final"] / base[nome]["makespan_final"] - 1
+        if piora > limiar_qualidade:
+            regressoes.append(f"{nome}: makespan final {base[nome]['makespan_final']:.2f} -> "
+                              f"{novo[nome]['makespan_final']:.2f} (+{piora:.2%}).")
+    alterados = sum(novo[n]["makespan_final"] != base[n]["makespan_final"] for n in comuns)
+    print(f"\nCasos comparados: {len(comuns)} | Com makespan final diferente da linha de base: {alterados}")
+    ausentes = sorted(set(linha_base) - set(atual))
+    if ausentes:
+        print(f"Casos da linha de base não executados: {len(ausentes)}")
+    return regressoes
+
+
+def main(args):
+    casos = casos_da_suite(not args.sem_escalonados, args.tamanhos, args.codigos_escalonados)
+    resultados = executar_suite(casos, args.seed, args.repeticoes)
+
+    if args.comando == 'gravar':
+        with open(args.linha_base, 'w', encoding='utf-8') as f:
+            json.dump({
+                "versao": VERSAO_LINHA_BASE,
+                "seed": args.seed,
+                "ambiente": {"python": platform.python_version(), "numpy": np.__version__, "maquina": platform.node()},
+                "casos": resultados,
+            }, f, indent=4)
+        tempos, taxa = totais(resultados)
+        print(f"Linha de base com {len(resultados)} casos salva em '{args.linha_base}'. "
+              f"Busca local: {tempos['busca_local']:.2f}s, {taxa:.0f} avaliações/s.")
+        return 0
+
+    with open(args.linha_base, 'r', encoding='utf-8') as f:
+        linha_base = json.load(f)
+    if linha_base.get("versao") != VERSAO_LINHA_BASE or linha_base.get("seed") != args.seed:
+        print("ERRO: a linha de base foi gravada com outra versão da suíte ou outra semente.")
+        return 2
+    regressoes = comparar(linha_base["casos"], resultados, args.limiar_tempo, args.limiar_qualidade)
+    if regressoes:
+        print("\nREGRESSÕES ENCONTRADAS:")
+        for texto in regressoes:
+            print(f"- {texto}")
+        return 1
+    print("\nNenhuma regressão encontrada.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de desempenho e regressão sobre os 128 cenários.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    for comando, ajuda in (('gravar', 'Executa a suíte e grava a linha de base.'),
+                           ('comparar', 'Executa a suíte e compara com a linha de base.')):
+        p = sub.add_parser(comando, help=ajuda)
+        p.add_argument('--linha_base', type=str, default='linha_base.json',
+                       help='Arquivo .json da linha de base.')
+        p.add_argument('--seed', type=int, default=0,
+                       help='Semente das instâncias da suíte.')
+        p.add_argument('--repeticoes', type=int, default=1,
+                       help='Repetições de cada caso (é usado o menor tempo de cada fase).')
+        p.add_argument('--sem_escalonados', action='store_true',
+                       help='Executa apenas os 128 códigos, sem as instâncias maiores.')
+        p.add_argument('--tamanhos', type=int, nargs='+', default=[200, 400],
+                       help='Números de tarefas das instâncias escalonadas.')
+        p.add_argument('--codigos_escalonados', type=str, nargs='+', default=['LLLLLHH', 'LLLHLHH'],
+                       help='Códigos usados nas instâncias escalonadas (estrutura simétrica e assimétrica por padrão).')
+        if comando == 'comparar':
+            p.add_argument('--limiar_tempo', type=float, default=0.25,
+                           help='Aumento relativo máximo do tempo total de cada fase (e queda da taxa de avaliações).')
+            p.add_argument('--limiar_qualidade', type=float, default=0.0,
+                           help='Piora relativa máxima do makespan final de cada caso.')
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,246 @@
+# Arquivo: cache_resultados.py
+#
+# Cache em disco, endereçado por conteúdo, dos resultados do solver. Há dois
+# tipos de entrada, guardados separadamente:
+#
+#   solucoes/    solução final, makespans, iterações e avaliações de uma
+#                instância para uma configuração do solver
+#   limitantes/  DDLB de uma instância
+#
+# A chave de cada entrada é o SHA-256 do conteúdo da instância (arrays e
+# dimensões), da configuração e do código-fonte das funções que produzem o
+# valor. Alterar a instância, a configuração ou o código do solver (ou apenas
+# o do DDLB) gera outra chave, então uma entrada antiga nunca é usada; as que
+# deixam de ser consultadas saem pelo limite de tamanho (as menos usadas
+# recentemente primeiro).
+
+import os
+import json
+import time
+import inspect
+import hashlib
+
+import numpy as np
+
+import avaliacao_incremental
+import construtivas
+import estrategias_busca
+import vizinhanca_vetorizada
+import matriz_setup
+import local_search2
+from instancia import Instancia
+from local_search2 import calculate_sequence_time, calcular_ddlb, resolver_instancia
+from instrumentacao import SEM_METRICAS
+
+VERSAO_CACHE = 1
+SOLUCOES = 'solucoes'
+LIMITANTES = 'limitantes'
+
+
+def _versao_do_codigo(*objetos, exceto=()):
+    """
+    Hash do código-fonte dos módulos, classes e funções informados. O código
+    das funções em `exceto` é retirado do código dos módulos antes do hash.
+    """
+    h = hashlib.sha256()
+    for objeto in objetos:
+        codigo = inspect.getsource(objeto)
+        for excluido in exceto:
+            codigo = codigo.replace(inspect.getsource(excluido), '')
+        h.update(codigo.encode('utf-8'))
+    return h.hexdigest()
+
+
+# Código do qual depende cada tipo de entrada. O solver inclui todo o
+# local_search2 (inclusive resolver_instancia, que calcula o makespan
+# inicial), exceto o DDLB, para que alterar só o limitante mantenha as soluções
+VERSAO_SOLVER = _versao_do_codigo(avaliacao_incremental, construtivas, estrategias_busca, vizinhanca_vetorizada,
+                                  matriz_setup, Instancia, local_search2, exceto=(calcular_ddlb,))
+VERSAO_LIMITANTE = _versao_do_codigo(matriz_setup, Instancia, calcular_ddlb)
+
+
+def resultado_deterministico(estrategia):
+    """
+    A busca com esta estratégia dá sempre a mesma solução para a mesma
+    instância? Não é o caso das estratégias com ordem de vizinhanças
+    aleatória, criadas sem semente pela busca local.
+    """
+    if estrategia is None:
+        return True
+    parametros = estrategias_busca.ESTRATEGIAS_PREDEFINIDAS.get(estrategia) if isinstance(estrategia, str) else None
+    return parametros is not None and parametros.get('ordem') != estrategias_busca.ORDEM_ALEATORIA
+
+
+def hash_instancia(instancia):
+    """SHA-256 do conteúdo da instância (independente do nome do arquivo e do formato de origem)."""
+    h = hashlib.sha256()
+    h.update(f"{instancia.n_jobs}:{instancia.n_maquinas}".encode())
+    if isinstance(instancia.setup, matriz_setup.SetupProcedural):
+        # A matriz procedural é definida pelos seus parâmetros
+        h.update(json.dumps(instancia.setup.parametros(), sort_keys=True).encode('utf-8'))
+        arrays = (instancia.processamento, instancia.liberacao)
+    else:
+        arrays = (instancia.setup, instancia.processamento, instancia.liberacao)
+    for array in arrays:
+        h.update(np.ascontiguousarray(array, dtype='<f8').tobytes())
+    return h.hexdigest()
+
+
+def _checksum(conteudo):
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """
+    Cache de resultados em uma pasta. Cada entrada é um .json gravado de forma
+    atômica com o checksum do seu conteúdo; uma entrada corrompida, de outra
+    chave ou cuja solução não confere com a instância é descartada na leitura.
+    """
+    def __init__(self, pasta, tamanho_maximo=512 * 1024 ** 2):
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        for tipo in (SOLUCOES, LIMITANTES):
+            os.makedirs(os.path.join(pasta, tipo), exist_ok=True)
+
+    # --- CHAVES ---
+
+    @staticmethod
+    def chave_solucao(hash_inst, configuracao):
+        return _checksum({"instancia": hash_inst, "configuracao": configuracao,
+                          "solver": VERSAO_SOLVER, "versao": VERSAO_CACHE})
+
+    @staticmethod
+    def chave_limitante(hash_inst):
+        return _checksum({"instancia": hash_inst, "ddlb": VERSAO_LIMITANTE, "versao": VERSAO_CACHE})
+
+    def _caminho(self, tipo, chave):
+        return os.path.join(self.pasta, tipo, chave[:2], chave + '.json')
+
+    # --- LEITURA E ESCRITA ---
+
+    def ler(self, tipo, chave):
+        """Retorna o conteúdo da entrada, ou None se ela não existir ou não passar na verificação."""
+        caminho = self._caminho(tipo, chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                entrada = json.load(f)
+            if entrada.get("chave") != chave or entrada.get("checksum") != _checksum(entrada["conteudo"]):
+                raise ValueError("entrada inválida")
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            self.remover(tipo, chave)
+            return None
+        # A data de modificação marca o último uso, usada na remoção por tamanho
+        os.utime(caminho)
+        return entrada["conteudo"]
+
+    def gravar(self, tipo, chave, conteudo):
+        caminho = self._caminho(tipo, chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        # O checksum é calculado sobre o conteúdo como será lido (chaves int viram str no JSON)
+        conteudo = json.loads(json.dumps(conteudo))
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"chave": chave, "checksum": _checksum(conteudo), "conteudo": conteudo}, f)
+        os.replace(temporario, caminho)
+
+    def remover(self, tipo, chave):
+        try:
+            os.remove(self._caminho(tipo, chave))
+        except FileNotFoundError:
+            pass
+
+    def limpar(self):
+        """
+        Remove as entradas usadas há mais tempo até que o cache caiba em
+        `tamanho_maximo` bytes. Retorna o número de entradas removidas.
+        """
+        entradas = []
+        for raiz, _, arquivos in os.walk(self.pasta):
+            for nome in arquivos:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    estado = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                # Temporários esquecidos por uma execução interrompida também são removidos
+                if nome.endswith('.tmp') and time.time() - estado.st_mtime > 3600:
+                    os.remove(caminho)
+                elif nome.endswith('.json'):
+                    entradas.append((estado.st_mtime, estado.st_size, caminho))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        removidas = 0
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+            os.remove(caminho)
+            total -= tamanho
+            removidas += 1
+        return removidas
+
+
+def _solucao_confere(solucao, makespan, instancia):
+    """A solução usa cada tarefa exatamente uma vez e tem o makespan registrado?"""
+    tarefas = sorted(tarefa for seq in solucao.values() for tarefa in seq)
+    if tarefas != list(range(1, instancia.n_jobs + 1)):
+        return False
+    return max((calculate_sequence_time(seq, instancia) for seq in solucao.values()), default=0) == makespan
+
+
+def resolver_com_cache(instancia, cache, tempo_limite=None, modo_avaliacao='incremental', estrategia=None,
+                       construtiva='ffd', metricas=None):
+    """
+    Igual a local_search2.resolver_instancia, mas consulta o cache antes.
+    Se a solução estiver no cache, apenas o que falta é calculado (por
+    exemplo, só o DDLB quando apenas o código do limitante mudou). Resultados
+    interrompidos pelo tempo limite não são guardados, pois dependem da
+    velocidade da execução, nem os de estratégias aleatórias (ver
+    resultado_deterministico); deles, só o DDLB vai para o cache.
+
+    O dicionário retornado tem a chave extra 'cache': 'completo', 'solucao'
+    (apenas a solução veio do cache) ou 'nenhum'.
+    """
+    inicio = time.perf_counter()
+    hash_inst = hash_instancia(instancia)
+    configuracao = {"modo_avaliacao": modo_avaliacao, "estrategia": estrategia, "construtiva": construtiva}
+    chave_solucao = CacheResultados.chave_solucao(hash_inst, configuracao)
+    chave_limitante = CacheResultados.chave_limitante(hash_inst)
+
+    deterministico = resultado_deterministico(estrategia)
+    solucao = cache.ler(SOLUCOES, chave_solucao) if deterministico else None
+    if solucao is not None:
+        solucao["solucao"] = {int(m_id): seq for m_id, seq in solucao["solucao"].items()}
+        if not _solucao_confere(solucao["solucao"], solucao["makespan_final"], instancia):
+            cache.remover(SOLUCOES, chave_solucao)
+            solucao = None
+    if solucao is None:
+        resultado = resolver_instancia(instancia, tempo_limite=tempo_limite, modo_avaliacao=modo_avaliacao,
+                                       estrategia=estrategia, metricas=metricas, construtiva=construtiva)
+        if resultado["status"] == "ok" and deterministico:
+            cache.gravar(SOLUCOES, chave_solucao, {campo: resultado[campo] for campo in (
+                "makespan_inicial", "makespan_final", "iteracoes", "avaliacoes", "solucao")})
+        cache.gravar(LIMITANTES, chave_limitante, {"ddlb": resultado["ddlb"]})
+        resultado["cache"] = "nenhum"
+        return resultado
+
+    limitante = cache.ler(LIMITANTES, chave_limitante)
+    if limitante is None:
+        limitante = {"ddlb": calcular_ddlb(instancia, metricas=metricas or SEM_METRICAS)}
+        cache.gravar(LIMITANTES, chave_limitante, limitante)
+        origem = "solucao"
+    else:
+        origem = "completo"
+    ddlb = limitante["ddlb"]
+    return {
+        "codigo_cenario": instancia.config.get('codigo_cenario'),
+        **{campo: solucao[campo] for campo in ("makespan_inicial", "makespan_final")},
+        "ddlb": ddlb,
+        "razao_ms_ddlb": solucao["makespan_final"] / ddlb if ddlb > 0 else 0,
+        "iteracoes": solucao["iteracoes"],
+        "avaliacoes": solucao["avaliacoes"],
+        "tempo_s": time.perf_counter() - inicio,
+        "status": "ok",
+        "solucao": solucao["solucao"],
+        "cache": origem,
+    }
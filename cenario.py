@@ -5,6 +5,8 @@ import math
 import json
 import copy
 
+from matriz_setup import ARMAZENAMENTOS_SETUP, SetupProcedural
+
 # --- CONSTANTES E FATORES DO EXPERIMENTO ---
 MEDIA_SETUP_BASE = 450
 NIVEL_ALTO = 'alta'
@@ -20,13 +22,18 @@ FATORES_E_NIVEIS = {
     'n_maquinas': [2, 10],
     'n_medio_jobs_maquina': [3, 10]
 }
+# Fatores que aceitam, além dos níveis da grade, qualquer inteiro positivo
+FATORES_NUMERICOS = ('n_maquinas', 'n_medio_jobs_maquina')
+# Máximo de setups sorteados de uma vez (2 MB em float64, que ficam no cache);
+# as matrizes da grade, e qualquer uma com até 512 tarefas, cabem em um único sorteio
+VALORES_POR_SORTEIO = 256 * 1024
 
 class Cenario:
     """
     Representa uma instância completa de um problema de agendamento,
     encapsulando sua configuração e os dados gerados.
     """
-    def __init__(self, codigo_cenario):
+    def __init__(self, codigo_cenario, rng=None, niveis=None, armazenamento_setup='float64'):
         """
         Construtor da classe. Cria um cenário com base em um código de 7 letras.
 
@@ -41,26 +48,56 @@ class Cenario:
                 5. Var. Setup
                 6. N. Máquinas
                 7. Média Jobs/Máquina
+            rng (np.random.Generator, opcional):
+                Gerador de números aleatórios próprio da instância. Se não for
+                informado, é usado o estado global de `np.random`.
+            niveis (dict, opcional):
+                Níveis que substituem os do código, por fator de
+                FATORES_E_NIVEIS. 'n_maquinas' e 'n_medio_jobs_maquina' aceitam
+                qualquer inteiro positivo, por exemplo
+                {'n_maquinas': 100, 'n_medio_jobs_maquina': 50}.
+            armazenamento_setup (str):
+                'float64' (padrão), 'float32' ou 'procedural' (ver matriz_setup.py).
+                Com 'float64' e 'float32' os setups sorteados são os mesmos.
         """
         if len(codigo_cenario) != 7 or not all(c in 'LHlh' for c in codigo_cenario):
             raise ValueError("O código do cenário deve ter 7 letras (L/H).")
-        
+        if armazenamento_setup not in ARMAZENAMENTOS_SETUP:
+            raise ValueError(f"Armazenamento de setup desconhecido: '{armazenamento_setup}'. Use um de {list(ARMAZENAMENTOS_SETUP)}.")
+
         self.codigo = codigo_cenario.upper()
+        self.rng = np.random if rng is None else rng
+        self.niveis = self._validar_niveis(niveis or {})
+        self.armazenamento_setup = armazenamento_setup
         self._configurar_atributos()
         
         self.matriz_setup = None
         self.tempos_processamento = None
         self.ready_times = None
 
+    @staticmethod
+    def _validar_niveis(niveis):
+        for fator, nivel in niveis.items():
+            if fator not in FATORES_E_NIVEIS:
+                raise ValueError(f"Fator desconhecido: '{fator}'. Use um de {list(FATORES_E_NIVEIS)}.")
+            if fator in FATORES_NUMERICOS:
+                if not isinstance(nivel, (int, np.integer)) or nivel < 1:
+                    raise ValueError(f"O nível de '{fator}' deve ser um inteiro positivo (recebido: {nivel!r}).")
+            elif nivel not in FATORES_E_NIVEIS[fator]:
+                raise ValueError(f"Nível inválido para '{fator}': {nivel!r}. Use um de {FATORES_E_NIVEIS[fator]}.")
+        return {fator: (int(nivel) if fator in FATORES_NUMERICOS else nivel) for fator, nivel in niveis.items()}
+
     def _configurar_atributos(self):
         letras = [0 if letra == 'L' else 1 for letra in self.codigo]
-        self.nivel_ready_time = FATORES_E_NIVEIS['ready_times'][letras[0]]
-        self.variabilidade_processamento = FATORES_E_NIVEIS['variabilidade_processamento'][letras[1]]
-        self.media_processamento = FATORES_E_NIVEIS['media_processamento'][letras[2]]
-        self.estrutura_setup = FATORES_E_NIVEIS['estrutura_setup'][letras[3]]
-        self.variabilidade_setup = FATORES_E_NIVEIS['variabilidade_setup'][letras[4]]
-        self.n_maquinas = FATORES_E_NIVEIS['n_maquinas'][letras[5]]
-        self.n_medio_jobs_maquina = FATORES_E_NIVEIS['n_medio_jobs_maquina'][letras[6]]
+        niveis = {fator: self.niveis.get(fator, opcoes[letra])
+                  for (fator, opcoes), letra in zip(FATORES_E_NIVEIS.items(), letras)}
+        self.nivel_ready_time = niveis['ready_times']
+        self.variabilidade_processamento = niveis['variabilidade_processamento']
+        self.media_processamento = niveis['media_processamento']
+        self.estrutura_setup = niveis['estrutura_setup']
+        self.variabilidade_setup = niveis['variabilidade_setup']
+        self.n_maquinas = niveis['n_maquinas']
+        self.n_medio_jobs_maquina = niveis['n_medio_jobs_maquina']
         self.n_jobs = self.n_maquinas * self.n_medio_jobs_maquina
 
     def gerar_dados(self, verbose=True): 
@@ -71,28 +108,43 @@ class Cenario:
         if verbose:
             print(f"Dados para o cenário '{self.codigo}' gerados com sucesso.")
 
-    def _gerar_matriz_setup(self):
+    def _limites_setup(self):
         if self.variabilidade_setup == NIVEL_ALTO: sigma_s = (1.5 * MEDIA_SETUP_BASE) / 9
         else: sigma_s = 0.5 * ((1.5 * MEDIA_SETUP_BASE) / 9)
-        min_time = MEDIA_SETUP_BASE - math.sqrt(3) * sigma_s
-        max_time = MEDIA_SETUP_BASE + math.sqrt(3) * sigma_s
-        matriz = np.zeros((self.n_jobs, self.n_jobs), dtype=np.float64)
-        for i in range(self.n_jobs):
-            for j in range(self.n_jobs):
-                if i == j: matriz[i, j] = np.inf; continue
-                simetrica = self.estrutura_setup == ESTRUTURA_SIMETrica
-                if simetrica and i < j:
-                    tempo = round(np.random.uniform(min_time, max_time), 2)
-                    matriz[i, j], matriz[j, i] = tempo, tempo
-                elif not simetrica:
-                    matriz[i, j] = round(np.random.uniform(min_time, max_time), 2)
+        return MEDIA_SETUP_BASE - math.sqrt(3) * sigma_s, MEDIA_SETUP_BASE + math.sqrt(3) * sigma_s
+
+    def _gerar_matriz_setup(self):
+        min_time, max_time = self._limites_setup()
+        n = self.n_jobs
+        simetrica = self.estrutura_setup == ESTRUTURA_SIMETrica
+        if self.armazenamento_setup == 'procedural':
+            seed = int.from_bytes(self.rng.bytes(8), 'little')
+            return SetupProcedural(n, min_time, max_time, simetrica, seed)
+        # Um único sorteio vetorizado para a matriz inteira, com a diagonal (ou,
+        # na simétrica, o triângulo inferior) mascarada; só as matrizes com mais
+        # de VALORES_POR_SORTEIO setups são sorteadas em blocos de linhas, para
+        # limitar os temporários. Os valores são atribuídos em ordem de linha
+        # (row-major), então a sequência de números é a mesma do antigo laço
+        # célula a célula, qualquer que seja o tamanho do bloco
+        matriz = np.full((n, n), np.inf, dtype=self.armazenamento_setup)
+        colunas = np.arange(n)
+        linhas_por_bloco = max(1, VALORES_POR_SORTEIO // max(n, 1))
+        for inicio in range(0, n, linhas_por_bloco):
+            fim = min(inicio + linhas_por_bloco, n)
+            linhas = np.arange(inicio, fim)[:, None]
+            mascara = colunas > linhas if simetrica else colunas != linhas
+            bloco = matriz[inicio:fim]
+            bloco[mascara] = np.round(self.rng.uniform(min_time, max_time, size=int(mascara.sum())), 2)
+            if simetrica:
+                # Espelha o triângulo superior do bloco nas colunas correspondentes
+                np.copyto(matriz[:, inicio:fim], bloco.T, where=mascara.T)
         return matriz
 
     def _gerar_tempos_processamento(self):
         mu_p = MEDIA_SETUP_BASE if self.media_processamento == NIVEL_BAIXO else 10 * MEDIA_SETUP_BASE
         if self.variabilidade_processamento == NIVEL_BAIXO: limites = (0.94 * mu_p, 1.06 * mu_p)
         else: limites = (0.4 * mu_p, 1.6 * mu_p)
-        tempos = np.random.uniform(low=limites[0], high=limites[1], size=self.n_jobs)
+        tempos = self.rng.uniform(low=limites[0], high=limites[1], size=self.n_jobs)
         return np.round(tempos, 2)
 
     def _gerar_ready_times(self):
@@ -101,18 +153,39 @@ class Cenario:
         nm = self.n_jobs / self.n_maquinas
         if nm <= 1: return np.zeros(self.n_jobs)
         limite_superior = (nm - 1) * (mu_p + MEDIA_SETUP_BASE)
-        tempos_gerados = np.random.uniform(low=0, high=limite_superior, size=self.n_jobs)
+        tempos_gerados = self.rng.uniform(low=0, high=limite_superior, size=self.n_jobs)
         return np.round(tempos_gerados - np.min(tempos_gerados), 2)
 
+    def configuracao(self):
+        configuracao = {"codigo_cenario": self.codigo,"nivel_ready_time": self.nivel_ready_time,"variabilidade_processamento": self.variabilidade_processamento,"media_processamento": self.media_processamento,"estrutura_setup": self.estrutura_setup,"variabilidade_setup": self.variabilidade_setup,"n_maquinas": self.n_maquinas,"n_medio_jobs_maquina": self.n_medio_jobs_maquina,"n_jobs": self.n_jobs}
+        if self.niveis:
+            configuracao["niveis_personalizados"] = dict(self.niveis)
+        return configuracao
+
     def to_dict(self):
         if self.matriz_setup is None: self.gerar_dados()
-        dados = {"configuracao": {"codigo_cenario": self.codigo,"nivel_ready_time": self.nivel_ready_time,"variabilidade_processamento": self.variabilidade_processamento,"media_processamento": self.media_processamento,"estrutura_setup": self.estrutura_setup,"variabilidade_setup": self.variabilidade_setup,"n_maquinas": self.n_maquinas,"n_medio_jobs_maquina": self.n_medio_jobs_maquina,"n_jobs": self.n_jobs},"matriz_setup": self.matriz_setup.tolist(),"tempos_processamento": self.tempos_processamento.tolist(),"ready_times": self.ready_times.tolist()}
-        matriz = dados['matriz_setup']
-        for i in range(len(matriz)):
-            for j in range(len(matriz[i])):
-                if matriz[i][j] == float('inf'): matriz[i][j] = None
+        dados = {"configuracao": self.configuracao(),"matriz_setup": self._matriz_setup_serializavel(),"tempos_processamento": self.tempos_processamento.tolist(),"ready_times": self.ready_times.tolist()}
         return dados
 
+    def matriz_setup_densa(self):
+        """Matriz N_JOBS x N_JOBS em float64 (inf na diagonal), qualquer que seja o armazenamento."""
+        if isinstance(self.matriz_setup, SetupProcedural):
+            return self.matriz_setup.matriz_tarefas()
+        if self.matriz_setup.dtype != np.float64:
+            # Os setups foram arredondados a 2 casas antes da conversão para float32
+            return np.round(self.matriz_setup.astype(np.float64), 2)
+        return self.matriz_setup
+
+    def _matriz_setup_serializavel(self):
+        # A matriz procedural é salva pelos seus parâmetros
+        if isinstance(self.matriz_setup, SetupProcedural):
+            return self.matriz_setup.parametros()
+        # inf (diagonal) vira None em uma única operação vetorizada sobre um array de objetos
+        densa = self.matriz_setup_densa()
+        matriz = densa.astype(object)
+        matriz[np.isinf(densa)] = None
+        return matriz.tolist()
+
     def salvar_em_json(self, caminho_arquivo, verbose=True): # Adicionado o parâmetro verbose
         dados_para_salvar = self.to_dict()
         with open(caminho_arquivo, 'w') as f:
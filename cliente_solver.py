@@ -0,0 +1,124 @@
+# Arquivo: cliente_solver.py
+#
+# Cliente do servidor_solver.py. Usa apenas a biblioteca padrão (não importa o
+# NumPy nem o solver), de modo que cada chamada inicia rapidamente.
+#
+# Uso:
+#   python cliente_solver.py resolver instancias/HHHHHHH/HHHHHHH_1.json --estrategia primeira_candidatos
+#   python cliente_solver.py resolver instancias/HHHHHHH/HHHHHHH_1.json --sem_esperar
+#   python cliente_solver.py tarefa 7
+#   python cliente_solver.py cancelar 7
+#   python cliente_solver.py estado
+#   python cliente_solver.py encerrar
+
+import os
+import sys
+import json
+import argparse
+import urllib.error
+import urllib.request
+
+PORTA_PADRAO = 8765
+
+
+class ClienteSolver:
+    """Chamadas ao servidor do solver; as respostas são devolvidas como dicionários."""
+    def __init__(self, url=f'http://127.0.0.1:{PORTA_PADRAO}', tempo_maximo=None):
+        self.url = url.rstrip('/')
+        self.tempo_maximo = tempo_maximo
+
+    def _chamar(self, metodo, rota, corpo=None):
+        dados = None if corpo is None else json.dumps(corpo).encode('utf-8')
+        pedido = urllib.request.Request(self.url + rota, data=dados, method=metodo,
+                                        headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(pedido, timeout=self.tempo_maximo) as resposta:
+                return json.loads(resposta.read())
+        except urllib.error.HTTPError as e:
+            # Erros do servidor (400, 404, 503) também vêm em JSON, com a chave 'erro'
+            resposta = json.loads(e.read() or b'{}')
+            resposta.setdefault("erro", str(e))
+            resposta["codigo_http"] = e.code
+            return resposta
+
+    def resolver(self, caminho=None, pacote=None, chave=None, esperar=True, **opcoes):
+        """
+        Pede a resolução de uma instância (.json em `caminho` ou entrada
+        `chave` do `pacote` binário). `opcoes`: modo_avaliacao, estrategia,
+        construtiva e tempo_limite. Os caminhos são enviados como absolutos,
+        pois o servidor pode ter outro diretório de trabalho.
+        """
+        corpo = {"esperar": esperar, **{k: v for k, v in opcoes.items() if v is not None}}
+        if pacote:
+            corpo.update(pacote=os.path.abspath(pacote), chave=chave)
+        else:
+            corpo["caminho"] = os.path.abspath(caminho)
+        return self._chamar('POST', '/resolver', corpo)
+
+    def tarefa(self, id_tarefa):
+        return self._chamar('GET', f'/tarefas/{id_tarefa}')
+
+    def cancelar(self, id_tarefa):
+        return self._chamar('DELETE', f'/tarefas/{id_tarefa}')
+
+    def estado(self):
+        return self._chamar('GET', '/estado')
+
+    def encerrar(self):
+        return self._chamar('POST', '/encerrar', {})
+
+
+def main(args):
+    cliente = ClienteSolver(f'http://127.0.0.1:{args.porta}')
+    try:
+        if args.comando == 'resolver':
+            resposta = cliente.resolver(args.caminho, pacote=args.pacote, chave=args.chave, esperar=not args.sem_esperar,
+                                        modo_avaliacao=args.modo_avaliacao, estrategia=args.estrategia,
+                                        construtiva=args.construtiva, tempo_limite=args.tempo_limite)
+            if not args.com_solucao and "resultado" in resposta:
+                resposta["resultado"].pop("solucao", None)
+        elif args.comando in ('tarefa', 'cancelar'):
+            resposta = getattr(cliente, args.comando)(args.id)
+        else:
+            resposta = getattr(cliente, args.comando)()
+    except urllib.error.URLError as e:
+        print(f"ERRO: não foi possível conectar ao servidor na porta {args.porta} ({e.reason}). "
+              f"Inicie-o com 'python servidor_solver.py'.", file=sys.stderr)
+        return 2
+    print(json.dumps(resposta, indent=4, ensure_ascii=False))
+    return 1 if "erro" in resposta else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cliente do servidor local do solver.")
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO,
+                        help=f'Porta do servidor em 127.0.0.1 (padrão: {PORTA_PADRAO}).')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('resolver', help='Resolve uma instância.')
+    p.add_argument('caminho', type=str, nargs='?', default=None,
+                   help='Arquivo .json da instância.')
+    p.add_argument('--pacote', type=str, default=None,
+                   help='Pacote binário (caminho sem extensão), no lugar do .json.')
+    p.add_argument('--chave', type=str, default=None,
+                   help="Chave da instância no pacote (ex: HHHHHHH_1).")
+    p.add_argument('--modo_avaliacao', type=str, default=None,
+                   help='incremental ou vetorizado.')
+    p.add_argument('--estrategia', type=str, default=None,
+                   help='Estratégia de varredura da busca local.')
+    p.add_argument('--construtiva', type=str, default=None,
+                   help='Heurística da solução inicial.')
+    p.add_argument('--tempo_limite', type=float, default=None,
+                   help='Tempo limite, em segundos, da resolução (ver run_solver.py --help).')
+    p.add_argument('--sem_esperar', action='store_true',
+                   help='Apenas coloca a tarefa na fila e exibe o seu id.')
+    p.add_argument('--com_solucao', action='store_true',
+                   help='Exibe também as sequências de cada máquina.')
+
+    for comando, ajuda in (('tarefa', 'Consulta o estado de uma tarefa.'), ('cancelar', 'Cancela uma tarefa.')):
+        p = sub.add_parser(comando, help=ajuda)
+        p.add_argument('id', type=str, help='Id da tarefa.')
+    sub.add_parser('estado', help='Exibe o estado do servidor.')
+    sub.add_parser('encerrar', help='Encerra o servidor.')
+
+    sys.exit(main(parser.parse_args()))
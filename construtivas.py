@@ -0,0 +1,231 @@
+# Arquivo: construtivas.py
+
+import math
+import time
+from itertools import chain, islice
+
+import numpy as np
+
+
+class EstadoMaquinas:
+    """
+    Estado de uma solução em construção. Para cada máquina são mantidos a
+    sequência e os tempos de conclusão acumulados (prefixos), de modo que o
+    tempo da máquina após anexar uma tarefa ao fim é obtido em O(1), a partir
+    do tempo de conclusão e da última tarefa, com as mesmas operações de
+    `calculate_sequence_time`.
+    """
+    def __init__(self, instancia):
+        self.p = instancia.tempos_lista
+        self.s = instancia.setup_lista
+        self.r = instancia.liberacao_lista
+        self.solucao = {m_id: [] for m_id in range(1, instancia.n_maquinas + 1)}
+        self.prefixos = {m_id: [] for m_id in self.solucao}
+
+    def tempo_maquina(self, m_id):
+        prefixos = self.prefixos[m_id]
+        return prefixos[-1] if prefixos else 0
+
+    def makespan(self):
+        return max((self.tempo_maquina(m_id) for m_id in self.solucao), default=0)
+
+    def _continuar(self, concl, ultima, tarefas, limite=math.inf):
+        """Tempo de conclusão a partir de (concl, ultima); interrompe ao atingir `limite`."""
+        p, s, r = self.p, self.s, self.r
+        for tarefa in tarefas:
+            liberacao = r[tarefa]
+            inicio = liberacao if liberacao > concl else concl
+            concl = inicio + s[ultima][tarefa] + p[tarefa]
+            if concl >= limite:
+                return concl
+            ultima = tarefa
+        return concl
+
+    def tempo_apos_anexar(self, m_id, tarefa):
+        seq = self.solucao[m_id]
+        if not seq:
+            return self._continuar(0, 0, (tarefa,))
+        return self._continuar(self.prefixos[m_id][-1], seq[-1], (tarefa,))
+
+    def anexar(self, m_id, tarefa):
+        self.prefixos[m_id].append(self.tempo_apos_anexar(m_id, tarefa))
+        self.solucao[m_id].append(tarefa)
+
+    def melhor_insercao(self, m_id, tarefa, limite=math.inf):
+        """
+        Retorna (tempo, posicao) da posição da sequência de `m_id` em que inserir
+        `tarefa` resulta no menor tempo de conclusão da máquina, considerando
+        apenas valores menores que `limite` (posicao None se nenhum for).
+        """
+        seq, prefixos = self.solucao[m_id], self.prefixos[m_id]
+        melhor_tempo, melhor_posicao = limite, None
+        for posicao in range(len(seq) + 1):
+            concl, ultima = (prefixos[posicao - 1], seq[posicao - 1]) if posicao > 0 else (0, 0)
+            tempo = self._continuar(concl, ultima, chain((tarefa,), islice(seq, posicao, None)), melhor_tempo)
+            if tempo < melhor_tempo:
+                melhor_tempo, melhor_posicao = tempo, posicao
+        return melhor_tempo, melhor_posicao
+
+    def inserir(self, m_id, tarefa, posicao):
+        seq = self.solucao[m_id]
+        seq.insert(posicao, tarefa)
+        concl, ultima = (self.prefixos[m_id][posicao - 1], seq[posicao - 1]) if posicao > 0 else (0, 0)
+        prefixos = self.prefixos[m_id][:posicao]
+        for tarefa in seq[posicao:]:
+            concl = self._continuar(concl, ultima, (tarefa,))
+            prefixos.append(concl)
+            ultima = tarefa
+        self.prefixos[m_id] = prefixos
+
+
+def ordem_decrescente_processamento(instancia):
+    """Tarefas em ordem decrescente de tempo de processamento (empates pela ordem dos ids)."""
+    p = instancia.tempos_lista
+    return sorted(range(1, instancia.n_jobs + 1), key=lambda tarefa: p[tarefa], reverse=True)
+
+
+# --- HEURÍSTICAS CONSTRUTIVAS ---
+
+def ffd(instancia, ordem=None):
+    """
+    First Fit Decreasing: cada tarefa, em ordem decrescente de processamento
+    (ou na `ordem` informada), é anexada à máquina em que terminaria mais cedo.
+    Mesma solução de `solve_with_ffd`, com a avaliação de cada máquina em O(1).
+    """
+    estado = EstadoMaquinas(instancia)
+    for tarefa in (ordem_decrescente_processamento(instancia) if ordem is None else ordem):
+        melhor_maquina, melhor_tempo = None, math.inf
+        for m_id in estado.solucao:
+            tempo = estado.tempo_apos_anexar(m_id, tarefa)
+            if tempo < melhor_tempo:
+                melhor_maquina, melhor_tempo = m_id, tempo
+        estado.anexar(melhor_maquina, tarefa)
+    return estado.solucao
+
+
+def insercao_melhor_posicao(instancia, ordem=None):
+    """
+    Como o FFD, mas cada tarefa pode ser inserida em qualquer posição de
+    qualquer máquina; é escolhida a inserção que resulta no menor tempo de
+    conclusão da máquina. A avaliação de uma posição retoma o cálculo a partir
+    do prefixo que não muda e é interrompida ao superar a melhor já encontrada.
+    """
+    estado = EstadoMaquinas(instancia)
+    for tarefa in (ordem_decrescente_processamento(instancia) if ordem is None else ordem):
+        melhor_tempo, melhor_maquina, melhor_posicao = math.inf, None, None
+        for m_id in estado.solucao:
+            tempo, posicao = estado.melhor_insercao(m_id, tarefa, melhor_tempo)
+            if posicao is not None:
+                melhor_tempo, melhor_maquina, melhor_posicao = tempo, m_id, posicao
+        estado.inserir(melhor_maquina, tarefa, melhor_posicao)
+    return estado.solucao
+
+
+def lista_por_liberacao(instancia):
+    """
+    List scheduling por data de liberação: as tarefas são consideradas em
+    ordem crescente de ready time (empates pelo maior processamento) e cada
+    uma é anexada à máquina em que terminaria mais cedo.
+    """
+    p, r = instancia.tempos_lista, instancia.liberacao_lista
+    ordem = sorted(range(1, instancia.n_jobs + 1), key=lambda tarefa: (r[tarefa], -p[tarefa]))
+    return ffd(instancia, ordem)
+
+
+def _estado_vetorizado(instancia):
+    m = instancia.n_maquinas
+    return np.zeros(m), np.zeros(m, dtype=np.intp), {m_id: [] for m_id in range(1, m + 1)}
+
+
+def setup_mais_proximo(instancia):
+    """
+    Guloso do setup mais próximo: a máquina que fica livre mais cedo recebe,
+    entre as tarefas restantes, a que terminaria mais cedo nela, o que combina
+    o menor setup a partir da sua última tarefa com o ready time.
+    """
+    setup, proc, lib = instancia.setup, instancia.processamento, instancia.liberacao
+    concl, ultima, solucao = _estado_vetorizado(instancia)
+    restantes = np.arange(instancia.n_jobs)
+    while restantes.size:
+        a = int(np.argmin(concl))
+        tempos = np.maximum(concl[a], lib[restantes]) + setup[ultima[a], restantes] + proc[restantes]
+        k = int(np.argmin(tempos))
+        tarefa = int(restantes[k])
+        concl[a], ultima[a] = tempos[k], tarefa + 1
+        solucao[a + 1].append(tarefa + 1)
+        restantes = np.delete(restantes, k)
+    return solucao
+
+
+def arrependimento(instancia):
+    """
+    Guloso por arrependimento (regret): para cada tarefa restante, compara o
+    tempo de conclusão ao anexá-la à melhor e à segunda melhor máquina; a
+    tarefa com a maior diferença, isto é, a que mais perde se não for
+    alocada agora, vai para a sua melhor máquina.
+    """
+    setup, proc, lib = instancia.setup, instancia.processamento, instancia.liberacao
+    concl, ultima, solucao = _estado_vetorizado(instancia)
+    restantes = np.arange(instancia.n_jobs)
+    while restantes.size:
+        # tempos[a, k]: conclusão da máquina a se a k-ésima tarefa restante for anexada a ela
+        tempos = (np.maximum(concl[:, None], lib[restantes][None, :]) + setup[ultima[:, None], restantes[None, :]]
+                  + proc[restantes][None, :])
+        if tempos.shape[0] > 1:
+            duas_menores = np.partition(tempos, 1, axis=0)[:2]
+            k = int(np.argmax(duas_menores[1] - duas_menores[0]))
+        else:
+            k = int(np.argmin(tempos[0]))
+        a = int(np.argmin(tempos[:, k]))
+        tarefa = int(restantes[k])
+        concl[a], ultima[a] = tempos[a, k], tarefa + 1
+        solucao[a + 1].append(tarefa + 1)
+        restantes = np.delete(restantes, k)
+    return solucao
+
+
+HEURISTICAS = {
+    'ffd': ffd,
+    'insercao': insercao_melhor_posicao,
+    'liberacao': lista_por_liberacao,
+    'setup_proximo': setup_mais_proximo,
+    'arrependimento': arrependimento,
+}
+
+# Seleção que executa todas as heurísticas e fica com a de menor makespan
+MELHOR = 'melhor'
+
+
+def makespan_da_solucao(solucao, instancia):
+    estado = EstadoMaquinas(instancia)
+    return max((estado._continuar(0, 0, seq) for seq in solucao.values()), default=0)
+
+
+def melhor_construcao(instancia, heuristicas=tuple(HEURISTICAS), prazo=None):
+    """
+    Executa as heurísticas informadas e retorna (nome, solucao, makespan) da
+    de menor makespan; em caso de empate, vale a primeira da lista. Com
+    `prazo` (instante de time.perf_counter), as heurísticas restantes deixam
+    de ser executadas quando ele é atingido; a primeira sempre é executada.
+    """
+    melhor = None
+    for nome in heuristicas:
+        if melhor is not None and prazo is not None and time.perf_counter() >= prazo:
+            break
+        solucao = HEURISTICAS[nome](instancia)
+        makespan = makespan_da_solucao(solucao, instancia)
+        if melhor is None or makespan < melhor[2]:
+            melhor = (nome, solucao, makespan)
+    return melhor
+
+
+def construir(nome, instancia, prazo=None):
+    """
+    Solução inicial pela heurística `nome` (uma de HEURISTICAS ou 'melhor').
+    `prazo` só é usado por 'melhor' (ver melhor_construcao).
+    """
+    if nome == MELHOR:
+        return melhor_construcao(instancia, prazo=prazo)[1]
+    if nome not in HEURISTICAS:
+        raise ValueError(f"Heurística construtiva desconhecida: '{nome}'. Use uma de {list(HEURISTICAS) + [MELHOR]}.")
+    return HEURISTICAS[nome](instancia)
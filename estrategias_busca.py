@@ -0,0 +1,209 @@
+# Arquivo: estrategias_busca.py
+
+import math
+
+import numpy as np
+
+from avaliacao_incremental import TRANSFERENCIA, TROCA_INTER, TROCA_INTRA
+from matriz_setup import LINHAS_POR_BLOCO
+
+VIZINHANCAS = (TRANSFERENCIA, TROCA_INTER, TROCA_INTRA)
+
+# --- REGRAS DE ACEITAÇÃO E ORDENS DE VIZINHANÇA ---
+MELHOR_MELHORIA = 'melhor'
+PRIMEIRA_MELHORIA = 'primeira'
+ORDEM_FIXA = 'fixa'
+ORDEM_ALEATORIA = 'aleatoria'
+ORDEM_RODIZIO = 'rodizio'
+
+
+def listas_de_candidatos(instancia, tamanho):
+    """
+    Para cada tarefa a, o conjunto das `tamanho` tarefas b com menor setup
+    s[a][b] na matriz de setup, isto é, as sucessoras "baratas" de a.
+    """
+    tamanho = min(tamanho, instancia.n_jobs - 1)
+    listas = [frozenset()]
+    # A matriz é percorrida em blocos de linhas para não copiá-la inteira
+    for inicio in range(1, instancia.n_jobs + 1, LINHAS_POR_BLOCO):
+        bloco = np.array(instancia.setup[inicio:inicio + LINHAS_POR_BLOCO])
+        linhas = np.arange(bloco.shape[0])
+        bloco[linhas, linhas + inicio - 1] = np.inf
+        mais_proximas = np.argsort(bloco, axis=1, kind='stable')[:, :tamanho] + 1
+        listas += [frozenset(linha) for linha in mais_proximas.tolist()]
+    return listas
+
+
+class EstrategiaBusca:
+    """
+    Estratégia de varredura da vizinhança para a busca local, usada no lugar
+    de AvaliadorIncremental.buscar_melhor_movimento.
+
+    A varredura é feita tarefa a tarefa: para cada tarefa (dona do movimento),
+    são avaliadas sua transferência para as outras máquinas, suas trocas com
+    tarefas de outras máquinas e suas trocas dentro da própria máquina.
+
+    Parâmetros:
+        regra: 'melhor' (melhor melhoria) ou 'primeira' (aceita o primeiro
+            vizinho que melhora o makespan).
+        ordem: ordem das vizinhanças em cada chamada: 'fixa' (transferência,
+            troca inter, troca intra), 'aleatoria' (sorteada a cada chamada) ou
+            'rodizio' (a vizinhança inicial avança uma posição a cada chamada).
+        n_candidatos: se informado, restringe transferências e trocas aos
+            movimentos em que alguma tarefa movida passa a vir logo após uma
+            tarefa `a` que a tem entre as suas `n_candidatos` sucessoras de
+            menor setup s[a][b] (listas de candidatos). Ocupar a primeira
+            posição de uma máquina é sempre permitido.
+        dont_look: ativa os don't-look bits. A tarefa cujos movimentos não
+            trouxeram melhoria é marcada e ignorada nas varreduras seguintes,
+            até que uma das máquinas onde está seja alterada por um movimento.
+            Como os movimentos avaliados dependem das máquinas críticas,
+            todas as marcas são apagadas quando o conjunto delas muda.
+        seed: semente da ordem aleatória.
+    """
+    def __init__(self, instancia, regra=MELHOR_MELHORIA, ordem=ORDEM_FIXA, n_candidatos=None, dont_look=False, seed=None):
+        if regra not in (MELHOR_MELHORIA, PRIMEIRA_MELHORIA):
+            raise ValueError(f"Regra de aceitação desconhecida: '{regra}'.")
+        if ordem not in (ORDEM_FIXA, ORDEM_ALEATORIA, ORDEM_RODIZIO):
+            raise ValueError(f"Ordem de vizinhanças desconhecida: '{ordem}'.")
+        self.regra = regra
+        self.ordem = ordem
+        self.candidatos = listas_de_candidatos(instancia, n_candidatos) if n_candidatos else None
+        self.dont_look = dont_look
+        self.rng = np.random.default_rng(seed)
+        self._chamadas = 0
+        self._sem_olhar = set()
+        self._ultimo_movimento = None
+        self._criticas = None
+
+    # --- FILTROS ---
+
+    def _permitido(self, anterior, tarefa):
+        """A lista de candidatos permite que `tarefa` venha logo após `anterior`?"""
+        return self.candidatos is None or anterior == 0 or tarefa in self.candidatos[anterior]
+
+    def _ordem_vizinhancas(self):
+        if self.ordem == ORDEM_ALEATORIA:
+            return [VIZINHANCAS[i] for i in self.rng.permutation(len(VIZINHANCAS))]
+        if self.ordem == ORDEM_RODIZIO:
+            inicio = self._chamadas % len(VIZINHANCAS)
+            return list(VIZINHANCAS[inicio:] + VIZINHANCAS[:inicio])
+        return list(VIZINHANCAS)
+
+    def _liberar_maquinas_alteradas(self, avaliador):
+        """Reativa as tarefas das máquinas alteradas pelo último movimento aplicado."""
+        if self._ultimo_movimento is None:
+            return
+        movimento = self._ultimo_movimento
+        maquinas = (movimento[1], movimento[3]) if movimento[0] != TROCA_INTRA else (movimento[1],)
+        for m_id in maquinas:
+            self._sem_olhar.difference_update(avaliador.solucao[m_id])
+        self._ultimo_movimento = None
+
+    # --- MOVIMENTOS DE UMA TAREFA ---
+
+    def _movimentos(self, avaliador, vizinhanca, m_id, i, criticas, posicoes):
+        """
+        Gera os movimentos da tarefa na posição `i` de `m_id` que passam pelos
+        filtros. `posicoes` leva cada máquina à sua posição em machine_ids.
+        """
+        solucao = avaliador.solucao
+        seq = solucao[m_id]
+        tarefa = seq[i]
+        anterior = seq[i - 1] if i > 0 else 0
+        if vizinhanca == TRANSFERENCIA:
+            for m_to in avaliador.machine_ids:
+                if m_to == m_id or not criticas <= {m_id, m_to}: continue
+                destino = solucao[m_to]
+                if self._permitido(destino[-1] if destino else 0, tarefa):
+                    yield (TRANSFERENCIA, m_id, i, m_to)
+        elif vizinhanca == TROCA_INTER:
+            for m_outra in avaliador.machine_ids:
+                if m_outra == m_id or not criticas <= {m_id, m_outra}: continue
+                outra = solucao[m_outra]
+                for j, tarefa_outra in enumerate(outra):
+                    anterior_outra = outra[j - 1] if j > 0 else 0
+                    if not (self._permitido(anterior, tarefa_outra) or self._permitido(anterior_outra, tarefa)): continue
+                    # O movimento é sempre descrito com a máquina de menor posição primeiro
+                    if posicoes[m_id] < posicoes[m_outra]:
+                        yield (TROCA_INTER, m_id, i, m_outra, j)
+                    else:
+                        yield (TROCA_INTER, m_outra, j, m_id, i)
+        elif criticas <= {m_id}:
+            for j in range(len(seq)):
+                if j == i: continue
+                a, b = min(i, j), max(i, j)
+                anterior_b = seq[b - 1] if b - 1 != a else seq[b]
+                anterior_a = seq[a - 1] if a > 0 else 0
+                if self._permitido(anterior_a, seq[b]) or self._permitido(anterior_b, seq[a]):
+                    yield (TROCA_INTRA, m_id, a, b)
+
+    # --- VARREDURA ---
+
+    def __call__(self, avaliador):
+        """Retorna (makespan, movimento) do vizinho escolhido, ou None se não houver melhoria."""
+        self._liberar_maquinas_alteradas(avaliador)
+        vizinhancas = self._ordem_vizinhancas()
+        self._chamadas += 1
+
+        tempos = avaliador.tempos_maquinas()
+        atual = max(tempos.values()) if tempos else 0
+        criticas = {m_id for m_id, tempo in tempos.items() if tempo == atual}
+        if len(criticas) > 2:
+            return None
+        if self.dont_look and criticas != self._criticas:
+            # As marcas valiam para os movimentos permitidos pelas críticas anteriores
+            self._sem_olhar.clear()
+            self._criticas = criticas
+        melhor_makespan, melhor_movimento = atual, None
+        avaliados = set()
+        posicoes = {m_id: k for k, m_id in enumerate(avaliador.machine_ids)}
+
+        for m_id in avaliador.machine_ids:
+            for i, tarefa in enumerate(list(avaliador.solucao[m_id])):
+                if self.dont_look and tarefa in self._sem_olhar: continue
+                melhorou = False
+                for vizinhanca in vizinhancas:
+                    for movimento in self._movimentos(avaliador, vizinhanca, m_id, i, criticas, posicoes):
+                        # Trocas são geradas pelas duas tarefas envolvidas; cada uma é avaliada uma vez
+                        if movimento[0] != TRANSFERENCIA:
+                            if movimento in avaliados: continue
+                            avaliados.add(movimento)
+                        valor = avaliador.avaliar(movimento, melhor_makespan, tempos)
+                        if valor < melhor_makespan:
+                            melhor_makespan, melhor_movimento = valor, movimento
+                            melhorou = True
+                            if self.regra == PRIMEIRA_MELHORIA:
+                                self._ultimo_movimento = movimento
+                                return melhor_makespan, movimento
+                if self.dont_look and not melhorou:
+                    self._sem_olhar.add(tarefa)
+
+        if melhor_movimento is None:
+            return None
+        self._ultimo_movimento = melhor_movimento
+        return melhor_makespan, melhor_movimento
+
+
+# Configurações pré-definidas, selecionáveis pelo nome na busca local
+ESTRATEGIAS_PREDEFINIDAS = {
+    'primeira_aleatoria': dict(regra=PRIMEIRA_MELHORIA, ordem=ORDEM_ALEATORIA),
+    'primeira_rodizio': dict(regra=PRIMEIRA_MELHORIA, ordem=ORDEM_RODIZIO),
+    'melhor_candidatos': dict(regra=MELHOR_MELHORIA, n_candidatos='auto'),
+    'primeira_candidatos': dict(regra=PRIMEIRA_MELHORIA, ordem=ORDEM_RODIZIO, n_candidatos='auto'),
+    'primeira_dont_look': dict(regra=PRIMEIRA_MELHORIA, ordem=ORDEM_RODIZIO, dont_look=True),
+    'primeira_candidatos_dont_look': dict(regra=PRIMEIRA_MELHORIA, ordem=ORDEM_RODIZIO, n_candidatos='auto', dont_look=True),
+}
+
+
+def criar_estrategia(nome, instancia, seed=None):
+    """
+    Cria uma das estratégias pré-definidas. Com n_candidatos='auto', a lista de
+    candidatos de cada tarefa tem 20% das tarefas (no mínimo 5).
+    """
+    if nome not in ESTRATEGIAS_PREDEFINIDAS:
+        raise ValueError(f"Estratégia desconhecida: '{nome}'. Use uma de {list(ESTRATEGIAS_PREDEFINIDAS)}.")
+    parametros = dict(ESTRATEGIAS_PREDEFINIDAS[nome])
+    if parametros.get('n_candidatos') == 'auto':
+        parametros['n_candidatos'] = max(5, math.ceil(0.2 * instancia.n_jobs))
+    return EstrategiaBusca(instancia, seed=seed, **parametros)
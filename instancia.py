@@ -0,0 +1,115 @@
+# Arquivo: instancia.py
+
+import json
+from array import array
+from functools import cached_property
+
+import numpy as np
+
+from matriz_setup import SetupProcedural
+
+
+class Instancia:
+    """
+    Representação compacta de uma instância do problema, baseada em arrays
+    NumPy contíguos. As tarefas são identificadas por inteiros de 1 a N_JOBS.
+
+    Atributos:
+        config (dict): bloco 'configuracao' da instância.
+        setup (np.ndarray ou SetupProcedural): matriz (N_JOBS+1) x N_JOBS. A
+            linha 0 é o estado inicial da máquina e a linha i (1..N_JOBS) é a
+            tarefa i; a coluna j-1 é a tarefa j. A diagonal (i -> i) vale 0.
+            É densa em `dtype_setup` (float64 ou float32) ou, se a matriz
+            recebida for um SetupProcedural, gerada sob demanda.
+        processamento (np.ndarray): tempo de processamento da tarefa j na posição j-1.
+        liberacao (np.ndarray): ready time da tarefa j na posição j-1.
+        min_setup_saida (np.ndarray): menor setup saindo de cada tarefa para
+            qualquer outra, usado pelo DDLB.
+    """
+    def __init__(self, config, tempos_processamento, matriz_setup, ready_times, dtype_setup=np.float64):
+        self.config = config
+        self.n_jobs = config['n_jobs']
+        self.n_maquinas = config['n_maquinas']
+        n = self.n_jobs
+
+        self.processamento = np.ascontiguousarray(tempos_processamento, dtype=np.float64)
+        self.liberacao = np.ascontiguousarray(ready_times, dtype=np.float64)
+
+        if isinstance(matriz_setup, SetupProcedural):
+            self.setup = matriz_setup
+            self.min_setup_saida = matriz_setup.min_setup_saida
+            return
+
+        # A diagonal chega como None (JSON) ou inf (Cenario); a matriz é preenchida
+        # no lugar para não criar cópias N_JOBS x N_JOBS temporárias
+        self.setup = np.empty((n + 1, n), dtype=dtype_setup)
+        bloco = self.setup[1:]
+        bloco[:] = np.asarray(matriz_setup, dtype=dtype_setup).reshape(n, n)
+        # Linha 0: o setup inicial para 'j' é o maior tempo de setup de qualquer outra tarefa para 'j'
+        np.fill_diagonal(bloco, -np.inf)
+        self.setup[0] = bloco.max(axis=0, initial=0)
+        # Menor setup saindo de cada tarefa (calculado uma única vez para o DDLB)
+        np.fill_diagonal(bloco, np.inf)
+        self.min_setup_saida = bloco.min(axis=1) if n > 1 else np.zeros(n)
+        np.fill_diagonal(bloco, 0)
+
+    @classmethod
+    def de_dict(cls, dados, dtype_setup=np.float64):
+        """Cria a instância a partir do dicionário no formato do arquivo .json."""
+        # O NumPy converte os `null` da diagonal em nan ao criar o array float
+        matriz_setup = dados['matriz_setup']
+        # Instâncias com setup procedural guardam apenas os parâmetros da matriz
+        if isinstance(matriz_setup, dict):
+            matriz_setup = SetupProcedural.de_parametros(matriz_setup)
+        return cls(dados['configuracao'], dados['tempos_processamento'],
+                   matriz_setup, dados['ready_times'], dtype_setup)
+
+    @classmethod
+    def de_json(cls, caminho_arquivo, dtype_setup=np.float64):
+        with open(caminho_arquivo, 'r') as f:
+            return cls.de_dict(json.load(f), dtype_setup)
+
+    @classmethod
+    def de_cenario(cls, cenario):
+        """Cria a instância diretamente de um objeto Cenario, sem passar pelo disco, no armazenamento do cenário."""
+        if cenario.matriz_setup is None: cenario.gerar_dados(verbose=False)
+        return cls(cenario.configuracao(), cenario.tempos_processamento,
+                   cenario.matriz_setup, cenario.ready_times, cenario.matriz_setup.dtype)
+
+    # --- VISÕES PARA O LAÇO ESCALAR ---
+    # Indexar um array NumPy elemento a elemento a partir do Python é mais lento
+    # que indexar uma lista. Os laços de avaliação de sequências usam, por isso,
+    # cópias em lista indexadas diretamente pelo id da tarefa (posição 0 sem uso).
+
+    @cached_property
+    def tempos_lista(self):
+        return [0.0] + self.processamento.tolist()
+
+    @cached_property
+    def liberacao_lista(self):
+        return [0.0] + self.liberacao.tolist()
+
+    @cached_property
+    def setup_lista(self):
+        """
+        setup_lista[i][j]: setup de i (0 = estado inicial) para a tarefa j.
+        Em float32, as linhas são array('f'), que ocupam 4 bytes por valor e
+        devolvem floats do Python com os mesmos valores da matriz NumPy; no
+        setup procedural, cada valor é calculado no acesso.
+        """
+        if isinstance(self.setup, SetupProcedural):
+            return self.setup.linhas_lista()
+        if self.setup.dtype == np.float32:
+            zero = np.zeros(1, dtype=np.float32).tobytes()
+            return [array('f', zero + linha.tobytes()) for linha in self.setup]
+        return [[0.0] + linha for linha in self.setup.tolist()]
+
+    def __getstate__(self):
+        # As visões em lista são recriadas sob demanda após o pickle
+        estado = self.__dict__.copy()
+        for nome in ('tempos_lista', 'liberacao_lista', 'setup_lista'):
+            estado.pop(nome, None)
+        return estado
+
+    def __str__(self):
+        return f"<Instancia código='{self.config.get('codigo_cenario', '?')}' | Máquinas={self.n_maquinas}, Tarefas={self.n_jobs}>"
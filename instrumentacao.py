@@ -0,0 +1,199 @@
+# Arquivo: instrumentacao.py
+
+import os
+import sys
+import json
+import time
+import signal
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Fase do solver em que é contada cada origem de avaliações
+FASE_DAS_AVALIACOES = {
+    'ffd': 'ffd',
+    'transferencia': 'busca_local',
+    'troca_inter': 'busca_local',
+    'troca_intra': 'busca_local',
+}
+
+
+class Metricas:
+    """
+    Métricas de uma execução do solver (FFD -> busca local -> DDLB):
+
+        fases_s: tempo de relógio de cada fase ('ffd', 'busca_local', 'ddlb').
+        avaliacoes: número de avaliações de sequência no FFD e de vizinhos
+            avaliados em cada vizinhança da busca local.
+        aceitos: movimentos aplicados pela busca local, por vizinhança.
+        trajetoria: pares (segundos desde a criação, makespan) a cada
+            melhoria, começando pelo makespan da solução inicial.
+
+    As funções do solver recebem o objeto pelo parâmetro `metricas` e o
+    alimentam apenas nos pontos de baixa frequência (início e fim de fases e
+    movimentos aceitos); os contadores por vizinho ficam no próprio avaliador
+    e só são mantidos com as métricas ativas.
+    """
+    ativo = True
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fases_s = {}
+        self.avaliacoes = Counter()
+        self.aceitos = Counter()
+        self.trajetoria = []
+
+    @contextmanager
+    def fase(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases_s[nome] = self.fases_s.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def contar_avaliacoes(self, contagens):
+        self.avaliacoes.update(contagens)
+
+    def acumular(self, avaliacoes, aceitos):
+        """Soma as contagens de avaliações e de movimentos aceitos de outra execução (ex.: outro processo)."""
+        self.avaliacoes.update(avaliacoes)
+        self.aceitos.update(aceitos)
+
+    def registrar_makespan(self, makespan, vizinhanca=None):
+        """Registra um ponto da trajetória; `vizinhanca` é a do movimento aceito, se houver."""
+        if vizinhanca is not None:
+            self.aceitos[vizinhanca] += 1
+        self.trajetoria.append((time.perf_counter() - self.inicio, makespan))
+
+    @property
+    def total_avaliacoes(self):
+        return sum(n for origem, n in self.avaliacoes.items() if FASE_DAS_AVALIACOES.get(origem) == 'busca_local')
+
+    def avaliacoes_por_segundo(self):
+        por_fase = Counter()
+        for origem, n in self.avaliacoes.items():
+            por_fase[FASE_DAS_AVALIACOES.get(origem, origem)] += n
+        return {fase: n / self.fases_s[fase] for fase, n in por_fase.items() if self.fases_s.get(fase)}
+
+    def to_dict(self):
+        return {
+            "fases_s": dict(self.fases_s),
+            "avaliacoes": dict(self.avaliacoes),
+            "aceitos": dict(self.aceitos),
+            "avaliacoes_por_segundo": self.avaliacoes_por_segundo(),
+            "trajetoria": [list(ponto) for ponto in self.trajetoria],
+        }
+
+    def salvar_json(self, caminho_arquivo, **extras):
+        """Grava as métricas em JSON; `extras` (ex.: código e réplica da instância) vão junto."""
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump({**extras, **self.to_dict()}, f, indent=4, ensure_ascii=False)
+
+
+class SemMetricas:
+    """Métricas desativadas: mesma interface de Metricas, sem nenhum registro."""
+    ativo = False
+
+    def fase(self, nome):
+        return nullcontext()
+
+    def contar_avaliacoes(self, contagens):
+        pass
+
+    def acumular(self, avaliacoes, aceitos):
+        pass
+
+    def registrar_makespan(self, makespan, vizinhanca=None):
+        pass
+
+
+# Instância única usada como padrão pelas funções do solver
+SEM_METRICAS = SemMetricas()
+
+
+# --- PERFILAMENTO ---
+
+class AmostradorPilha:
+    """
+    Perfilador por amostragem: a cada `intervalo` segundos de CPU, a pilha do
+    processo é lida e contada. O resultado é gravado no formato "collapsed"
+    (uma pilha por linha, funções separadas por ';', seguida da contagem),
+    aceito por ferramentas de flame graph. Os métodos seguem a interface de
+    cProfile.Profile.
+
+    Onde há SIGPROF (Linux, macOS), a amostra é tirada no tratador do sinal.
+    Nos demais sistemas, uma thread lê a pilha da thread principal; nesse caso
+    as amostras tendem a cair nos pontos em que ela libera o GIL (E/S, como
+    os prints da busca local).
+    """
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.amostras = Counter()
+        self._por_sinal = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+        self._parar = threading.Event()
+        self._thread = None
+        self._alvo = None
+        self._tratador_anterior = None
+
+    def _registrar(self, quadro):
+        pilha = []
+        while quadro is not None:
+            codigo = quadro.f_code
+            pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+            quadro = quadro.f_back
+        if pilha:
+            self.amostras[';'.join(reversed(pilha))] += 1
+
+    def _ao_sinal(self, numero, quadro):
+        self._registrar(quadro)
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self._registrar(sys._current_frames().get(self._alvo))
+
+    def enable(self):
+        if self._por_sinal:
+            self._tratador_anterior = signal.signal(signal.SIGPROF, self._ao_sinal)
+            signal.setitimer(signal.ITIMER_PROF, self.intervalo, self.intervalo)
+        else:
+            self._alvo = threading.get_ident()
+            self._thread = threading.Thread(target=self._amostrar, daemon=True)
+            self._thread.start()
+
+    def disable(self):
+        if self._por_sinal:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._tratador_anterior)
+        else:
+            self._parar.set()
+            self._thread.join()
+
+    def dump_stats(self, caminho_arquivo):
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            for pilha, n in self.amostras.most_common():
+                f.write(f"{pilha} {n}\n")
+
+
+TIPOS_PERFIL = ('cprofile', 'amostragem')
+
+
+@contextmanager
+def perfilar(caminho_arquivo=None, tipo='cprofile'):
+    """
+    Perfila o bloco e grava o resultado em `caminho_arquivo` (nada é feito se
+    ele não for informado). 'cprofile' grava as estatísticas do cProfile (ler
+    com `python -m pstats`); 'amostragem' usa o AmostradorPilha.
+    """
+    if caminho_arquivo is None:
+        yield
+        return
+    if tipo not in TIPOS_PERFIL:
+        raise ValueError(f"Tipo de perfil desconhecido: '{tipo}'. Use um de {TIPOS_PERFIL}.")
+    perfilador = cProfile.Profile() if tipo == 'cprofile' else AmostradorPilha()
+    perfilador.enable()
+    try:
+        yield
+    finally:
+        perfilador.disable()
+        perfilador.dump_stats(caminho_arquivo)
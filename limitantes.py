@@ -0,0 +1,174 @@
+# Arquivo: limitantes.py
+#
+# Limitantes inferiores do makespan calculados em lote. As instâncias com o
+# mesmo número de tarefas são empilhadas em arrays (instâncias x tarefas) e
+# cada limitante é uma operação vetorizada sobre o lote inteiro, em vez de um
+# laço por instância.
+#
+# Notação, por tarefa j: p_j processamento, r_j liberação, s0_j setup inicial
+# (linha 0 da matriz), a_j = min(s0_j, min_{i != j} S[i][j]) o menor setup que
+# j pode pagar ao entrar em uma máquina e w_j = p_j + a_j. Na recorrência do
+# solver (C = max(C, r) + s + p), toda tarefa paga um setup de entrada e
+# nenhum setup começa antes da liberação, então os limitantes abaixo, exceto
+# o DDLB, valem para qualquer solução:
+#
+#   ddlb             o DDLB do artigo (local_search2.calcular_ddlb), com o
+#                    menor setup de *saída*: max(Σ(p + saida)/m, max(r + p + saida)).
+#                    Fica para comparação: a última tarefa de cada máquina não
+#                    paga setup de saída, então, com setups assimétricos, ele
+#                    pode superar o ótimo e não entra em 'melhor'.
+#   carga            Σ w / m.
+#   inicio_maquinas  cada máquina usada começa na liberação da sua primeira
+#                    tarefa e paga por ela s0 no lugar de a. Com u máquinas
+#                    usadas, makespan >= (Σ w + soma dos u menores
+#                    r_j + s0_j - a_j) / u, isto é, os u menores acréscimos
+#                    de início, um por máquina; vale o mínimo em u = 1..min(m, N).
+#   liberacao        as tarefas liberadas a partir de t só são processadas
+#                    depois de t: max, em t = r_j, de t + Σ_{r_i >= t} w_i / m,
+#                    e ao menos r_j + w_j para cada tarefa.
+#   melhor           o maior dos limitantes acima, exceto o DDLB.
+#
+# As matrizes procedurais (matriz_setup.SetupProcedural) são lidas pela mesma
+# indexação das densas; instâncias grandes são percorridas em blocos de linhas.
+
+from collections import defaultdict
+
+import numpy as np
+
+from matriz_setup import SetupProcedural
+
+# Memória temporária máxima ao ler cada bloco de setups
+BYTES_POR_BLOCO = 32 * 1024 ** 2
+# Bytes temporários por setup lido: a cópia em float64 e, na matriz
+# procedural, os arrays intermediários do hash (medido com tracemalloc)
+BYTES_POR_VALOR_DENSO = 8
+BYTES_POR_VALOR_PROCEDURAL = 80
+
+
+def _bytes_por_valor(instancias):
+    if any(isinstance(inst.setup, SetupProcedural) for inst in instancias):
+        return BYTES_POR_VALOR_PROCEDURAL
+    return BYTES_POR_VALOR_DENSO
+
+
+def _menor_setup_entrada(instancias):
+    """
+    Setup inicial e menor setup de entrada (a_j) de cada tarefa, como arrays
+    (instâncias x N_JOBS), para instâncias com o mesmo N_JOBS.
+    """
+    n = instancias[0].n_jobs
+    iniciais = np.array([inst.setup[0] for inst in instancias], dtype=np.float64).reshape(len(instancias), n)
+    menores = np.empty_like(iniciais)
+    valores_por_bloco = BYTES_POR_BLOCO // _bytes_por_valor(instancias)
+    por_lote = valores_por_bloco // (n * n)
+    if por_lote >= 1:
+        diagonal = np.eye(n, dtype=bool)
+        for inicio in range(0, len(instancias), por_lote):
+            lote = np.array([inst.setup[1:] for inst in instancias[inicio:inicio + por_lote]], dtype=np.float64)
+            lote[:, diagonal] = np.inf
+            menores[inicio:inicio + por_lote] = lote.min(axis=1)
+    else:
+        # Uma instância por vez, em blocos de linhas
+        linhas_por_bloco = max(1, valores_por_bloco // n)
+        for b, inst in enumerate(instancias):
+            menores[b] = np.inf
+            for inicio in range(1, n + 1, linhas_por_bloco):
+                fim = min(inicio + linhas_por_bloco, n + 1)
+                bloco = np.array(inst.setup[inicio:fim], dtype=np.float64)
+                bloco[np.arange(fim - inicio), np.arange(inicio - 1, fim - 1)] = np.inf
+                np.minimum(menores[b], bloco.min(axis=0), out=menores[b])
+    # Com uma única tarefa, o único setup possível é o inicial
+    return iniciais, np.minimum(menores, iniciais)
+
+
+def _vetores(instancias, com_entrada=True):
+    """
+    Arrays (instâncias x N_JOBS) usados pelos limitantes, para instâncias com
+    o mesmo N_JOBS. Sem `com_entrada`, a matriz de setup não é percorrida
+    (basta para o DDLB).
+    """
+    v = {
+        "p": np.stack([inst.processamento for inst in instancias]),
+        "r": np.stack([inst.liberacao for inst in instancias]),
+        "saida": np.stack([np.asarray(inst.min_setup_saida, dtype=np.float64) for inst in instancias]),
+    }
+    if not com_entrada:
+        return v
+    inicial, entrada = _menor_setup_entrada(instancias)
+    v["w"] = v["p"] + entrada
+    # Acréscimo da primeira tarefa de uma máquina: espera até a liberação e setup inicial
+    v["inicio"] = v["r"] + inicial - entrada
+    return v
+
+
+# --- LIMITANTES (cada um recebe os vetores do lote e o número de máquinas, e retorna um valor por instância) ---
+
+def _ddlb(v, m):
+    # cumsum soma na mesma ordem de calcular_ddlb, então os valores são idênticos
+    carga = np.cumsum(v["p"] + v["saida"], axis=1)[:, -1] / m
+    caminho = (v["r"] + v["p"] + v["saida"]).max(axis=1, initial=0)
+    return np.maximum(carga, caminho)
+
+
+def _carga(v, m):
+    return v["w"].sum(axis=1) / m
+
+
+def _inicio_maquinas(v, m):
+    n = v["w"].shape[1]
+    maquinas_usadas = np.arange(1, n + 1)
+    valores = (v["w"].sum(axis=1)[:, None] + np.cumsum(np.sort(v["inicio"], axis=1), axis=1)) / maquinas_usadas
+    valores[maquinas_usadas[None, :] > m[:, None]] = np.inf
+    return valores.min(axis=1)
+
+
+def _liberacao(v, m):
+    ordem = np.argsort(-v["r"], axis=1, kind='stable')
+    r = np.take_along_axis(v["r"], ordem, axis=1)
+    restante = np.cumsum(np.take_along_axis(v["w"], ordem, axis=1), axis=1) / m[:, None]
+    return np.maximum((r + restante).max(axis=1), (v["r"] + v["w"]).max(axis=1))
+
+
+LIMITANTES = {
+    'ddlb': _ddlb,
+    'carga': _carga,
+    'inicio_maquinas': _inicio_maquinas,
+    'liberacao': _liberacao,
+}
+# Limitantes válidos para qualquer solução (combinados em 'melhor')
+LIMITANTES_VALIDOS = ('carga', 'inicio_maquinas', 'liberacao')
+
+
+def calcular_limitantes(instancias, nomes=None):
+    """
+    Calcula os limitantes `nomes` (padrão: todos de LIMITANTES e o 'melhor')
+    para uma lista de instâncias de tamanhos quaisquer. Retorna um dicionário
+    nome -> np.ndarray com um valor por instância, na ordem recebida.
+    """
+    instancias = list(instancias)
+    nomes = list(LIMITANTES) + ['melhor'] if nomes is None else list(nomes)
+    desconhecidos = set(nomes) - set(LIMITANTES) - {'melhor'}
+    if desconhecidos:
+        raise ValueError(f"Limitantes desconhecidos: {sorted(desconhecidos)}. Opções: {list(LIMITANTES) + ['melhor']}")
+    # 'melhor' precisa de todos os limitantes válidos
+    calculados = [nome for nome in LIMITANTES if nome in nomes or ('melhor' in nomes and nome in LIMITANTES_VALIDOS)]
+    resultado = {nome: np.zeros(len(instancias)) for nome in calculados}
+    grupos = defaultdict(list)
+    for i, inst in enumerate(instancias):
+        grupos[inst.n_jobs].append(i)
+    for n, indices in grupos.items():
+        if n == 0:
+            continue
+        grupo = [instancias[i] for i in indices]
+        v = _vetores(grupo, com_entrada=calculados != ['ddlb'])
+        m = np.array([inst.n_maquinas for inst in grupo], dtype=np.float64)
+        for nome in calculados:
+            resultado[nome][indices] = LIMITANTES[nome](v, m)
+    if 'melhor' in nomes:
+        resultado['melhor'] = np.max([resultado[nome] for nome in LIMITANTES_VALIDOS], axis=0)
+    return {nome: resultado[nome] for nome in nomes}
+
+
+def limitantes_da_instancia(instancia):
+    """Limitantes de uma única instância, como floats."""
+    return {nome: float(valores[0]) for nome, valores in calcular_limitantes([instancia]).items()}
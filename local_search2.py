@@ -1,50 +1,29 @@
-import copy
-import json
+import time
 import argparse
+from avaliacao_incremental import AvaliadorIncremental
+from instancia import Instancia
+import vizinhanca_vetorizada
+import construtivas
+from estrategias_busca import ESTRATEGIAS_PREDEFINIDAS, criar_estrategia
+from instrumentacao import Metricas, SEM_METRICAS, TIPOS_PERFIL, perfilar
 
 # --- 1. CARREGAMENTO E PREPARAÇÃO DOS DADOS ---
 
 def carregar_instancia_de_json(caminho_arquivo):
     """
-    Lê um arquivo de instância .json, converte as estruturas de dados e
-    prepara os dados para o algoritmo, incluindo a criação da linha '0' da matriz de setup.
+    Lê um arquivo de instância .json e o converte para uma Instancia baseada em
+    arrays NumPy, incluindo a criação da linha 0 da matriz de setup.
     """
-    with open(caminho_arquivo, 'r') as f:
-        dados = json.load(f)
-
-    config = dados['configuracao']
-    n_jobs = config['n_jobs']
-
-    # Converte listas para dicionários com chaves de 1 a N_JOBS
-    processing_times = {i + 1: val for i, val in enumerate(dados['tempos_processamento'])}
-    release_dates = {i + 1: val for i, val in enumerate(dados['ready_times'])}
-    
-    # Converte a matriz (lista de listas) para um dicionário aninhado com chaves inteiras
-    setup_matrix_dict = {}
-    matriz_lista = dados['matriz_setup']
-    for i in range(n_jobs):
-        setup_matrix_dict[i + 1] = {}
-        for j in range(n_jobs):
-            valor = matriz_lista[i][j] if matriz_lista[i][j] is not None else 0
-            setup_matrix_dict[i + 1][j + 1] = valor
-
-    # Cria a linha '0' da matriz de setup (setup do estado inicial para a primeira tarefa)
-    setup_matrix_dict['0'] = {}
-    for j in range(1, n_jobs + 1):
-        # O setup inicial para 'j' é o maior tempo de setup de qualquer outra tarefa para 'j'
-        max_setup_to_j = 0
-        for i in range(1, n_jobs + 1):
-            if i == j: continue
-            max_setup_to_j = max(max_setup_to_j, setup_matrix_dict[i][j])
-        setup_matrix_dict['0'][j] = max_setup_to_j
-
-    return config, processing_times, setup_matrix_dict, release_dates
+    return Instancia.de_json(caminho_arquivo)
 
 # --- 2. FUNÇÕES DO ALGORITMO ---
-def calculate_sequence_time(sequence, processing_times, setup_matrix, release_dates):
+def calculate_sequence_time(sequence, instancia):
     """Calcula o tempo total de conclusão para uma dada sequência de tarefas em uma máquina."""
+    processing_times = instancia.tempos_lista
+    setup_matrix = instancia.setup_lista
+    release_dates = instancia.liberacao_lista
     completion_time = 0
-    last_task = '0'
+    last_task = 0
     if not sequence:
         return 0
     
@@ -57,139 +36,202 @@ def calculate_sequence_time(sequence, processing_times, setup_matrix, release_da
         
     return completion_time
 
-def solve_with_ffd(config, processing_times, setup_matrix, release_dates):
-    """Gera uma solução inicial usando uma abordagem baseada em First Fit Decreasing (FFD)."""
-    n_machines = config['n_maquinas']
-    sorted_tasks = sorted(processing_times.keys(), key=lambda task: processing_times[task], reverse=True)
-    
-    machines = {m_id: [] for m_id in range(1, n_machines + 1)}
-    
-    for task_id in sorted_tasks:
-        potential_times = {}
-        for machine_id in machines:
-            temp_sequence = machines[machine_id] + [task_id]
-            potential_times[machine_id] = calculate_sequence_time(temp_sequence, processing_times, setup_matrix, release_dates)
-        
-        best_machine = min(potential_times, key=potential_times.get)
-        machines[best_machine].append(task_id)
+def solve_with_ffd(instancia, ordem=None, metricas=SEM_METRICAS):
+    """
+    Gera uma solução inicial usando uma abordagem baseada em First Fit Decreasing (FFD).
+    Se `ordem` for informada, as tarefas são alocadas nessa ordem em vez da
+    ordem decrescente de tempo de processamento.
+    O tempo de cada máquina após receber a tarefa é obtido em O(1) a partir do
+    seu tempo de conclusão e da sua última tarefa (construtivas.ffd), em vez
+    de recalcular a sequência inteira; a solução é a mesma.
+    """
+    with metricas.fase('ffd'):
+        machines = construtivas.ffd(instancia, ordem)
+    n_tarefas = instancia.n_jobs if ordem is None else len(ordem)
+    metricas.contar_avaliacoes({'ffd': n_tarefas * instancia.n_maquinas})
         
     return machines
 
-def local_search(initial_sequences, config, processing_times, setup_matrix, release_dates):
-    """Aplica a busca local (melhor vizinho) para tentar melhorar uma solução inicial."""
-    current_solution = initial_sequences
-    n_machines = config['n_maquinas']
-    machine_ids = list(range(1, n_machines + 1))
-    
-    machine_times = {m_id: calculate_sequence_time(seq, processing_times, setup_matrix, release_dates) for m_id, seq in current_solution.items()}
-    current_makespan = max(machine_times.values()) if machine_times else 0
+# Heurísticas para a solução inicial: as de construtivas.py e a melhor entre todas elas
+CONSTRUTIVAS = list(construtivas.HEURISTICAS) + [construtivas.MELHOR]
+
+def construir_solucao_inicial(instancia, construtiva='ffd', metricas=SEM_METRICAS, prazo=None):
+    """
+    Solução inicial pela heurística `construtiva` (o FFD, por padrão). Com
+    'melhor', as heurísticas restantes deixam de ser executadas ao atingir
+    `prazo` (instante de time.perf_counter).
+    """
+    if construtiva == 'ffd':
+        return solve_with_ffd(instancia, metricas=metricas)
+    with metricas.fase('construcao'):
+        return construtivas.construir(construtiva, instancia, prazo=prazo)
+
+# Funções que varrem as vizinhanças e retornam (makespan, movimento) do melhor vizinho
+MODOS_AVALIACAO = {
+    'incremental': AvaliadorIncremental.buscar_melhor_movimento,
+    'vetorizado': vizinhanca_vetorizada.buscar_melhor_movimento,
+}
+
+def local_search(initial_sequences, instancia, tempo_limite=None, verbose=True, modo_avaliacao='incremental',
+                 estrategia=None, metricas=SEM_METRICAS, deve_parar=None):
+    """
+    Aplica a busca local (melhor vizinho) para tentar melhorar uma solução inicial.
+    Os vizinhos são avaliados de forma incremental pelo AvaliadorIncremental,
+    sem copiar a solução e recalculando apenas as máquinas afetadas.
+    Com modo_avaliacao='vetorizado', cada vizinhança inteira é avaliada como
+    uma operação sobre arrays NumPy; o vizinho escolhido é o mesmo.
+    `estrategia` troca a varredura completa por uma das estratégias de
+    estrategias_busca (primeira melhoria, listas de candidatos, don't-look
+    bits), pelo nome ou já criada; nesse caso `modo_avaliacao` é ignorado.
+    Se `tempo_limite` (segundos) for informado, a busca é encerrada ao atingi-lo
+    e a melhor solução encontrada até então é retornada. `deve_parar`, se
+    informada, é uma função sem argumentos consultada a cada iteração; quando
+    retorna True, a busca é encerrada da mesma forma (usada para cancelamento).
+    Com `metricas` (instrumentacao.Metricas), são registrados o tempo da fase,
+    os vizinhos avaliados e os movimentos aceitos por vizinhança e a
+    trajetória do makespan.
+    """
+    if isinstance(estrategia, str):
+        buscar_melhor_movimento = criar_estrategia(estrategia, instancia)
+    elif estrategia is not None:
+        buscar_melhor_movimento = estrategia
+    elif modo_avaliacao in MODOS_AVALIACAO:
+        buscar_melhor_movimento = MODOS_AVALIACAO[modo_avaliacao]
+    else:
+        raise ValueError(f"Modo de avaliação desconhecido: '{modo_avaliacao}'. Use um de {MODOS_AVALIACAO}.")
+    # Os vizinhos avaliados só são contados com as métricas ativas
+    avaliador = AvaliadorIncremental(initial_sequences, instancia, contar=metricas.ativo)
+    current_makespan = avaliador.makespan()
+    metricas.registrar_makespan(current_makespan)
+    prazo = time.perf_counter() + tempo_limite if tempo_limite is not None else None
     
     iteration = 0
-    while True:
-        iteration += 1
-        best_neighbor_solution = None
-        best_neighbor_makespan = current_makespan
-
-        # (A lógica de busca nas vizinhanças 1, 2 e 3 permanece a mesma)
-        # Vizinhança 1: Transferência
-        for m_from in machine_ids:
-            for m_to in machine_ids:
-                if m_from == m_to: continue
-                for i in range(len(current_solution[m_from])):
-                    neighbor = copy.deepcopy(current_solution)
-                    task_to_move = neighbor[m_from].pop(i)
-                    neighbor[m_to].append(task_to_move)
-                    neighbor_times = {m_id: calculate_sequence_time(seq, processing_times, setup_matrix, release_dates) for m_id, seq in neighbor.items()}
-                    neighbor_makespan = max(neighbor_times.values())
-                    if neighbor_makespan < best_neighbor_makespan:
-                        best_neighbor_makespan = neighbor_makespan
-                        best_neighbor_solution = neighbor
-        
-        # Vizinhança 2: Troca Inter-Máquinas
-        for m1_idx in range(n_machines):
-            for m2_idx in range(m1_idx + 1, n_machines):
-                m1_id, m2_id = machine_ids[m1_idx], machine_ids[m2_idx]
-                for i in range(len(current_solution[m1_id])):
-                    for j in range(len(current_solution[m2_id])):
-                        neighbor = copy.deepcopy(current_solution)
-                        neighbor[m1_id][i], neighbor[m2_id][j] = neighbor[m2_id][j], neighbor[m1_id][i]
-                        neighbor_times = {m_id: calculate_sequence_time(seq, processing_times, setup_matrix, release_dates) for m_id, seq in neighbor.items()}
-                        neighbor_makespan = max(neighbor_times.values())
-                        if neighbor_makespan < best_neighbor_makespan:
-                            best_neighbor_makespan = neighbor_makespan
-                            best_neighbor_solution = neighbor
-
-        # Vizinhança 3: Troca Intra-Máquina
-        for m_id in machine_ids:
-            seq_len = len(current_solution[m_id])
-            if seq_len < 2: continue
-            for i in range(seq_len):
-                for j in range(i + 1, seq_len):
-                    neighbor = copy.deepcopy(current_solution)
-                    neighbor[m_id][i], neighbor[m_id][j] = neighbor[m_id][j], neighbor[m_id][i]
-                    neighbor_times = {m_id: calculate_sequence_time(seq, processing_times, setup_matrix, release_dates) for m_id, seq in neighbor.items()}
-                    neighbor_makespan = max(neighbor_times.values())
-                    if neighbor_makespan < best_neighbor_makespan:
-                        best_neighbor_makespan = neighbor_makespan
-                        best_neighbor_solution = neighbor
-        
-        # Lógica de atualização modificada
-        if best_neighbor_solution is None:
-            print("=> Ótimo local encontrado. Nenhuma melhoria adicional.")
-            break
-        else:
-            makespan_anterior = current_makespan
-            current_solution = best_neighbor_solution
-            current_makespan = best_neighbor_makespan
-            melhoria_iteracao = makespan_anterior - current_makespan
+    with metricas.fase('busca_local'):
+        while True:
+            if prazo is not None and time.perf_counter() >= prazo:
+                if verbose:
+                    print("=> Tempo limite atingido. Busca local interrompida.")
+                break
+            if deve_parar is not None and deve_parar():
+                if verbose:
+                    print("=> Busca local interrompida.")
+                break
+            iteration += 1
+            # Vizinhanças 1 (Transferência), 2 (Troca Inter-Máquinas) e 3 (Troca Intra-Máquina)
+            melhor_vizinho = buscar_melhor_movimento(avaliador)
             
-            # NOVO PRINT DE ITERAÇÃO
-            print(f"=> Iteração {iteration}: Melhoria encontrada! Novo Makespan: {current_makespan:.2f} (Ganho: {melhoria_iteracao:.2f})")
+            # Lógica de atualização modificada
+            if melhor_vizinho is None:
+                if verbose:
+                    print("=> Ótimo local encontrado. Nenhuma melhoria adicional.")
+                break
+            else:
+                makespan_anterior = current_makespan
+                current_makespan, movimento = melhor_vizinho
+                avaliador.aplicar(movimento)
+                metricas.registrar_makespan(current_makespan, movimento[0])
+                melhoria_iteracao = makespan_anterior - current_makespan
+                
+                # NOVO PRINT DE ITERAÇÃO
+                if verbose:
+                    print(f"=> Iteração {iteration}: Melhoria encontrada! Novo Makespan: {current_makespan:.2f} (Ganho: {melhoria_iteracao:.2f})")
+    metricas.contar_avaliacoes(avaliador.avaliacoes)
 
     # NOVO RETORNO: Agora retorna o número de iterações também
-    return current_solution, current_makespan, iteration
+    return avaliador.solucao, current_makespan, iteration
 
-def calcular_ddlb(config, processing_times, setup_matrix, release_dates):
+def calcular_ddlb(instancia, metricas=SEM_METRICAS):
     """
     Calcula o Data Dependent Lower Bound (DDLB) com base na fórmula do artigo.
     DDLB = max(Limite_Carga_Trabalho, Limite_Caminho_Critico)
+    O menor setup saindo de cada tarefa i para qualquer outra tarefa j já vem
+    calculado na instância (`min_setup_saida`).
     """
-    n_jobs = config['n_jobs']
-    n_machines = config['n_maquinas']
-    
-    # --- Calcula o Limite 1: Carga de Trabalho Mínima ---
-    soma_trabalho_minimo = 0
-    for i in range(1, n_jobs + 1):
-        # Encontra o menor setup saindo da tarefa i para qualquer outra tarefa j
-        min_setup_de_i = min(setup_matrix[i][j] for j in range(1, n_jobs + 1) if i != j)
-        soma_trabalho_minimo += processing_times[i] + min_setup_de_i
-        
-    limite_carga_trabalho = soma_trabalho_minimo / n_machines
+    with metricas.fase('ddlb'):
+        n_machines = instancia.n_maquinas
+        min_setup = instancia.min_setup_saida
+    
+        # --- Calcula o Limite 1: Carga de Trabalho Mínima ---
+        # sum() soma na mesma ordem do laço original, preservando o resultado
+        soma_trabalho_minimo = sum((instancia.processamento + min_setup).tolist())
+        limite_carga_trabalho = soma_trabalho_minimo / n_machines
 
-    # --- Calcula o Limite 2: Caminho Crítico Mínimo ---
-    max_caminho_critico = 0
-    for i in range(1, n_jobs + 1):
+        # --- Calcula o Limite 2: Caminho Crítico Mínimo ---
         # A fórmula do artigo usa o setup mínimo *saindo* da tarefa i
-        min_setup_de_i = min(setup_matrix[i][j] for j in range(1, n_jobs + 1) if i != j)
-        
-        caminho_critico_i = release_dates[i] + processing_times[i] + min_setup_de_i
-        max_caminho_critico = max(max_caminho_critico, caminho_critico_i)
+        caminhos_criticos = instancia.liberacao + instancia.processamento + min_setup
+        max_caminho_critico = float(caminhos_criticos.max(initial=0))
         
-    # O DDLB é o maior dos dois limites calculados
-    ddlb = max(limite_carga_trabalho, max_caminho_critico)
+        # O DDLB é o maior dos dois limites calculados
+        ddlb = max(limite_carga_trabalho, max_caminho_critico)
     
     return ddlb
 
 # --- 3. ORQUESTRAÇÃO E EXECUÇÃO PRINCIPAL ---
 
-def run_scenario_from_file(file_path):
-    """Orquestra o processo: carregar, resolver e exibir resultados para um arquivo."""
+def resolver_instancia(instancia, tempo_limite=None, modo_avaliacao='incremental', estrategia=None, metricas=None, construtiva='ffd',
+                       deve_parar=None):
+    """
+    Executa FFD, busca local e DDLB sem imprimir nada e retorna um dicionário
+    com as métricas da execução. `tempo_limite` (segundos) é o orçamento da
+    resolução inteira, contado desde o início: com a construtiva 'melhor', as
+    heurísticas restantes deixam de ser executadas ao atingi-lo, e a busca
+    local recebe o tempo que sobrar após a solução inicial. Uma solução
+    inicial e o DDLB sempre são calculados; se o tempo total medido
+    ("tempo_s") atingir o limite, o status do resultado é 'tempo_esgotado'.
+    `estrategia` e `deve_parar` são repassadas a local_search. As métricas
+    detalhadas são registradas em `metricas` (uma instrumentacao.Metricas);
+    sem ela, a instrumentação fica desativada (SEM_METRICAS) e "avaliacoes"
+    é None. `construtiva` troca o FFD por outra heurística de construtivas.py
+    ou por 'melhor'.
+    """
+    inicio = time.perf_counter()
+    prazo = inicio + tempo_limite if tempo_limite is not None else None
+    metricas = SEM_METRICAS if metricas is None else metricas
+    initial_solution = construir_solucao_inicial(instancia, construtiva, metricas=metricas, prazo=prazo)
+    makespan_initial = max((calculate_sequence_time(seq, instancia) for seq in initial_solution.values()), default=0)
+
+    restante = None
+    if prazo is not None:
+        restante = max(0.0, prazo - time.perf_counter())
+    final_solution, final_makespan, total_iteracoes = local_search(initial_solution, instancia, tempo_limite=restante, verbose=False,
+                                                                   modo_avaliacao=modo_avaliacao, estrategia=estrategia, metricas=metricas,
+                                                                   deve_parar=deve_parar)
+
+    ddlb = calcular_ddlb(instancia, metricas=metricas)
+    # O status considera o tempo total, inclusive o da solução inicial e o do DDLB
+    tempo_total = time.perf_counter() - inicio
+    tempo_esgotado = tempo_limite is not None and tempo_total >= tempo_limite
+    return {
+        "codigo_cenario": instancia.config.get('codigo_cenario'),
+        "makespan_inicial": makespan_initial,
+        "makespan_final": final_makespan,
+        "ddlb": ddlb,
+        "razao_ms_ddlb": final_makespan / ddlb if ddlb > 0 else 0,
+        "iteracoes": total_iteracoes,
+        "avaliacoes": metricas.total_avaliacoes if metricas.ativo else None,
+        "tempo_s": tempo_total,
+        "status": "tempo_esgotado" if tempo_esgotado else "ok",
+        "solucao": final_solution,
+    }
+
+def run_scenario_from_file(file_path, modo_avaliacao='incremental', tempo_limite=None, workers=None, tolerancia=0.0, seed=None, estrategia=None,
+                           arquivo_metricas=None, construtiva='ffd'):
+    """
+    Orquestra o processo: carregar, resolver e exibir resultados para um arquivo.
+    Com `tempo_limite`, a fase de melhoria usa o portfólio de metaheurísticas
+    em paralelo (metaheuristicas.resolver_portfolio) em vez de uma única descida,
+    partindo da mesma solução inicial e com o mesmo modo de avaliação e
+    estratégia de varredura nas descidas.
+    Com `arquivo_metricas`, as métricas da execução são exibidas e gravadas em
+    JSON; no portfólio, as contagens somam as de todos os processos.
+    """
+    metricas = Metricas() if arquivo_metricas else SEM_METRICAS
     print("="*50)
     print(f"EXECUTANDO CENÁRIO DO ARQUIVO: {file_path}")
     print("="*50)
     
     try:
-        config, proc_times, setup_mat, release_dts = carregar_instancia_de_json(file_path)
+        instancia = carregar_instancia_de_json(file_path)
     except FileNotFoundError:
         print(f"ERRO: O arquivo '{file_path}' não foi encontrado.")
         return
@@ -198,9 +240,9 @@ def run_scenario_from_file(file_path):
         return
 
     # Gerar Solução Inicial
-    print("\n[FASE 1: GERANDO SOLUÇÃO INICIAL COM FFD]")
-    initial_solution = solve_with_ffd(config, proc_times, setup_mat, release_dts)
-    initial_times = {m_id: calculate_sequence_time(seq, proc_times, setup_mat, release_dts) for m_id, seq in initial_solution.items()}
+    print(f"\n[FASE 1: GERANDO SOLUÇÃO INICIAL COM {construtiva.upper()}]")
+    initial_solution = construir_solucao_inicial(instancia, construtiva, metricas=metricas)
+    initial_times = {m_id: calculate_sequence_time(seq, instancia) for m_id, seq in initial_solution.items()}
     makespan_initial = max(initial_times.values()) if initial_times else 0
     
     print("\n--- Solução Inicial Encontrada ---")
@@ -208,20 +250,35 @@ def run_scenario_from_file(file_path):
         print(f"Máquina {m_id}: Seq={seq}, Tempo={initial_times[m_id]:.0f}")
     print(f"Makespan Inicial: {makespan_initial:.2f}")
 
-    # Aplicar Busca Local
-    print("\n[FASE 2: APLICANDO BUSCA LOCAL PARA MELHORIA]")
-    # ATUALIZAÇÃO: Captura o número de iterações retornado pela função
-    final_solution, final_makespan, total_iteracoes = local_search(initial_solution, config, proc_times, setup_mat, release_dts)
+    if tempo_limite is not None:
+        # Importado aqui porque o módulo de metaheurísticas depende deste arquivo
+        from metaheuristicas import resolver_portfolio
+        print(f"\n[FASE 2: PORTFÓLIO DE METAHEURÍSTICAS EM PARALELO ({tempo_limite:.0f}s)]")
+        # O portfólio parte da mesma solução inicial e usa o mesmo modo de avaliação e estratégia de varredura
+        portfolio = resolver_portfolio(instancia, tempo_limite, workers=workers, tolerancia=tolerancia, seed=seed,
+                                       solucao_inicial=initial_solution, modo_avaliacao=modo_avaliacao,
+                                       estrategia_busca=estrategia, metricas=metricas)
+        for resultado in portfolio["processos"]:
+            situacao = f"ERRO: {resultado['erro']}" if resultado["erro"] else f"Makespan={resultado['makespan']:.2f}"
+            print(f"=> Processo {resultado['processo']}, {resultado['estrategia']}: {situacao} ({resultado['iteracoes']} iterações)")
+        final_solution, final_makespan = portfolio["solucao"], portfolio["makespan"]
+        total_iteracoes = sum(r["iteracoes"] for r in portfolio["processos"])
+    else:
+        # Aplicar Busca Local
+        print("\n[FASE 2: APLICANDO BUSCA LOCAL PARA MELHORIA]")
+        # ATUALIZAÇÃO: Captura o número de iterações retornado pela função
+        final_solution, final_makespan, total_iteracoes = local_search(initial_solution, instancia, modo_avaliacao=modo_avaliacao, estrategia=estrategia,
+                                                                       metricas=metricas)
     
     # Calcular DDLB
-    ddlb = calcular_ddlb(config, proc_times, setup_mat, release_dts)
+    ddlb = calcular_ddlb(instancia, metricas=metricas)
     ratio_ms_ddlb = final_makespan / ddlb if ddlb > 0 else 0
     
     # Exibir Resultado Final
-    final_times = {m_id: calculate_sequence_time(seq, proc_times, setup_mat, release_dts) for m_id, seq in final_solution.items()}
+    final_times = {m_id: calculate_sequence_time(seq, instancia) for m_id, seq in final_solution.items()}
     
     print("\n" + "="*50)
-    print(f"RESULTADO FINAL PARA {config.get('codigo_cenario', 'Cenário Desconhecido')}")
+    print(f"RESULTADO FINAL PARA {instancia.config.get('codigo_cenario', 'Cenário Desconhecido')}")
     print("="*50)
     print("--- Solução Após Busca Local ---")
     for m_id, seq in final_solution.items():
@@ -234,6 +291,18 @@ def run_scenario_from_file(file_path):
     print(f"Razão MS/DDLB: {ratio_ms_ddlb:.4f}")
     print(f"Melhoria de Makespan sobre a solução inicial: {makespan_initial - final_makespan:.2f}")
     print(f"Quantidade de iterações realizadas: {total_iteracoes}")
+
+    if metricas.ativo:
+        print("\n--- Instrumentação ---")
+        for fase, segundos in metricas.fases_s.items():
+            print(f"Tempo da fase {fase}: {segundos:.4f}s")
+        for origem, n in metricas.avaliacoes.items():
+            aceitos = "" if origem == 'ffd' else f", {metricas.aceitos.get(origem, 0)} movimentos aceitos"
+            print(f"{origem}: {n} avaliações{aceitos}")
+        for fase, taxa in metricas.avaliacoes_por_segundo().items():
+            print(f"Avaliações por segundo ({fase}): {taxa:.0f}")
+        metricas.salvar_json(arquivo_metricas, arquivo=file_path, codigo_cenario=instancia.config.get('codigo_cenario'))
+        print(f"Métricas salvas em: '{arquivo_metricas}'")
     print("\n")
 
 if __name__ == "__main__":
@@ -243,8 +312,41 @@ if __name__ == "__main__":
     # Define "caminho_arquivo" como um argumento posicional obrigatório
     parser.add_argument("caminho_arquivo", type=str, help="O caminho para o arquivo .json da instância do problema.")
     
+    parser.add_argument("--modo_avaliacao", type=str, choices=list(MODOS_AVALIACAO), default='incremental',
+                        help="Como as vizinhanças são avaliadas: vizinho a vizinho (incremental) ou em arrays NumPy (vetorizado). O resultado é o mesmo.")
+    
+    parser.add_argument("--construtiva", type=str, choices=CONSTRUTIVAS, default='ffd',
+                        help="Heurística da solução inicial: ffd, insercao (melhor posição), liberacao (list scheduling por ready time), setup_proximo, arrependimento ou melhor (a de menor makespan entre todas).")
+    
+    parser.add_argument("--estrategia", type=str, choices=list(ESTRATEGIAS_PREDEFINIDAS), default=None,
+                        help="Estratégia de varredura da busca local (primeira melhoria, listas de candidatos, don't-look bits). Sem ela, é usada a melhor melhoria com varredura completa.")
+    
+    parser.add_argument("--time-limit", dest="tempo_limite", type=float, default=None,
+                        help="Tempo (s) do portfólio de metaheurísticas em paralelo (ILS, recozimento simulado e multi-início). Sem ele, é feita uma única busca local.")
+    
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de processos do portfólio (padrão: um por estratégia). Com menos processos, cada um executa mais de uma estratégia, dividindo o tempo.")
+    
+    parser.add_argument("--tolerancia", type=float, default=0.0,
+                        help="O portfólio para ao atingir DDLB * (1 + tolerancia).")
+    
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Semente do portfólio.")
+    
+    parser.add_argument("--metricas", type=str, default=None,
+                        help="Arquivo .json onde gravar as métricas da execução (tempo por fase, avaliações e movimentos por vizinhança, trajetória do makespan).")
+    
+    parser.add_argument("--perfil", type=str, default=None,
+                        help="Arquivo onde gravar o perfil de execução (ver --tipo_perfil).")
+    
+    parser.add_argument("--tipo_perfil", type=str, choices=list(TIPOS_PERFIL), default='cprofile',
+                        help="cprofile (estatísticas para 'python -m pstats') ou amostragem (pilhas no formato collapsed, para flame graphs).")
+    
     # Lê os argumentos fornecidos na linha de comando
     args = parser.parse_args()
     
     # Chama a função principal passando o caminho do arquivo lido
-    run_scenario_from_file(args.caminho_arquivo)
\ No newline at end of file
+    with perfilar(args.perfil, args.tipo_perfil):
+        run_scenario_from_file(args.caminho_arquivo, modo_avaliacao=args.modo_avaliacao, tempo_limite=args.tempo_limite,
+                               workers=args.workers, tolerancia=args.tolerancia, seed=args.seed, estrategia=args.estrategia,
+                               arquivo_metricas=args.metricas, construtiva=args.construtiva)
\ No newline at end of file
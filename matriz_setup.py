@@ -0,0 +1,163 @@
+# Arquivo: matriz_setup.py
+#
+# Formas de armazenar a matriz de setup de uma instância:
+#
+#   float64     matriz densa em float64 (padrão).
+#   float32     matriz densa em float32, com metade da memória. Os setups são
+#               arredondados a 2 casas antes da conversão; o erro introduzido
+#               pelo float32 é menor que 1e-4 para os valores da grade.
+#   procedural  nenhuma matriz é guardada: o setup de cada par (i, j) é obtido
+#               de um hash (splitmix64) da semente e do par, de modo que
+#               qualquer linha ou bloco pode ser gerado sob demanda e a memória
+#               ocupada é O(N_JOBS).
+#
+# SetupProcedural se comporta como a matriz `Instancia.setup`, de
+# (N_JOBS+1) x N_JOBS, nas formas de indexação usadas pelo solver
+# (setup[i, j], setup[linhas, colunas], setup[inicio:fim]), e oferece as
+# linhas para o laço escalar em `linhas_lista`.
+
+import math
+
+import numpy as np
+
+ARMAZENAMENTOS_SETUP = ('float64', 'float32', 'procedural')
+
+# Constantes do splitmix64
+_MASCARA = (1 << 64) - 1
+_OURO = 0x9E3779B97F4A7C15
+_MISTURA_1 = 0xBF58476D1CE4E5B9
+_MISTURA_2 = 0x94D049BB133111EB
+
+# Linhas por bloco ao percorrer a matriz inteira (limita a memória temporária)
+LINHAS_POR_BLOCO = 256
+
+
+class SetupProcedural:
+    """
+    Matriz de setup gerada sob demanda. O setup da tarefa de posição `a` para
+    a de posição `b` (0..N_JOBS-1) é o valor uniforme em [minimo, maximo],
+    arredondado a 2 casas, obtido do splitmix64 do contador a*N_JOBS+b+1 a
+    partir de `seed`; na estrutura simétrica, o par é ordenado antes.
+
+    A indexação segue `Instancia.setup`: a linha 0 é o estado inicial da
+    máquina (maior setup de qualquer tarefa para a coluna) e a linha i, a
+    tarefa i; a coluna j-1 é a tarefa j; a diagonal vale 0. A linha 0 e o
+    menor setup saindo de cada tarefa são calculados uma vez, por blocos.
+    """
+    dtype = np.dtype(np.float64)
+
+    def __init__(self, n_jobs, minimo, maximo, simetrica, seed):
+        self.n_jobs = n_jobs
+        self.minimo = float(minimo)
+        self.maximo = float(maximo)
+        self.simetrica = bool(simetrica)
+        self.seed = int(seed) & _MASCARA
+        self.shape = (n_jobs + 1, n_jobs)
+        self.setup_inicial, self.min_setup_saida = self._extremos()
+
+    @classmethod
+    def de_parametros(cls, parametros):
+        return cls(parametros['n_jobs'], parametros['minimo'], parametros['maximo'],
+                   parametros['simetrica'], parametros['seed'])
+
+    def parametros(self):
+        """Parâmetros que recriam a matriz (usados no .json no lugar da matriz densa)."""
+        return {"tipo": "procedural", "n_jobs": self.n_jobs, "minimo": self.minimo, "maximo": self.maximo,
+                "simetrica": self.simetrica, "seed": self.seed}
+
+    @property
+    def nbytes(self):
+        return self.setup_inicial.nbytes + self.min_setup_saida.nbytes
+
+    # --- SORTEIO ---
+
+    def _sortear(self, origem, destino):
+        """Setups entre posições de tarefas (arrays de inteiros, com broadcast), fora da diagonal."""
+        origem, destino = np.asarray(origem, dtype=np.uint64), np.asarray(destino, dtype=np.uint64)
+        if self.simetrica:
+            origem, destino = np.minimum(origem, destino), np.maximum(origem, destino)
+        z = (origem * np.uint64(self.n_jobs) + destino + np.uint64(1)) * np.uint64(_OURO) + np.uint64(self.seed)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(_MISTURA_1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(_MISTURA_2)
+        z = z ^ (z >> np.uint64(31))
+        u = (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+        return np.floor((self.minimo + u * (self.maximo - self.minimo)) * 100 + 0.5) / 100
+
+    def valor(self, origem, destino):
+        """Mesmo valor de `_sortear` para um único par, em Python puro (usado pelo laço escalar)."""
+        if self.simetrica and origem > destino:
+            origem, destino = destino, origem
+        z = ((origem * self.n_jobs + destino + 1) * _OURO + self.seed) & _MASCARA
+        z = ((z ^ (z >> 30)) * _MISTURA_1) & _MASCARA
+        z = ((z ^ (z >> 27)) * _MISTURA_2) & _MASCARA
+        z ^= z >> 31
+        u = (z >> 11) * 2.0 ** -53
+        return math.floor((self.minimo + u * (self.maximo - self.minimo)) * 100 + 0.5) / 100
+
+    def _blocos(self):
+        """Percorre a matriz tarefa x tarefa em blocos de linhas: (inicio, fim, bloco, diagonal)."""
+        colunas = np.arange(self.n_jobs)
+        for inicio in range(0, self.n_jobs, LINHAS_POR_BLOCO):
+            origem = np.arange(inicio, min(inicio + LINHAS_POR_BLOCO, self.n_jobs))[:, None]
+            yield inicio, origem.shape[0] + inicio, self._sortear(origem, colunas[None, :]), origem == colunas
+
+    def _extremos(self):
+        n = self.n_jobs
+        maior_entrada = np.zeros(n)
+        menor_saida = np.full(n, np.inf) if n > 1 else np.zeros(n)
+        for inicio, fim, bloco, diagonal in self._blocos():
+            np.maximum(maior_entrada, np.where(diagonal, -np.inf, bloco).max(axis=0), out=maior_entrada)
+            if n > 1:
+                menor_saida[inicio:fim] = np.where(diagonal, np.inf, bloco).min(axis=1)
+        return maior_entrada, menor_saida
+
+    # --- ACESSO NO FORMATO DE Instancia.setup ---
+
+    def __getitem__(self, chave):
+        linhas, colunas = chave if isinstance(chave, tuple) else (chave, slice(None))
+        faixa_linhas, faixa_colunas = isinstance(linhas, slice), isinstance(colunas, slice)
+        if faixa_linhas:
+            linhas = np.arange(*linhas.indices(self.n_jobs + 1))
+        if faixa_colunas:
+            colunas = np.arange(*colunas.indices(self.n_jobs))
+        linhas, colunas = np.asarray(linhas), np.asarray(colunas)
+        # Fatias geram um eixo próprio no resultado, como na indexação do NumPy
+        if faixa_linhas:
+            linhas = linhas.reshape(linhas.shape + (1,) * colunas.ndim)
+        elif faixa_colunas:
+            linhas = linhas[..., None]
+        linhas, colunas = np.broadcast_arrays(linhas, colunas)
+        forma = linhas.shape
+        linhas, colunas = linhas.ravel(), colunas.ravel()
+
+        origem = linhas - 1
+        valores = self._sortear(np.maximum(origem, 0), colunas)
+        valores[origem == colunas] = 0
+        iniciais = linhas == 0
+        valores[iniciais] = self.setup_inicial[colunas[iniciais]]
+        return valores.reshape(forma)[()]
+
+    def linhas_lista(self):
+        """Linhas para o laço escalar: linhas[i][j] é o setup de i (0 = estado inicial) para a tarefa j."""
+        return [[0.0] + self.setup_inicial.tolist()] + [_LinhaProcedural(self, i) for i in range(1, self.n_jobs + 1)]
+
+    def matriz_tarefas(self):
+        """Matriz densa N_JOBS x N_JOBS em float64, com inf na diagonal (formato de Cenario.matriz_setup)."""
+        matriz = np.empty((self.n_jobs, self.n_jobs))
+        for inicio, fim, bloco, diagonal in self._blocos():
+            matriz[inicio:fim] = np.where(diagonal, np.inf, bloco)
+        return matriz
+
+
+class _LinhaProcedural:
+    __slots__ = ('matriz', 'origem')
+
+    def __init__(self, matriz, tarefa):
+        self.matriz = matriz
+        self.origem = tarefa - 1
+
+    def __getitem__(self, tarefa):
+        destino = tarefa - 1
+        if destino == self.origem or tarefa == 0:
+            return 0.0
+        return self.matriz.valor(self.origem, destino)
@@ -0,0 +1,315 @@
+# Arquivo: metaheuristicas.py
+
+import math
+import time
+import queue
+import multiprocessing as mp
+
+import numpy as np
+
+from avaliacao_incremental import AvaliadorIncremental, TRANSFERENCIA, TROCA_INTER, TROCA_INTRA
+from local_search2 import solve_with_ffd, local_search, calcular_ddlb
+from estrategias_busca import criar_estrategia
+from instrumentacao import Metricas, SEM_METRICAS
+
+# --- ESTRATÉGIAS DO PORTFÓLIO ---
+ILS = 'ils'
+RECOZIMENTO = 'recozimento_simulado'
+MULTI_INICIO = 'multi_inicio'
+ESTRATEGIAS = (ILS, RECOZIMENTO, MULTI_INICIO)
+
+
+class Incumbente:
+    """
+    Melhor makespan conhecido, compartilhado entre os processos do portfólio.
+    Cada processo publica suas melhorias e consulta o valor para saber se o
+    alvo (DDLB com tolerância) já foi alcançado por qualquer um deles.
+    """
+    def __init__(self, alvo):
+        self.valor = mp.Value('d', math.inf)
+        self.alvo = alvo
+
+    def publicar(self, makespan):
+        with self.valor.get_lock():
+            if makespan < self.valor.value:
+                self.valor.value = makespan
+
+    def alvo_atingido(self):
+        return self.valor.value <= self.alvo
+
+
+# --- MOVIMENTOS ALEATÓRIOS ---
+
+def movimento_aleatorio(avaliador, rng):
+    """
+    Sorteia um movimento válido (transferência, troca inter ou intra). Em metade
+    dos sorteios, a primeira máquina é uma das críticas, já que só movimentos
+    que a alteram podem reduzir o makespan.
+    """
+    ids = avaliador.machine_ids
+    solucao = avaliador.solucao
+    tempos = avaliador.tempos_maquinas()
+    makespan = max(tempos.values())
+    criticas = [m_id for m_id in ids if tempos[m_id] == makespan]
+    for _ in range(100):
+        m1 = criticas[rng.integers(len(criticas))] if rng.random() < 0.5 else ids[rng.integers(len(ids))]
+        tipo = rng.integers(3)
+        if tipo == 2:
+            k = len(solucao[m1])
+            if k < 2: continue
+            i, j = sorted(rng.choice(k, size=2, replace=False).tolist())
+            return (TROCA_INTRA, m1, i, j)
+        m2 = ids[rng.integers(len(ids))]
+        if m2 == m1 or not solucao[m1]: continue
+        if tipo == 0:
+            return (TRANSFERENCIA, m1, int(rng.integers(len(solucao[m1]))), m2)
+        if not solucao[m2]: continue
+        return (TROCA_INTER, m1, int(rng.integers(len(solucao[m1]))), m2, int(rng.integers(len(solucao[m2]))))
+    return None
+
+
+def _perturbar(avaliador, rng, n_movimentos):
+    for _ in range(n_movimentos):
+        movimento = movimento_aleatorio(avaliador, rng)
+        if movimento is not None:
+            avaliador.aplicar(movimento)
+
+
+def _descida(solucao, instancia, prazo, busca, rng):
+    """
+    Busca local até o ótimo local ou até o prazo. `busca` tem o modo de
+    avaliação, o nome da estratégia de varredura (None = melhor melhoria
+    completa) e as métricas do processo; a estratégia é criada a cada
+    descida, com semente de `rng`.
+    """
+    restante = max(0.0, prazo - time.perf_counter())
+    estrategia = busca.get('estrategia')
+    if estrategia is not None:
+        estrategia = criar_estrategia(estrategia, instancia, seed=int(rng.integers(2 ** 32)))
+    solucao, makespan, _ = local_search(solucao, instancia, tempo_limite=restante, verbose=False,
+                                        modo_avaliacao=busca.get('modo_avaliacao', 'incremental'), estrategia=estrategia,
+                                        metricas=busca.get('metricas', SEM_METRICAS))
+    return solucao, makespan
+
+
+# --- ESTRATÉGIAS ---
+# Todas recebem a solução inicial do portfólio (`inicial`) e fazem as descidas
+# com o modo de avaliação e a estratégia de varredura de `busca`.
+
+def busca_local_iterada(instancia, prazo, rng, incumbente, inicial, busca):
+    """
+    Iterated Local Search: a partir do ótimo local da solução inicial, aplica
+    uma perturbação de alguns movimentos aleatórios e uma nova descida; o
+    resultado substitui a solução corrente quando não é pior que ela.
+    """
+    atual, atual_ms = _descida(inicial, instancia, prazo, busca, rng)
+    melhor, melhor_ms = atual, atual_ms
+    incumbente.publicar(melhor_ms)
+    iteracoes = 0
+    while time.perf_counter() < prazo and not incumbente.alvo_atingido():
+        iteracoes += 1
+        avaliador = AvaliadorIncremental(atual, instancia)
+        _perturbar(avaliador, rng, int(rng.integers(2, 6)))
+        candidata, candidata_ms = _descida(avaliador.solucao, instancia, prazo, busca, rng)
+        if candidata_ms <= atual_ms:
+            atual, atual_ms = candidata, candidata_ms
+        if candidata_ms < melhor_ms:
+            melhor, melhor_ms = candidata, candidata_ms
+            incumbente.publicar(melhor_ms)
+    return melhor, melhor_ms, iteracoes
+
+
+def recozimento_simulado(instancia, prazo, rng, incumbente, inicial, busca, fator_t0=0.02, fator_tf=1e-5):
+    """
+    Simulated Annealing sobre o makespan, com movimentos aleatórios avaliados
+    de forma incremental. A temperatura cai geometricamente com o tempo
+    decorrido: parte de `fator_t0` e chega a `fator_tf` vezes o makespan
+    inicial. Os últimos 10% do tempo são reservados para uma descida final
+    a partir da melhor solução.
+    """
+    metricas = busca.get('metricas', SEM_METRICAS)
+    avaliador = AvaliadorIncremental(inicial, instancia, contar=metricas.ativo)
+    atual_ms = avaliador.makespan()
+    melhor = {m_id: list(seq) for m_id, seq in avaliador.solucao.items()}
+    melhor_ms = atual_ms
+    incumbente.publicar(melhor_ms)
+    inicio = time.perf_counter()
+    duracao = max(0.9 * (prazo - inicio), 1e-9)
+    fim_recozimento = inicio + duracao
+    t0, tf = fator_t0 * atual_ms, fator_tf * atual_ms
+    temperatura = t0
+    iteracoes = 0
+    while True:
+        # O relógio e o incumbente compartilhado são consultados a cada 256 movimentos
+        if iteracoes % 256 == 0:
+            agora = time.perf_counter()
+            if agora >= fim_recozimento or incumbente.alvo_atingido():
+                break
+            temperatura = t0 * (tf / t0) ** ((agora - inicio) / duracao)
+        iteracoes += 1
+        movimento = movimento_aleatorio(avaliador, rng)
+        if movimento is None:
+            break
+        vizinho_ms = avaliador.avaliar(movimento)
+        delta = vizinho_ms - atual_ms
+        if delta <= 0 or rng.random() < math.exp(-delta / temperatura):
+            avaliador.aplicar(movimento)
+            atual_ms = vizinho_ms
+            if atual_ms < melhor_ms:
+                melhor_ms = atual_ms
+                melhor = {m_id: list(seq) for m_id, seq in avaliador.solucao.items()}
+                incumbente.publicar(melhor_ms)
+    metricas.contar_avaliacoes(avaliador.avaliacoes)
+    # Uma descida final leva a melhor solução ao seu ótimo local
+    melhor, melhor_ms = _descida(melhor, instancia, prazo, busca, rng)
+    incumbente.publicar(melhor_ms)
+    return melhor, melhor_ms, iteracoes
+
+
+def multi_inicio(instancia, prazo, rng, incumbente, inicial, busca, ruido=0.3):
+    """
+    Multi-start aleatorizado: a primeira partida é a solução inicial; as
+    seguintes aplicam o FFD a uma ordem de tarefas obtida perturbando os
+    tempos de processamento (fator uniforme em [1 - ruido, 1 + ruido]). Cada
+    partida segue com uma descida até o ótimo local.
+    """
+    melhor, melhor_ms = _descida(inicial, instancia, prazo, busca, rng)
+    incumbente.publicar(melhor_ms)
+    tarefas = np.arange(1, instancia.n_jobs + 1)
+    iteracoes = 0
+    while time.perf_counter() < prazo and not incumbente.alvo_atingido():
+        iteracoes += 1
+        chave = instancia.processamento * rng.uniform(1 - ruido, 1 + ruido, size=instancia.n_jobs)
+        ordem = tarefas[np.argsort(-chave, kind='stable')].tolist()
+        candidata, candidata_ms = _descida(solve_with_ffd(instancia, ordem=ordem), instancia, prazo, busca, rng)
+        if candidata_ms < melhor_ms:
+            melhor, melhor_ms = candidata, candidata_ms
+            incumbente.publicar(melhor_ms)
+    return melhor, melhor_ms, iteracoes
+
+
+FUNCOES_ESTRATEGIA = {
+    ILS: busca_local_iterada,
+    RECOZIMENTO: recozimento_simulado,
+    MULTI_INICIO: multi_inicio,
+}
+
+
+# --- EXECUÇÃO EM PARALELO ---
+
+def _contagens(metricas):
+    """Contagens de avaliações e de movimentos aceitos enviadas ao processo principal (None sem métricas)."""
+    return (dict(metricas.avaliacoes), dict(metricas.aceitos)) if metricas.ativo else None
+
+
+def _executar_estrategias(indice, estrategias, instancia, duracao, semente, incumbente, fila, inicial, busca):
+    """
+    Ponto de entrada de cada processo do portfólio: executa as `estrategias`
+    em sequência, dividindo igualmente entre elas o tempo que resta. O prazo
+    é calculado no próprio processo a partir da `duracao`, pois o ponto de
+    referência de perf_counter não é garantidamente o mesmo entre processos.
+
+    Com busca['metricas'] verdadeiro, cada estratégia conta as avaliações e
+    os movimentos aceitos em uma Metricas própria, cujas contagens seguem
+    junto com o resultado.
+    """
+    prazo = time.perf_counter() + duracao
+    rng = np.random.default_rng(semente)
+    for ordem, estrategia in enumerate(estrategias):
+        prazo_estrategia = time.perf_counter() + (prazo - time.perf_counter()) / (len(estrategias) - ordem)
+        metricas = Metricas() if busca.get('metricas') else SEM_METRICAS
+        try:
+            solucao, makespan, iteracoes = FUNCOES_ESTRATEGIA[estrategia](instancia, prazo_estrategia, rng, incumbente,
+                                                                          inicial, {**busca, 'metricas': metricas})
+            fila.put((indice, estrategia, solucao, makespan, iteracoes, None, _contagens(metricas)))
+        except Exception as e:
+            fila.put((indice, estrategia, None, math.inf, 0, str(e), _contagens(metricas)))
+
+
+def resolver_portfolio(instancia, tempo_limite, estrategias=ESTRATEGIAS, workers=None, tolerancia=0.0, seed=None,
+                       solucao_inicial=None, modo_avaliacao='incremental', estrategia_busca=None, metricas=SEM_METRICAS):
+    """
+    Executa as estratégias em processos paralelos durante `tempo_limite`
+    segundos e retorna a melhor solução encontrada.
+
+    As estratégias são distribuídas entre os `workers` processos em rodízio
+    (por padrão, um processo por estratégia): com menos processos que
+    estratégias, cada processo executa as suas em sequência, dividindo o
+    tempo entre elas; com mais, as estratégias se repetem, com sementes
+    diferentes. Todos compartilham o melhor makespan conhecido e param antes
+    do prazo quando ele chega a DDLB * (1 + tolerancia). Cada processo recebe
+    uma semente própria derivada de `seed`.
+
+    Todas as estratégias partem de `solucao_inicial` (o FFD, se não for
+    informada) e fazem as descidas com `modo_avaliacao` e com a estratégia de
+    varredura `estrategia_busca` (nome de estrategias_busca; None = melhor
+    melhoria completa).
+
+    Com `metricas` (instrumentacao.Metricas), as avaliações e os movimentos
+    aceitos de todos os processos são somados nela, o tempo de relógio do
+    portfólio é registrado como a fase 'busca_local' e a trajetória recebe o
+    makespan da solução inicial e o da melhor solução.
+
+    Retorna um dicionário com a solução, o makespan, o DDLB, a estratégia que
+    encontrou a melhor solução e o resultado de cada estratégia executada.
+    """
+    desconhecidas = set(estrategias) - set(FUNCOES_ESTRATEGIA)
+    if desconhecidas:
+        raise ValueError(f"Estratégias desconhecidas: {sorted(desconhecidas)}. Use as de {ESTRATEGIAS}.")
+    workers = workers or len(estrategias)
+    inicio = time.perf_counter()
+    if solucao_inicial is None:
+        solucao_inicial = solve_with_ffd(instancia)
+    # Os processos recebem apenas se devem contar; cada um cria as suas Metricas
+    busca = {"modo_avaliacao": modo_avaliacao, "estrategia": estrategia_busca, "metricas": metricas.ativo}
+    if metricas.ativo:
+        metricas.registrar_makespan(AvaliadorIncremental(solucao_inicial, instancia).makespan())
+    ddlb = calcular_ddlb(instancia)
+    incumbente = Incumbente(ddlb * (1 + tolerancia))
+    sementes = np.random.SeedSequence(seed).spawn(workers)
+    # Rodízio: o processo i executa as posições i, i + workers, ... da lista de execuções
+    execucoes = [estrategias[k % len(estrategias)] for k in range(max(workers, len(estrategias)))]
+    atribuicoes = [execucoes[indice::workers] for indice in range(workers)]
+    duracao = max(0.0, tempo_limite - (time.perf_counter() - inicio))
+
+    fila = mp.Queue()
+    processos = []
+    resultados = []
+    with metricas.fase('busca_local'):
+        for indice in range(workers):
+            processo = mp.Process(target=_executar_estrategias,
+                                  args=(indice, atribuicoes[indice], instancia, duracao, sementes[indice], incumbente, fila,
+                                        solucao_inicial, busca))
+            processo.start()
+            processos.append(processo)
+
+        while len(resultados) < len(execucoes):
+            try:
+                resultados.append(fila.get(timeout=1.0))
+            except queue.Empty:
+                # Um processo que terminou sem publicar resultado (por exemplo, encerrado pelo sistema) não é aguardado
+                if not any(p.is_alive() for p in processos) and fila.empty():
+                    break
+        for processo in processos:
+            processo.join()
+
+    for *_, contagens in resultados:
+        if contagens is not None:
+            metricas.acumular(*contagens)
+    por_processo = [{"processo": indice, "estrategia": est, "makespan": ms, "iteracoes": it, "erro": erro}
+                    for indice, est, _, ms, it, erro, _ in sorted(resultados, key=lambda r: r[0])]
+    validos = [r for r in resultados if r[2] is not None]
+    if not validos:
+        raise RuntimeError(f"Nenhuma estratégia do portfólio terminou com sucesso: {por_processo}")
+    _, estrategia, solucao, makespan, *_ = min(validos, key=lambda r: r[3])
+    metricas.registrar_makespan(makespan)
+    return {
+        "solucao": solucao,
+        "makespan": makespan,
+        "ddlb": ddlb,
+        "razao_ms_ddlb": makespan / ddlb if ddlb > 0 else 0,
+        "estrategia_vencedora": estrategia,
+        "alvo_atingido": makespan <= incumbente.alvo,
+        "tempo_s": time.perf_counter() - inicio,
+        "processos": por_processo,
+    }
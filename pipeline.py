@@ -0,0 +1,208 @@
+# Arquivo: pipeline.py
+#
+# Pipeline de geração e resolução em fluxo: cada instância é gerada e resolvida
+# (FFD -> busca local -> DDLB) no mesmo processo, em memória, sem passar por um
+# .json. As instâncias são produzidas sob demanda e no máximo `max_pendentes`
+# delas ficam em andamento ao mesmo tempo, de modo que o uso de memória não
+# depende do número de réplicas. Os resultados são gravados assim que chegam.
+#
+# Uso:
+#   python pipeline.py --replicas 1000 --seed 42 --workers 8
+#   python pipeline.py --cenario LLLLLHH --replicas 100 --pasta_instancias instancias
+
+import os
+import itertools
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from tqdm import tqdm
+
+from instancia import Instancia
+from local_search2 import MODOS_AVALIACAO, CONSTRUTIVAS, resolver_instancia
+from estrategias_busca import ESTRATEGIAS_PREDEFINIDAS
+from instrumentacao import Metricas, SEM_METRICAS
+from run_generator import (todos_os_codigos, gerar_cenario, caminho_da_instancia, salvar_cenario, niveis_dos_argumentos,
+                           semente_da_execucao)
+from matriz_setup import ARMAZENAMENTOS_SETUP
+from run_solver import salvar_metricas
+from cache_resultados import CacheResultados, resolver_com_cache
+from armazenamento_binario import chave_da_instancia
+from resultados import EscritorResultados, instancias_concluidas
+
+
+def tarefas_do_estudo(codigos, replicas, seed, concluidas=frozenset(), **opcoes):
+    """
+    Gera, sob demanda, as tarefas (codigo, replica, seed, opcoes) do estudo,
+    pulando as instâncias cujas chaves estão em `concluidas`.
+    """
+    for codigo, replica in itertools.product(codigos, range(1, replicas + 1)):
+        if chave_da_instancia(codigo, replica) not in concluidas:
+            yield codigo, replica, seed, opcoes
+
+
+def gerar_e_resolver(tarefa):
+    """
+    Gera uma instância e a resolve em memória, retornando o seu registro de
+    resultado. Executada nos processos do pool; erros são devolvidos no próprio
+    registro para não interromper o estudo. Se `opcoes['pasta_instancias']`
+    for informada, a instância também é salva em .json; com
+    `opcoes['pasta_metricas']`, as suas métricas também são gravadas; com
+    `opcoes['pasta_cache']`, o resultado é buscado no cache antes.
+    """
+    codigo, replica, seed, opcoes = tarefa
+    registro = {"arquivo": chave_da_instancia(codigo, replica), "codigo_cenario": codigo, "replica": replica}
+    try:
+        cenario_obj = gerar_cenario(codigo, replica, seed, niveis=opcoes.get('niveis'),
+                                    armazenamento_setup=opcoes.get('armazenamento_setup', 'float64'))
+        if opcoes.get('pasta_instancias'):
+            os.makedirs(os.path.join(opcoes['pasta_instancias'], codigo), exist_ok=True)
+            salvar_cenario(cenario_obj, caminho_da_instancia(opcoes['pasta_instancias'], codigo, replica))
+        # Sem --pasta_metricas, a instrumentação fica desativada
+        metricas = Metricas() if opcoes.get('pasta_metricas') else SEM_METRICAS
+        configuracao = dict(tempo_limite=opcoes.get('tempo_limite'), modo_avaliacao=opcoes.get('modo_avaliacao', 'incremental'),
+                            estrategia=opcoes.get('estrategia'), metricas=metricas, construtiva=opcoes.get('construtiva', 'ffd'))
+        if opcoes.get('pasta_cache'):
+            resultado = resolver_com_cache(Instancia.de_cenario(cenario_obj), CacheResultados(opcoes['pasta_cache']),
+                                           **configuracao)
+        else:
+            resultado = resolver_instancia(Instancia.de_cenario(cenario_obj), **configuracao)
+        resultado.pop("solucao")
+        registro.update(resultado)
+        if opcoes.get('pasta_metricas') and resultado.get("cache", "nenhum") == "nenhum":
+            salvar_metricas(metricas, opcoes['pasta_metricas'], registro["arquivo"])
+    except Exception as e:
+        registro["status"] = f"erro: {e}"
+    return registro
+
+
+def executar_em_fluxo(funcao, tarefas, workers, max_pendentes=None):
+    """
+    Aplica `funcao` às tarefas e devolve os resultados conforme terminam.
+
+    As tarefas são consumidas do iterável apenas quando há vaga: no máximo
+    `max_pendentes` (padrão: 4 por processo) ficam submetidas ao pool ao mesmo
+    tempo. Com um único processo, tudo é executado no processo atual.
+    """
+    if workers <= 1:
+        for tarefa in tarefas:
+            yield funcao(tarefa)
+        return
+    max_pendentes = max_pendentes or 4 * workers
+    tarefas = iter(tarefas)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = {executor.submit(funcao, t) for t in itertools.islice(tarefas, max_pendentes)}
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                yield futuro.result()
+            pendentes |= {executor.submit(funcao, t) for t in itertools.islice(tarefas, len(concluidos))}
+
+
+def main(args):
+    print("--- Iniciando o Pipeline de Geração e Resolução ---")
+    codigos = [args.cenario.upper()] if args.cenario else todos_os_codigos()
+    # Sem --seed, sorteia uma semente e a exibe para que o estudo possa ser reproduzido;
+    # no --resume, reaproveita a semente gravada ao lado do arquivo de resultados
+    try:
+        seed = semente_da_execucao(args.seed, args.saida + '.semente.txt', args.resume)
+    except ValueError as e:
+        print(f"ERRO FATAL: {e}")
+        return
+
+    concluidas = set()
+    if args.resume:
+        concluidas = instancias_concluidas(args.saida)
+    elif os.path.exists(args.saida):
+        os.remove(args.saida)
+
+    total = len(codigos) * args.replicas
+    print(f"Instâncias do estudo: {total} ({len(codigos)} cenários x {args.replicas} réplicas) | Já resolvidas: {len(concluidas)}")
+    print(f"Semente: {seed} | Processos: {args.workers} | Tempo limite por instância: {args.tempo_limite if args.tempo_limite is not None else 'sem limite'}")
+    print(f"Instâncias salvas em disco: {args.pasta_instancias or 'não'} | Resultados em: '{args.saida}'")
+
+    tarefas = tarefas_do_estudo(codigos, args.replicas, seed, concluidas, pasta_instancias=args.pasta_instancias,
+                                tempo_limite=args.tempo_limite, modo_avaliacao=args.modo_avaliacao,
+                                estrategia=args.estrategia, pasta_metricas=args.pasta_metricas,
+                                construtiva=args.construtiva, pasta_cache=args.cache,
+                                niveis=niveis_dos_argumentos(args), armazenamento_setup=args.armazenamento_setup)
+    restantes = sum(1 for c, r in itertools.product(codigos, range(1, args.replicas + 1))
+                    if chave_da_instancia(c, r) not in concluidas)
+    if args.pasta_metricas:
+        os.makedirs(args.pasta_metricas, exist_ok=True)
+    if args.cache:
+        cache = CacheResultados(args.cache, args.cache_tamanho_max * 1024 ** 2)
+        print(f"Cache: '{args.cache}' (até {args.cache_tamanho_max} MB) | Entradas removidas por tamanho: {cache.limpar()}")
+
+    reaproveitados = 0
+    with EscritorResultados(args.saida) as escritor:
+        for registro in tqdm(executar_em_fluxo(gerar_e_resolver, tarefas, args.workers, args.max_pendentes),
+                             total=restantes, desc="Instâncias"):
+            escritor.escrever(registro)
+            reaproveitados += registro.get("cache") == "completo"
+
+    if args.cache:
+        cache.limpar()
+        print(f"Cache: {reaproveitados} de {restantes} resultados reaproveitados.")
+
+    print("\n--- Pipeline concluído! ---")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera e resolve instâncias em memória, sem arquivos intermediários.")
+
+    parser.add_argument('--replicas', type=int, default=10,
+                        help='Número de réplicas de cada cenário.')
+
+    parser.add_argument('--cenario', type=str, default=None,
+                        help='Usa apenas um cenário específico (ex: LLLLLLL). Se não for fornecido, usa os 128.')
+
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semente global; as instâncias são as mesmas de run_generator.py com a mesma semente.')
+
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Número de processos (padrão: número de núcleos).')
+
+    parser.add_argument('--max_pendentes', type=int, default=None,
+                        help='Máximo de instâncias em andamento ao mesmo tempo (padrão: 4 por processo).')
+
+    parser.add_argument('--saida', type=str, default='resultados_pipeline.jsonl',
+                        help='Arquivo de resultados: .jsonl (padrão) ou .csv, conforme a extensão.')
+
+    parser.add_argument('--pasta_instancias', type=str, default=None,
+                        help='Se informada, as instâncias também são salvas em .json nesta pasta.')
+
+    parser.add_argument('--n_maquinas', type=int, default=None,
+                        help='Número de máquinas de todas as instâncias, no lugar do nível do código (ex: 100).')
+
+    parser.add_argument('--n_medio_jobs_maquina', type=int, default=None,
+                        help='Média de tarefas por máquina de todas as instâncias, no lugar do nível do código (ex: 50).')
+
+    parser.add_argument('--armazenamento_setup', type=str, choices=list(ARMAZENAMENTOS_SETUP), default='float64',
+                        help='Matriz de setup usada pelo solver: float64 (padrão), float32 ou procedural (gerada sob demanda).')
+
+    parser.add_argument('--tempo_limite', type=float, default=None,
+                        help='Tempo limite, em segundos, da resolução de cada instância (ver run_solver.py --help).')
+
+    parser.add_argument('--modo_avaliacao', type=str, choices=list(MODOS_AVALIACAO), default='incremental',
+                        help='Avaliação das vizinhanças na busca local: incremental ou vetorizado (mesmo resultado).')
+
+    parser.add_argument('--construtiva', type=str, choices=CONSTRUTIVAS, default='ffd',
+                        help="Heurística da solução inicial (padrão: ffd; 'melhor' usa a de menor makespan entre todas).")
+
+    parser.add_argument('--estrategia', type=str, choices=list(ESTRATEGIAS_PREDEFINIDAS), default=None,
+                        help='Estratégia de varredura da busca local (padrão: melhor melhoria com varredura completa).')
+
+    parser.add_argument('--pasta_metricas', type=str, default=None,
+                        help='Se informada, grava nesta pasta um .json de métricas por instância.')
+
+    parser.add_argument('--cache', type=str, default=None,
+                        help='Pasta do cache de resultados (a mesma de run_solver.py pode ser usada).')
+
+    parser.add_argument('--cache_tamanho_max', type=int, default=512,
+                        help='Tamanho máximo do cache, em MB (padrão: 512).')
+
+    parser.add_argument('--resume', action='store_true',
+                        help='Mantém o arquivo de resultados e pula as instâncias que já constam nele (as que terminaram em erro são resolvidas de novo). A semente é a da execução original (gravada em <saida>.semente.txt).')
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,122 @@
+# Arquivo: resultados.py
+
+import io
+import os
+import csv
+import json
+
+# Ordem das colunas dos registros de resultado (uma linha por instância)
+CAMPOS_RESULTADO = [
+    "arquivo", "codigo_cenario", "replica", "makespan_inicial", "makespan_final",
+    "ddlb", "razao_ms_ddlb", "iteracoes", "tempo_s", "status",
+]
+# Status de um registro que conta como instância resolvida no --resume
+STATUS_CONCLUIDOS = ("ok", "tempo_esgotado")
+
+
+class EscritorResultados:
+    """
+    Grava registros de resultado, um por instância, em JSONL ou CSV (escolhido
+    pela extensão do arquivo). Cada registro é anexado e descarregado no disco
+    assim que é recebido, de modo que uma execução interrompida pode ser
+    retomada a partir do que já foi gravado.
+    """
+    def __init__(self, caminho_arquivo, campos=CAMPOS_RESULTADO):
+        self.caminho_arquivo = caminho_arquivo
+        self.campos = campos
+        self.formato = 'csv' if caminho_arquivo.lower().endswith('.csv') else 'jsonl'
+        pasta = os.path.dirname(caminho_arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        # Um registro truncado por uma interrupção anterior é descartado; a
+        # instância não consta em instancias_concluidas e é resolvida de novo
+        novo = not os.path.exists(caminho_arquivo) or _descartar_registro_incompleto(caminho_arquivo, self.formato) == 0
+        self._arquivo = open(caminho_arquivo, 'a', newline='', encoding='utf-8')
+        if self.formato == 'csv':
+            self._csv = csv.DictWriter(self._arquivo, fieldnames=campos, extrasaction='ignore')
+            if novo:
+                self._csv.writeheader()
+
+    def escrever(self, registro):
+        if self.formato == 'csv':
+            self._csv.writerow(registro)
+        else:
+            self._arquivo.write(json.dumps({c: registro.get(c) for c in self.campos}, ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _fim_dos_registros_completos(dados, formato):
+    """
+    Tamanho do trecho de `dados` (bytes do arquivo) formado apenas por
+    registros completos, isto é, até a última quebra de linha que encerra um
+    registro. No CSV, uma quebra de linha entre aspas faz parte de um campo
+    (por exemplo, uma mensagem de erro) e não encerra o registro.
+    """
+    fim = len(dados)
+    while fim > 0 and not (dados.endswith(b"\n", 0, fim) and (formato != 'csv' or dados.count(b'"', 0, fim) % 2 == 0)):
+        fim = dados.rfind(b"\n", 0, fim - 1) + 1
+    return fim
+
+
+def _descartar_registro_incompleto(caminho_arquivo, formato):
+    """Remove do fim do arquivo o registro escrito pela metade, se houver, e retorna o novo tamanho."""
+    with open(caminho_arquivo, 'r+b') as f:
+        dados = f.read()
+        fim = _fim_dos_registros_completos(dados, formato)
+        if fim < len(dados):
+            f.truncate(fim)
+    return fim
+
+
+def ler_registros(caminho_arquivo):
+    """
+    Lê os registros completos já gravados em um arquivo de resultados JSONL
+    ou CSV. Um registro final escrito pela metade é ignorado, assim como o
+    EscritorResultados o descarta ao anexar.
+    """
+    if not os.path.exists(caminho_arquivo):
+        return []
+    formato = 'csv' if caminho_arquivo.lower().endswith('.csv') else 'jsonl'
+    with open(caminho_arquivo, 'rb') as f:
+        dados = f.read()
+    texto = dados[:_fim_dos_registros_completos(dados, formato)].decode('utf-8')
+    if formato == 'csv':
+        return list(csv.DictReader(io.StringIO(texto, newline='')))
+    registros = []
+    for linha in texto.split("\n"):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            registros.append(json.loads(linha))
+        except json.JSONDecodeError:
+            # Linha corrompida: a instância será resolvida de novo
+            continue
+    return registros
+
+
+def instancias_concluidas(caminho_arquivo):
+    """
+    Instâncias (campo 'arquivo') com um resultado já gravado, usadas pelo
+    --resume. Só contam os registros com status em STATUS_CONCLUIDOS: os de
+    erro, ou com o status faltando, são resolvidos de novo e o novo registro
+    é anexado depois do antigo.
+    """
+    return {registro["arquivo"] for registro in ler_registros(caminho_arquivo)
+            if registro.get("status") in STATUS_CONCLUIDOS}
+
+
+def replica_do_arquivo(caminho_arquivo):
+    """Extrai o número da réplica de um nome no formato '<CODIGO>_<replica>.json'."""
+    nome = os.path.splitext(os.path.basename(caminho_arquivo))[0]
+    _, _, sufixo = nome.rpartition('_')
+    return int(sufixo) if sufixo.isdigit() else None
@@ -1,69 +1,235 @@
 import os
 import itertools
 import argparse  # Nova biblioteca para argumentos de linha de comando
+from multiprocessing import Pool
+import numpy as np
 from tqdm import tqdm  # Nova biblioteca para barras de progresso
 from cenario import Cenario
+from matriz_setup import ARMAZENAMENTOS_SETUP
+from armazenamento_binario import PacoteBinario, chave_da_instancia
+
+# Arquivo da pasta de saída com a semente da execução (lido pelo --resume)
+ARQUIVO_SEMENTE = 'semente.txt'
+
+def indice_do_codigo(codigo):
+    """Converte o código de 7 letras em um inteiro (L=0, H=1), estável entre execuções."""
+    return int(codigo.upper().replace('L', '0').replace('H', '1'), 2)
+
+def rng_da_instancia(seed, codigo, replica):
+    """
+    Cria o gerador aleatório independente da instância (codigo, replica).
+    O fluxo depende apenas da semente global e da identidade da instância, e
+    não da ordem de geração ou do processo que a executa.
+    """
+    sequencia = np.random.SeedSequence(seed, spawn_key=(indice_do_codigo(codigo), replica))
+    return np.random.default_rng(sequencia)
+
+def semente_da_execucao(seed, arquivo_semente, resume):
+    """
+    Semente usada na execução, gravada em `arquivo_semente`. Sem `seed`, uma
+    nova é sorteada; com `resume`, é usada a semente gravada pela execução
+    original, para que as instâncias que faltam venham do mesmo fluxo
+    aleatório das já existentes. Uma `seed` diferente da gravada, ou um
+    `resume` sem semente conhecida, gera ValueError.
+    """
+    gravada = None
+    if resume and os.path.exists(arquivo_semente):
+        with open(arquivo_semente, 'r') as f:
+            gravada = int(f.read().strip())
+    if gravada is not None and seed is not None and seed != gravada:
+        raise ValueError(f"--seed {seed} difere da semente {gravada} da execução retomada (gravada em '{arquivo_semente}').")
+    if resume and gravada is None and seed is None:
+        raise ValueError(f"A semente da execução original não foi encontrada em '{arquivo_semente}'. "
+                         f"Informe-a com --seed para usar --resume.")
+    if gravada is not None:
+        seed = gravada
+    elif seed is None:
+        seed = np.random.SeedSequence().entropy
+    pasta = os.path.dirname(arquivo_semente)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(arquivo_semente, 'w') as f:
+        f.write(f"{seed}\n")
+    return seed
+
+def caminho_da_instancia(pasta_saida, codigo, replica):
+    return os.path.join(pasta_saida, codigo, f"{codigo}_{replica}.json")
+
+def todos_os_codigos():
+    """Os 128 códigos de cenário (todas as combinações de L/H nos 7 fatores)."""
+    return [''.join(p) for p in itertools.product(['L', 'H'], repeat=7)]
+
+def niveis_dos_argumentos(args):
+    """Níveis personalizados informados na linha de comando (--n_maquinas, --n_medio_jobs_maquina)."""
+    return {fator: getattr(args, fator) for fator in ('n_maquinas', 'n_medio_jobs_maquina')
+            if getattr(args, fator) is not None}
+
+def gerar_cenario(codigo, replica, seed, niveis=None, armazenamento_setup='float64'):
+    cenario_obj = Cenario(codigo, rng=rng_da_instancia(seed, codigo, replica), niveis=niveis,
+                          armazenamento_setup=armazenamento_setup)
+    # Chamamos com verbose=False para silenciar a saída
+    cenario_obj.gerar_dados(verbose=False)
+    return cenario_obj
+
+def gerar_instancia(tarefa):
+    """
+    Gera e salva uma única instância. Executada nos processos do pool.
+    O arquivo é escrito em um temporário e renomeado ao final, de modo que uma
+    execução interrompida nunca deixa um .json incompleto para o --resume.
+    """
+    codigo, replica, seed, pasta_saida, opcoes_cenario = tarefa
+    caminho_completo = caminho_da_instancia(pasta_saida, codigo, replica)
+    try:
+        salvar_cenario(gerar_cenario(codigo, replica, seed, **opcoes_cenario), caminho_completo)
+        return codigo, replica, None
+    except Exception as e:
+        return codigo, replica, str(e)
+
+def salvar_cenario(cenario_obj, caminho_completo):
+    """Salva o cenário em .json passando por um arquivo temporário renomeado ao final."""
+    caminho_temporario = caminho_completo + '.tmp'
+    cenario_obj.salvar_em_json(caminho_temporario, verbose=False)
+    os.replace(caminho_temporario, caminho_completo)
+
+def gerar_cenario_para_pacote(tarefa):
+    """
+    Gera uma instância e a devolve ao processo principal, que é o único a
+    escrever no pacote binário.
+    """
+    codigo, replica, seed, _, opcoes_cenario = tarefa
+    try:
+        return codigo, replica, gerar_cenario(codigo, replica, seed, **opcoes_cenario), None
+    except Exception as e:
+        return codigo, replica, None, str(e)
+
+def executar_tarefas(funcao, tarefas, workers):
+    """
+    Executa as tarefas em ordem (sequencialmente ou em um pool de processos),
+    devolvendo os resultados na mesma ordem das tarefas.
+    """
+    if workers > 1:
+        with Pool(workers) as pool:
+            yield from pool.imap(funcao, tarefas, chunksize=8)
+    else:
+        for tarefa in tarefas:
+            yield funcao(tarefa)
 
 def main(args):
     """
     Função principal que executa a geração em lote com base nos argumentos fornecidos.
     """
     print("--- Iniciando a Geração em Lote de Cenários ---")
-    
+
     # Se um cenário específico foi solicitado, use apenas ele. Caso contrário, gere todos.
     if args.cenario:
-        codigos_de_cenario = [args.cenario]
+        codigos_de_cenario = [args.cenario.upper()]
         print(f"Modo de geração: Apenas o cenário específico '{args.cenario}' será gerado.")
     else:
-        niveis = ['L', 'H']
-        combinacoes = itertools.product(niveis, repeat=7)
-        codigos_de_cenario = [''.join(p) for p in combinacoes]
+        codigos_de_cenario = todos_os_codigos()
         print("Modo de geração: Todos os 128 cenários serão gerados.")
 
+    # Sem --seed, sorteia uma semente e a exibe para que a execução possa ser reproduzida;
+    # no --resume, reaproveita a semente gravada na pasta de saída
+    try:
+        seed = semente_da_execucao(args.seed, os.path.join(args.pasta_saida, ARQUIVO_SEMENTE), args.resume)
+    except ValueError as e:
+        print(f"ERRO FATAL: {e}")
+        return
+
     total_instancias = len(codigos_de_cenario) * args.replicas
     print(f"Serão geradas {total_instancias} instâncias no total.")
     print(f"({len(codigos_de_cenario)} cenários distintos x {args.replicas} réplicas cada um).")
     print(f"Os arquivos serão salvos na pasta: '{args.pasta_saida}/'")
-    
-    input("\nPressione Enter para começar a geração...")
+    print(f"Semente: {seed} | Processos: {args.workers}")
+    opcoes_cenario = {"niveis": niveis_dos_argumentos(args), "armazenamento_setup": args.armazenamento_setup}
+    if opcoes_cenario["niveis"]:
+        print(f"Níveis personalizados: {opcoes_cenario['niveis']}")
 
-    # Usamos tqdm para criar uma barra de progresso para os cenários
-    for codigo in tqdm(codigos_de_cenario, desc="Cenários"):
-        caminho_cenario_dir = os.path.join(args.pasta_saida, codigo)
-        os.makedirs(caminho_cenario_dir, exist_ok=True)
+    if not args.nao_interativo:
+        input("\nPressione Enter para começar a geração...")
 
-        # Loop interno para as réplicas (pode ter sua própria barra de progresso)
+    caminho_pacote = os.path.join(args.pasta_saida, 'instancias')
+    pacote = None
+    if args.formato == 'binario':
+        if not args.resume:
+            for extensao in ('.bin', '.idx.json'):
+                if os.path.exists(caminho_pacote + extensao):
+                    os.remove(caminho_pacote + extensao)
+        pacote = PacoteBinario(caminho_pacote, modo='a')
+
+    tarefas = []
+    for codigo in codigos_de_cenario:
+        if pacote is None:
+            os.makedirs(os.path.join(args.pasta_saida, codigo), exist_ok=True)
         for i in range(1, args.replicas + 1):
-            try:
-                cenario_obj = Cenario(codigo)
-                
-                # Chamamos com verbose=False para silenciar a saída
-                cenario_obj.gerar_dados(verbose=False)
-                
-                nome_arquivo = f"{codigo}_{i}.json"
-                caminho_completo = os.path.join(caminho_cenario_dir, nome_arquivo)
-                
-                # Chamamos com verbose=False para silenciar a saída
-                cenario_obj.salvar_em_json(caminho_completo, verbose=False)
-
-            except Exception as e:
+            # Com --resume, instâncias já presentes no disco são mantidas
+            if args.resume:
+                if pacote is not None and chave_da_instancia(codigo, i) in pacote:
+                    continue
+                if pacote is None and os.path.exists(caminho_da_instancia(args.pasta_saida, codigo, i)):
+                    continue
+            tarefas.append((codigo, i, seed, args.pasta_saida, opcoes_cenario))
+
+    if args.resume:
+        print(f"Retomando: {total_instancias - len(tarefas)} instâncias já existentes serão mantidas.")
+
+    # Usamos tqdm para criar uma barra de progresso para as instâncias
+    if pacote is None:
+        for codigo, i, erro in tqdm(executar_tarefas(gerar_instancia, tarefas, args.workers), total=len(tarefas), desc="Instâncias"):
+            if erro:
                 # Erros ainda serão impressos, o que é importante
-                tqdm.write(f"\nERRO ao gerar a instância {i} para o cenário {codigo}: {e}")
+                tqdm.write(f"\nERRO ao gerar a instância {i} para o cenário {codigo}: {erro}")
+    else:
+        # As instâncias chegam na ordem das tarefas, então o pacote é idêntico para qualquer número de processos
+        with pacote:
+            resultados = executar_tarefas(gerar_cenario_para_pacote, tarefas, args.workers)
+            for n_gravadas, (codigo, i, cenario_obj, erro) in enumerate(tqdm(resultados, total=len(tarefas), desc="Instâncias"), start=1):
+                if erro:
+                    tqdm.write(f"\nERRO ao gerar a instância {i} para o cenário {codigo}: {erro}")
+                    continue
+                pacote.adicionar_cenario(cenario_obj, i)
+                if n_gravadas % 256 == 0:
+                    pacote.salvar_indice()
+        print(f"Pacote binário salvo em: '{caminho_pacote}.bin' (índice em '{caminho_pacote}.idx.json')")
 
     print("\n--- Geração em lote concluída com sucesso! ---")
 
 if __name__ == "__main__":
     # Configura o parser de argumentos
     parser = argparse.ArgumentParser(description="Gerador de Cenários de Teste para Agendamento de Máquinas Paralelas.")
-    
+
     parser.add_argument('--replicas', type=int, default=10,
                         help='Número de réplicas (amostras) a serem geradas para cada cenário.')
-    
+
     parser.add_argument('--pasta_saida', type=str, default='instancias',
                         help='Nome da pasta principal onde as instâncias serão salvas.')
-    
+
     parser.add_argument('--cenario', type=str, default=None,
                         help='Gera apenas um tipo de cenário específico (ex: LLLLLLL). Se não for fornecido, gera todos os 128.')
 
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semente global. Cada instância (cenário, réplica) recebe um fluxo aleatório próprio derivado dela.')
+
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de processos usados na geração. O resultado é idêntico para qualquer valor.')
+
+    parser.add_argument('--resume', action='store_true',
+                        help='Não gera novamente as instâncias que já existem na pasta de saída. A semente é a da execução original (gravada em semente.txt na pasta de saída).')
+
+    parser.add_argument('--formato', type=str, choices=['json', 'binario'], default='json',
+                        help="Formato de saída: um .json por instância ou um único pacote binário 'instancias.bin' com índice.")
+
+    parser.add_argument('--n_maquinas', type=int, default=None,
+                        help='Número de máquinas de todas as instâncias, no lugar do nível do código (ex: 100).')
+
+    parser.add_argument('--n_medio_jobs_maquina', type=int, default=None,
+                        help='Média de tarefas por máquina de todas as instâncias, no lugar do nível do código (ex: 50).')
+
+    parser.add_argument('--armazenamento_setup', type=str, choices=list(ARMAZENAMENTOS_SETUP), default='float64',
+                        help="Matriz de setup na geração: float64 (padrão), float32 (metade da memória, mesmo .json) ou procedural (gerada sob demanda; o .json guarda apenas os parâmetros).")
+
+    parser.add_argument('-y', '--nao_interativo', action='store_true',
+                        help='Não aguarda a confirmação (Enter) antes de iniciar a geração.')
+
     args = parser.parse_args()
-    main(args)
\ No newline at end of file
+    main(args)
@@ -0,0 +1,166 @@
+import os
+import glob
+import time
+import argparse
+from multiprocessing import Pool
+from tqdm import tqdm
+from local_search2 import MODOS_AVALIACAO, CONSTRUTIVAS, carregar_instancia_de_json, resolver_instancia
+from estrategias_busca import ESTRATEGIAS_PREDEFINIDAS
+from instrumentacao import Metricas, SEM_METRICAS
+from armazenamento_binario import PacoteBinario
+from cache_resultados import CacheResultados, resolver_com_cache
+from resultados import EscritorResultados, instancias_concluidas, replica_do_arquivo
+
+def listar_instancias(pasta_instancias):
+    """Busca recursivamente todos os arquivos .json da pasta de instâncias, em ordem estável."""
+    return sorted(glob.glob(os.path.join(pasta_instancias, '**', '*.json'), recursive=True))
+
+# Pacotes binários abertos neste processo (o .bin é mapeado uma única vez por processo)
+_PACOTES_ABERTOS = {}
+
+def carregar_do_pacote(caminho_pacote, chave):
+    if caminho_pacote not in _PACOTES_ABERTOS:
+        _PACOTES_ABERTOS[caminho_pacote] = PacoteBinario(caminho_pacote)
+    return _PACOTES_ABERTOS[caminho_pacote].carregar(chave)
+
+def salvar_metricas(metricas, pasta_metricas, chave):
+    """Grava as métricas de uma instância em '<pasta_metricas>/<CODIGO>_<replica>.json'."""
+    nome = os.path.splitext(os.path.basename(chave))[0]
+    metricas.salvar_json(os.path.join(pasta_metricas, nome + '.json'), arquivo=chave)
+
+def resolver_arquivo(tarefa):
+    """
+    Resolve uma instância e retorna seu registro de resultado. Executada nos
+    processos do pool; erros são devolvidos no próprio registro para não
+    interromper o lote. A instância vem de um .json ou, se `caminho_pacote`
+    for informado, da entrada `chave` do pacote binário. Com `pasta_cache`, o
+    resultado é buscado no cache antes de resolver a instância.
+    """
+    caminho, chave, tempo_limite, caminho_pacote, modo_avaliacao, estrategia, pasta_metricas, construtiva, pasta_cache = tarefa
+    inicio = time.perf_counter()
+    registro = {"arquivo": chave, "replica": replica_do_arquivo(caminho)}
+    try:
+        if caminho_pacote:
+            instancia = carregar_do_pacote(caminho_pacote, chave)
+        else:
+            instancia = carregar_instancia_de_json(caminho)
+        # Sem --pasta_metricas, a instrumentação fica desativada
+        metricas = Metricas() if pasta_metricas else SEM_METRICAS
+        if pasta_cache:
+            # O tamanho máximo só importa na limpeza, feita pelo processo principal
+            resultado = resolver_com_cache(instancia, CacheResultados(pasta_cache), tempo_limite=tempo_limite, modo_avaliacao=modo_avaliacao,
+                                           estrategia=estrategia, construtiva=construtiva, metricas=metricas)
+        else:
+            resultado = resolver_instancia(instancia, tempo_limite=tempo_limite, modo_avaliacao=modo_avaliacao, estrategia=estrategia, metricas=metricas,
+                                           construtiva=construtiva)
+        resultado.pop("solucao")
+        registro.update(resultado)
+        # Métricas de um resultado que veio do cache não dizem nada sobre o solver
+        if pasta_metricas and resultado.get("cache", "nenhum") == "nenhum":
+            salvar_metricas(metricas, pasta_metricas, chave)
+    except Exception as e:
+        registro["status"] = f"erro: {e}"
+    # O tempo registrado inclui a leitura do arquivo
+    registro["tempo_s"] = time.perf_counter() - inicio
+    return registro
+
+def main(args):
+    """
+    Resolve em lote todas as instâncias da pasta informada, usando um pool de
+    processos, e grava um registro estruturado por instância.
+    """
+    print("--- Iniciando a Execução em Lote do Solver ---")
+    if args.pacote:
+        pacote = PacoteBinario(args.pacote)
+        chaves = pacote.chaves()
+        # Para o pacote, o "arquivo" de cada instância é a sua chave '<CODIGO>_<replica>'
+        arquivos = [chave + '.json' for chave in chaves]
+    else:
+        if not os.path.isdir(args.pasta_instancias):
+            print(f"ERRO FATAL: A pasta de instâncias '{args.pasta_instancias}' não foi encontrada.")
+            print("Por favor, execute o 'run_generator.py' primeiro.")
+            return
+        arquivos = listar_instancias(args.pasta_instancias)
+        # A chave de cada instância é o caminho relativo à pasta, independente de onde o lote é executado
+        chaves = [os.path.relpath(caminho, args.pasta_instancias).replace(os.sep, '/') for caminho in arquivos]
+
+    concluidas = set()
+    if args.resume:
+        concluidas = instancias_concluidas(args.saida)
+    elif os.path.exists(args.saida):
+        os.remove(args.saida)
+
+    tarefas = [(caminho, chave, args.tempo_limite, args.pacote, args.modo_avaliacao, args.estrategia, args.pasta_metricas, args.construtiva, args.cache) for caminho, chave in zip(arquivos, chaves) if chave not in concluidas]
+    print(f"Instâncias encontradas: {len(arquivos)} | Já resolvidas: {len(arquivos) - len(tarefas)} | A resolver: {len(tarefas)}")
+    print(f"Processos: {args.workers} | Tempo limite por instância: {args.tempo_limite if args.tempo_limite is not None else 'sem limite'}")
+    print(f"Os resultados serão salvos em: '{args.saida}'")
+
+    if args.pasta_metricas:
+        os.makedirs(args.pasta_metricas, exist_ok=True)
+    if args.cache:
+        cache = CacheResultados(args.cache, args.cache_tamanho_max * 1024 ** 2)
+        print(f"Cache: '{args.cache}' (até {args.cache_tamanho_max} MB) | Entradas removidas por tamanho: {cache.limpar()}")
+
+    origens = {}
+    def escrever(registro):
+        escritor.escrever(registro)
+        origem = registro.get("cache", "nenhum")
+        origens[origem] = origens.get(origem, 0) + 1
+
+    with EscritorResultados(args.saida) as escritor:
+        if args.workers > 1:
+            with Pool(args.workers) as pool:
+                for registro in tqdm(pool.imap_unordered(resolver_arquivo, tarefas), total=len(tarefas), desc="Instâncias"):
+                    escrever(registro)
+        else:
+            for tarefa in tqdm(tarefas, desc="Instâncias"):
+                escrever(resolver_arquivo(tarefa))
+
+    if args.cache:
+        cache.limpar()
+        print(f"Cache: {origens.get('completo', 0)} resultados completos reaproveitados, "
+              f"{origens.get('solucao', 0)} com apenas o DDLB recalculado, {origens.get('nenhum', 0)} resolvidos.")
+
+    print("\n--- Execução em lote concluída! ---")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolve em lote todas as instâncias JSON geradas pelo run_generator.py.")
+
+    parser.add_argument('--pasta_instancias', type=str, default='instancias',
+                        help='Pasta com as instâncias (buscadas recursivamente).')
+
+    parser.add_argument('--pacote', type=str, default=None,
+                        help='Resolve as instâncias de um pacote binário (caminho sem extensão) em vez da pasta de .json.')
+
+    parser.add_argument('--saida', type=str, default='resultados.jsonl',
+                        help='Arquivo de resultados: .jsonl (padrão) ou .csv, conforme a extensão.')
+
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Número de processos do pool (padrão: número de núcleos).')
+
+    parser.add_argument('--tempo_limite', type=float, default=None,
+                        help='Tempo limite, em segundos, por instância, contado desde o início da resolução. Vale para a solução inicial (com "melhor", as heurísticas restantes são puladas) e para a busca local; se o tempo total, incluindo o DDLB, atingir o limite, o status é "tempo_esgotado".')
+
+    parser.add_argument('--modo_avaliacao', type=str, choices=list(MODOS_AVALIACAO), default='incremental',
+                        help='Avaliação das vizinhanças na busca local: incremental ou vetorizado (mesmo resultado).')
+
+    parser.add_argument('--construtiva', type=str, choices=CONSTRUTIVAS, default='ffd',
+                        help="Heurística da solução inicial (padrão: ffd; 'melhor' usa a de menor makespan entre todas).")
+
+    parser.add_argument('--estrategia', type=str, choices=list(ESTRATEGIAS_PREDEFINIDAS), default=None,
+                        help='Estratégia de varredura da busca local (padrão: melhor melhoria com varredura completa).')
+
+    parser.add_argument('--pasta_metricas', type=str, default=None,
+                        help='Se informada, grava nesta pasta um .json de métricas por instância (tempo por fase, avaliações e movimentos por vizinhança, trajetória).')
+
+    parser.add_argument('--cache', type=str, default=None,
+                        help='Pasta do cache de resultados. Instâncias já resolvidas com a mesma configuração e a mesma versão do solver não são resolvidas de novo.')
+
+    parser.add_argument('--cache_tamanho_max', type=int, default=512,
+                        help='Tamanho máximo do cache, em MB; as entradas usadas há mais tempo são removidas (padrão: 512).')
+
+    parser.add_argument('--resume', action='store_true',
+                        help='Mantém o arquivo de resultados e pula as instâncias que já constam nele (as que terminaram em erro são resolvidas de novo).')
+
+    args = parser.parse_args()
+    main(args)
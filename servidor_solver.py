@@ -0,0 +1,357 @@
+# Arquivo: servidor_solver.py
+#
+# Servidor local do solver. Um processo de longa duração recebe pedidos de
+# resolução por HTTP em 127.0.0.1 e os executa em um pool de processos já
+# iniciados (com o Python, o NumPy e o solver carregados). Cada processo do
+# pool guarda as últimas instâncias lidas (LRU), de modo que pedidos repetidos
+# sobre a mesma instância não leem o .json nem recriam as matrizes.
+#
+# Rotas (corpo e respostas em JSON):
+#   POST   /resolver       resolve uma instância. Corpo: {"caminho": ...} ou
+#                          {"pacote": ..., "chave": ...}, e opcionalmente
+#                          "modo_avaliacao", "estrategia", "construtiva",
+#                          "tempo_limite" e "esperar" (padrão true). Com
+#                          "esperar": false, responde 202 com o id da tarefa.
+#   GET    /tarefas/<id>   estado e, se concluída, resultado da tarefa
+#   DELETE /tarefas/<id>   cancela a tarefa (na fila ou em execução)
+#   GET    /estado         processos, tarefas na fila e em execução
+#   POST   /encerrar       encerra o servidor
+#
+# Os pedidos que excedem os processos esperam em uma fila de até `max_fila`
+# tarefas; com a fila cheia, a resposta é 503. Uma tarefa cancelada em
+# execução é interrompida na próxima iteração da busca local e devolve a
+# melhor solução encontrada até ali; enquanto isso, o seu estado é
+# 'cancelando'.
+#
+# Uso:
+#   python servidor_solver.py --workers 4
+#   python cliente_solver.py resolver instancias/HHHHHHH/HHHHHHH_1.json
+
+import os
+import json
+import time
+import itertools
+import argparse
+import threading
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from local_search2 import MODOS_AVALIACAO, CONSTRUTIVAS, carregar_instancia_de_json, resolver_instancia
+from estrategias_busca import ESTRATEGIAS_PREDEFINIDAS
+from armazenamento_binario import PacoteBinario
+
+PORTA_PADRAO = 8765
+# Tarefas concluídas mantidas para consulta em /tarefas/<id>
+MAX_TAREFAS_CONCLUIDAS = 1000
+
+NA_FILA = 'na_fila'
+EXECUTANDO = 'executando'
+CANCELANDO = 'cancelando'
+CONCLUIDA = 'concluida'
+CANCELADA = 'cancelada'
+ERRO = 'erro'
+
+
+# --- PROCESSOS DO POOL ---
+
+# Estado de cada processo do pool, criado por _iniciar_processo
+_CANCELAMENTOS = None
+_INICIADAS = None
+_INSTANCIAS = OrderedDict()
+_TAMANHO_CACHE = 0
+
+
+def _iniciar_processo(cancelamentos, iniciadas, tamanho_cache):
+    global _CANCELAMENTOS, _INICIADAS, _TAMANHO_CACHE
+    _CANCELAMENTOS = cancelamentos
+    _INICIADAS = iniciadas
+    _TAMANHO_CACHE = tamanho_cache
+
+
+def _carregar_instancia(pedido):
+    """Retorna (instancia, veio_do_cache). A chave inclui a data de modificação do arquivo."""
+    if pedido.get('pacote'):
+        arquivo = pedido['pacote'] + '.bin'
+        chave = ('pacote', pedido['pacote'], pedido['chave'], os.stat(arquivo).st_mtime_ns)
+        carregar = lambda: PacoteBinario(pedido['pacote']).carregar(pedido['chave'])
+    else:
+        chave = ('json', pedido['caminho'], os.stat(pedido['caminho']).st_mtime_ns)
+        carregar = lambda: carregar_instancia_de_json(pedido['caminho'])
+    if chave in _INSTANCIAS:
+        _INSTANCIAS.move_to_end(chave)
+        return _INSTANCIAS[chave], True
+    instancia = carregar()
+    if _TAMANHO_CACHE > 0:
+        _INSTANCIAS[chave] = instancia
+        if len(_INSTANCIAS) > _TAMANHO_CACHE:
+            _INSTANCIAS.popitem(last=False)
+    return instancia, False
+
+
+def _resolver_pedido(pedido, vaga):
+    """
+    Executada nos processos do pool: resolve o pedido e retorna o resultado
+    estruturado, ou None se a tarefa foi cancelada antes de começar.
+    """
+    # O executor pode entregar a tarefa ao processo antes que ele esteja livre,
+    # então o início real e o cancelamento são sinalizados pelos arrays compartilhados
+    if _CANCELAMENTOS[vaga]:
+        return None
+    _INICIADAS[vaga] = 1
+    inicio = time.perf_counter()
+    instancia, em_cache = _carregar_instancia(pedido)
+    resultado = resolver_instancia(instancia, tempo_limite=pedido.get('tempo_limite'),
+                                   modo_avaliacao=pedido.get('modo_avaliacao', 'incremental'),
+                                   estrategia=pedido.get('estrategia'), construtiva=pedido.get('construtiva', 'ffd'),
+                                   deve_parar=lambda: _CANCELAMENTOS[vaga] != 0)
+    if _CANCELAMENTOS[vaga]:
+        resultado["status"] = CANCELADA
+    resultado["instancia_em_cache"] = em_cache
+    resultado["pid"] = os.getpid()
+    # O tempo registrado inclui a leitura da instância
+    resultado["tempo_s"] = time.perf_counter() - inicio
+    return resultado
+
+
+# --- SERVIDOR ---
+
+def validar_pedido(pedido):
+    """Normaliza o pedido de resolução; levanta ValueError com a mensagem para o cliente."""
+    if not isinstance(pedido, dict):
+        raise ValueError("O corpo do pedido deve ser um objeto JSON.")
+    if pedido.get('pacote'):
+        if not os.path.exists(pedido['pacote'] + '.bin') or 'chave' not in pedido:
+            raise ValueError("Informe um 'pacote' existente (caminho sem extensão) e a 'chave' da instância.")
+    elif not pedido.get('caminho') or not os.path.isfile(pedido['caminho']):
+        raise ValueError(f"Arquivo de instância não encontrado: {pedido.get('caminho')!r}.")
+    if pedido.get('modo_avaliacao', 'incremental') not in MODOS_AVALIACAO:
+        raise ValueError(f"Modo de avaliação desconhecido. Use um de {list(MODOS_AVALIACAO)}.")
+    if pedido.get('estrategia') is not None and pedido['estrategia'] not in ESTRATEGIAS_PREDEFINIDAS:
+        raise ValueError(f"Estratégia desconhecida. Use uma de {list(ESTRATEGIAS_PREDEFINIDAS)}.")
+    if pedido.get('construtiva', 'ffd') not in CONSTRUTIVAS:
+        raise ValueError(f"Heurística construtiva desconhecida. Use uma de {CONSTRUTIVAS}.")
+    tempo_limite = pedido.get('tempo_limite')
+    if tempo_limite is not None and (not isinstance(tempo_limite, (int, float)) or tempo_limite <= 0):
+        raise ValueError("'tempo_limite' deve ser um número positivo de segundos.")
+    campos = ('caminho', 'pacote', 'chave', 'modo_avaliacao', 'estrategia', 'construtiva', 'tempo_limite')
+    return {campo: pedido[campo] for campo in campos if pedido.get(campo) is not None}
+
+
+class FilaCheia(Exception):
+    pass
+
+
+class ServidorSolver:
+    """
+    Pool de processos do solver com fila limitada, acompanhamento e
+    cancelamento de tarefas. Cada tarefa ocupa, enquanto não termina, uma das
+    `max_fila` vagas dos arrays compartilhados com os processos, que indicam
+    o cancelamento pedido e o início da execução de cada tarefa.
+    """
+    def __init__(self, workers, max_fila, tamanho_cache, tempo_limite=None):
+        self.workers = workers
+        self.tempo_limite = tempo_limite
+        self._cancelamentos = mp.Array('b', max_fila, lock=False)
+        self._iniciadas = mp.Array('b', max_fila, lock=False)
+        self._vagas = list(range(max_fila))
+        self._tarefas = OrderedDict()
+        self._ids = itertools.count(1)
+        self._trava = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo,
+                                             initargs=(self._cancelamentos, self._iniciadas, tamanho_cache))
+
+    def submeter(self, pedido):
+        """Coloca o pedido (já validado) na fila e retorna o id da tarefa."""
+        if 'tempo_limite' not in pedido and self.tempo_limite is not None:
+            pedido['tempo_limite'] = self.tempo_limite
+        with self._trava:
+            if not self._vagas:
+                raise FilaCheia()
+            vaga = self._vagas.pop()
+            self._cancelamentos[vaga] = 0
+            self._iniciadas[vaga] = 0
+            id_tarefa = str(next(self._ids))
+            tarefa = {"id": id_tarefa, "estado": NA_FILA, "pedido": pedido, "vaga": vaga,
+                      "resultado": None, "erro": None, "finalizada": threading.Event()}
+            tarefa["futuro"] = self._executor.submit(_resolver_pedido, pedido, vaga)
+            self._tarefas[id_tarefa] = tarefa
+        tarefa["futuro"].add_done_callback(lambda futuro: self._finalizar(tarefa))
+        return id_tarefa
+
+    def _finalizar(self, tarefa):
+        futuro = tarefa["futuro"]
+        with self._trava:
+            if futuro.cancelled() or (futuro.exception() is None and futuro.result() is None):
+                tarefa["estado"] = CANCELADA
+            elif futuro.exception() is not None:
+                tarefa["estado"], tarefa["erro"] = ERRO, str(futuro.exception())
+            else:
+                tarefa["resultado"] = futuro.result()
+                tarefa["estado"] = CANCELADA if tarefa["resultado"]["status"] == CANCELADA else CONCLUIDA
+            self._vagas.append(tarefa["vaga"])
+            tarefa["finalizada"].set()
+            # Descarta as tarefas concluídas mais antigas
+            finalizadas = [i for i, t in self._tarefas.items() if t["futuro"].done()]
+            for id_antigo in finalizadas[:max(0, len(finalizadas) - MAX_TAREFAS_CONCLUIDAS)]:
+                del self._tarefas[id_antigo]
+
+    def aguardar(self, id_tarefa):
+        # A espera fica fora da trava, para não bloquear as demais requisições
+        with self._trava:
+            tarefa = self._tarefas.get(id_tarefa)
+        if tarefa is not None:
+            tarefa["finalizada"].wait()
+        return self.consultar(id_tarefa)
+
+    def consultar(self, id_tarefa):
+        with self._trava:
+            tarefa = self._tarefas.get(id_tarefa)
+            if tarefa is None:
+                return None
+            if tarefa["estado"] == NA_FILA and self._iniciadas[tarefa["vaga"]]:
+                tarefa["estado"] = EXECUTANDO
+            estado = tarefa["estado"]
+            if estado in (NA_FILA, EXECUTANDO) and self._cancelamentos[tarefa["vaga"]]:
+                # Cancelamento pedido, ainda não atendido pelo processo
+                estado = CANCELANDO
+            resposta = {"id": tarefa["id"], "estado": estado, "pedido": tarefa["pedido"]}
+            if tarefa["resultado"] is not None:
+                resposta["resultado"] = tarefa["resultado"]
+            if tarefa["erro"] is not None:
+                resposta["erro"] = tarefa["erro"]
+            return resposta
+
+    def cancelar(self, id_tarefa):
+        """Cancela a tarefa: sai da fila ou, se já está em execução, é interrompida pelo processo."""
+        with self._trava:
+            tarefa = self._tarefas.get(id_tarefa)
+            if tarefa is None:
+                return None
+            if not tarefa["futuro"].done():
+                self._cancelamentos[tarefa["vaga"]] = 1
+        # Fora da trava: se a tarefa ainda estava na fila, o cancelamento chama _finalizar nesta thread
+        tarefa["futuro"].cancel()
+        return self.consultar(id_tarefa)
+
+    def estado(self):
+        with self._trava:
+            pendentes = [t for t in self._tarefas.values() if not t["futuro"].done()]
+            executando = sum(self._iniciadas[t["vaga"]] for t in pendentes)
+            return {"workers": self.workers, "executando": executando, "na_fila": len(pendentes) - executando,
+                    "vagas_livres": len(self._vagas), "tarefas_registradas": len(self._tarefas)}
+
+    def encerrar(self):
+        for vaga in range(len(self._cancelamentos)):
+            self._cancelamentos[vaga] = 1
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ManipuladorPedidos(BaseHTTPRequestHandler):
+    """Traduz as rotas HTTP em chamadas ao ServidorSolver (self.server.solver)."""
+    protocol_version = 'HTTP/1.1'
+
+    def _responder(self, codigo, corpo):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_corpo(self):
+        tamanho = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(tamanho) or b'{}')
+
+    def _tarefa(self, resposta):
+        if resposta is None:
+            self._responder(404, {"erro": "Tarefa não encontrada."})
+        else:
+            self._responder(200, resposta)
+
+    def do_GET(self):
+        solver = self.server.solver
+        if self.path == '/estado':
+            self._responder(200, solver.estado())
+        elif self.path.startswith('/tarefas/'):
+            self._tarefa(solver.consultar(self.path[len('/tarefas/'):]))
+        else:
+            self._responder(404, {"erro": f"Rota desconhecida: {self.path}"})
+
+    def do_DELETE(self):
+        if self.path.startswith('/tarefas/'):
+            self._tarefa(self.server.solver.cancelar(self.path[len('/tarefas/'):]))
+        else:
+            self._responder(404, {"erro": f"Rota desconhecida: {self.path}"})
+
+    def do_POST(self):
+        solver = self.server.solver
+        if self.path == '/encerrar':
+            self._responder(200, {"mensagem": "Servidor encerrado."})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if self.path != '/resolver':
+            self._responder(404, {"erro": f"Rota desconhecida: {self.path}"})
+            return
+        try:
+            corpo = self._ler_corpo()
+            esperar = corpo.get('esperar', True) if isinstance(corpo, dict) else True
+            id_tarefa = solver.submeter(validar_pedido(corpo))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._responder(400, {"erro": str(e)})
+            return
+        except FilaCheia:
+            self._responder(503, {"erro": "Fila cheia. Tente novamente mais tarde."})
+            return
+        if esperar:
+            self._responder(200, solver.aguardar(id_tarefa))
+        else:
+            self._responder(202, solver.consultar(id_tarefa))
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+
+def main(args):
+    solver = ServidorSolver(args.workers, args.max_fila, args.instancias_em_cache, args.tempo_limite)
+    servidor = ThreadingHTTPServer(('127.0.0.1', args.porta), ManipuladorPedidos)
+    servidor.daemon_threads = True
+    servidor.solver = solver
+    servidor.verbose = args.verbose
+    print(f"Servidor do solver em http://127.0.0.1:{servidor.server_address[1]} | Processos: {args.workers} | "
+          f"Fila: {args.max_fila} | Instâncias em cache por processo: {args.instancias_em_cache}", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        solver.encerrar()
+    print("Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local (HTTP em 127.0.0.1) que resolve instâncias em um pool de processos.")
+
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO,
+                        help=f'Porta TCP em 127.0.0.1 (padrão: {PORTA_PADRAO}).')
+
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Número de processos do pool (padrão: número de núcleos).')
+
+    parser.add_argument('--max_fila', type=int, default=64,
+                        help='Máximo de tarefas na fila e em execução; acima disso os pedidos recebem 503.')
+
+    parser.add_argument('--instancias_em_cache', type=int, default=32,
+                        help='Instâncias lidas mantidas em memória por processo (LRU).')
+
+    parser.add_argument('--tempo_limite', type=float, default=None,
+                        help='Tempo limite, em segundos, dos pedidos que não informam o seu (ver run_solver.py --help).')
+
+    parser.add_argument('--verbose', action='store_true',
+                        help='Exibe cada pedido HTTP recebido.')
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,87 @@
+# Arquivo: tests/test_armazenamento_binario.py
+#
+# Testes da conversão entre as instâncias .json e o pacote binário: os .json
+# que não são instâncias são ignorados, repetir a conversão sobre o mesmo
+# pacote não duplica entradas e a volta para .json reproduz as instâncias.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_generator import gerar_cenario, salvar_cenario
+from local_search2 import carregar_instancia_de_json
+from armazenamento_binario import PacoteBinario, chave_da_instancia, converter_json_para_binario, converter_binario_para_json
+
+CODIGOS = ['LLLLLLL', 'HHHHHHH', 'HLHLHLH']
+REPLICAS = 2
+
+
+def salvar_instancia(pasta, codigo, replica):
+    os.makedirs(os.path.join(pasta, codigo), exist_ok=True)
+    salvar_cenario(gerar_cenario(codigo, replica, 0), os.path.join(pasta, codigo, f"{codigo}_{replica}.json"))
+
+
+class TesteConversao(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.instancias = os.path.join(self.pasta, 'instancias')
+        for codigo in CODIGOS:
+            for replica in range(1, REPLICAS + 1):
+                salvar_instancia(self.instancias, codigo, replica)
+        # Outros .json na mesma árvore, que não são instâncias
+        with open(os.path.join(self.instancias, 'metricas.json'), 'w') as f:
+            json.dump({'total_avaliacoes': 10}, f)
+        with open(os.path.join(self.instancias, 'lista.json'), 'w') as f:
+            json.dump([1, 2, 3], f)
+        self.pacote = os.path.join(self.pasta, 'pacotes', 'instancias')
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def test_ignora_arquivos_que_nao_sao_instancias(self):
+        self.assertEqual(converter_json_para_binario(self.instancias, self.pacote), len(CODIGOS) * REPLICAS)
+        with PacoteBinario(self.pacote) as pacote:
+            self.assertEqual(sorted(pacote.chaves()),
+                             sorted(chave_da_instancia(c, r) for c in CODIGOS for r in range(1, REPLICAS + 1)))
+
+    def test_conversao_repetida_nao_duplica(self):
+        converter_json_para_binario(self.instancias, self.pacote)
+        tamanho = os.path.getsize(self.pacote + '.bin')
+        self.assertEqual(converter_json_para_binario(self.instancias, self.pacote), 0)
+        self.assertEqual(os.path.getsize(self.pacote + '.bin'), tamanho)
+        self.assertEqual(len(PacoteBinario(self.pacote)), len(CODIGOS) * REPLICAS)
+
+        # Só as instâncias novas são acrescentadas
+        salvar_instancia(self.instancias, 'LHLHLHL', 1)
+        self.assertEqual(converter_json_para_binario(self.instancias, self.pacote), 1)
+        self.assertEqual(len(PacoteBinario(self.pacote)), len(CODIGOS) * REPLICAS + 1)
+
+    def test_ida_e_volta(self):
+        converter_json_para_binario(self.instancias, self.pacote)
+        saida = os.path.join(self.pasta, 'saida')
+        self.assertEqual(converter_binario_para_json(self.pacote, saida), len(CODIGOS) * REPLICAS)
+        for codigo in CODIGOS:
+            for replica in range(1, REPLICAS + 1):
+                nome = os.path.join(codigo, f"{codigo}_{replica}.json")
+                with self.subTest(arquivo=nome):
+                    original = carregar_instancia_de_json(os.path.join(self.instancias, nome))
+                    convertida = carregar_instancia_de_json(os.path.join(saida, nome))
+                    self.assertEqual(convertida.config, original.config)
+                    np.testing.assert_array_equal(convertida.processamento, original.processamento)
+                    np.testing.assert_array_equal(convertida.liberacao, original.liberacao)
+                    np.testing.assert_array_equal(convertida.setup, original.setup)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# Arquivo: tests/test_busca_local.py
+#
+# Teste de regressão do solver contra a versão original (dicionários de
+# dicionários e reavaliação completa da sequência a cada vizinho). As
+# instâncias de tests/dados/referencia foram geradas pelo cenario.py original
+# e resultados.json guarda, para cada uma, a solução do FFD, a solução, o
+# makespan e o número de iterações da busca local (melhor vizinho) e o DDLB
+# calculados pelo local_search2.py original. A avaliação incremental e a
+# vetorizada devem reproduzir esses valores exatamente.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import json
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from local_search2 import MODOS_AVALIACAO, carregar_instancia_de_json, solve_with_ffd, local_search, calcular_ddlb, resolver_instancia
+
+PASTA_REFERENCIA = os.path.join(RAIZ, 'tests', 'dados', 'referencia')
+
+
+def com_chaves_texto(solucao):
+    """Solução com as máquinas como texto, como ficam no JSON de referência."""
+    return {str(m_id): seq for m_id, seq in solucao.items()}
+
+
+class TesteReferenciaBuscaLocal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(PASTA_REFERENCIA, 'resultados.json'), encoding='utf-8') as f:
+            cls.referencia = json.load(f)
+        cls.instancias = {arquivo: carregar_instancia_de_json(os.path.join(PASTA_REFERENCIA, arquivo)) for arquivo in cls.referencia}
+
+    def test_ffd_e_ddlb(self):
+        for arquivo, esperado in self.referencia.items():
+            with self.subTest(arquivo=arquivo):
+                instancia = self.instancias[arquivo]
+                self.assertEqual(com_chaves_texto(solve_with_ffd(instancia)), esperado["ffd"])
+                self.assertEqual(calcular_ddlb(instancia), esperado["ddlb"])
+
+    def test_busca_local(self):
+        for modo in MODOS_AVALIACAO:
+            for arquivo, esperado in self.referencia.items():
+                with self.subTest(modo=modo, arquivo=arquivo):
+                    instancia = self.instancias[arquivo]
+                    solucao, makespan, iteracoes = local_search(solve_with_ffd(instancia), instancia, verbose=False, modo_avaliacao=modo)
+                    self.assertEqual(com_chaves_texto(solucao), esperado["busca_local"])
+                    self.assertEqual(makespan, esperado["makespan"])
+                    self.assertEqual(iteracoes, esperado["iteracoes"])
+
+    def test_resolver_instancia(self):
+        for arquivo, esperado in self.referencia.items():
+            with self.subTest(arquivo=arquivo):
+                resultado = resolver_instancia(self.instancias[arquivo])
+                self.assertEqual(resultado["status"], "ok")
+                self.assertEqual(com_chaves_texto(resultado["solucao"]), esperado["busca_local"])
+                self.assertEqual((resultado["makespan_final"], resultado["iteracoes"], resultado["ddlb"]),
+                                 (esperado["makespan"], esperado["iteracoes"], esperado["ddlb"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Arquivo: tests/test_construtivas.py
+#
+# Testes das heurísticas construtivas: o 'ffd' de construtivas.py (avaliação
+# O(1) ao anexar) reproduz o FFD original, que recalcula a sequência inteira
+# de cada máquina com calculate_sequence_time, e toda heurística devolve uma
+# partição válida das tarefas entre as máquinas.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import json
+import random
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import construtivas
+from instancia import Instancia
+from run_generator import gerar_cenario
+from local_search2 import calculate_sequence_time, carregar_instancia_de_json, solve_with_ffd
+
+PASTA_REFERENCIA = os.path.join(RAIZ, 'tests', 'dados', 'referencia')
+
+# Códigos variados (ready times, processamento, estrutura de setup, máquinas e tarefas por máquina)
+CODIGOS = ['LLLLLLL', 'HHHHHHH', 'HLHLHLH', 'LHLHLHL', 'HHLLHHL', 'LLHHLLH', 'HLLHHLH', 'LHHLLHL']
+# Níveis extras: mais máquinas do que o número médio de tarefas por máquina e uma única máquina
+NIVEIS_EXTRAS = [{'n_maquinas': 10, 'n_medio_jobs_maquina': 1}, {'n_maquinas': 1, 'n_medio_jobs_maquina': 12}]
+
+
+def ffd_original(instancia, ordem=None):
+    """FFD como no solver original: cada máquina candidata é reavaliada por inteiro."""
+    if ordem is None:
+        ordem = construtivas.ordem_decrescente_processamento(instancia)
+    maquinas = {m_id: [] for m_id in range(1, instancia.n_maquinas + 1)}
+    for tarefa in ordem:
+        tempos = {m_id: calculate_sequence_time(seq + [tarefa], instancia) for m_id, seq in maquinas.items()}
+        maquinas[min(tempos, key=tempos.get)].append(tarefa)
+    return maquinas
+
+
+def instancias_de_teste():
+    """(descrição, instancia) das instâncias de referência e de instâncias geradas em cada armazenamento de setup."""
+    with open(os.path.join(PASTA_REFERENCIA, 'resultados.json'), encoding='utf-8') as f:
+        for arquivo in json.load(f):
+            yield arquivo, carregar_instancia_de_json(os.path.join(PASTA_REFERENCIA, arquivo))
+    for armazenamento in ('float64', 'float32', 'procedural'):
+        for codigo in CODIGOS:
+            yield f"{codigo} {armazenamento}", Instancia.de_cenario(gerar_cenario(codigo, 1, 0, armazenamento_setup=armazenamento))
+    for niveis in NIVEIS_EXTRAS:
+        yield f"HLHLHLH {niveis}", Instancia.de_cenario(gerar_cenario('HLHLHLH', 1, 0, niveis=niveis))
+
+
+class TesteConstrutivas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.instancias = list(instancias_de_teste())
+
+    def assertParticaoValida(self, solucao, instancia):
+        self.assertEqual(sorted(solucao), list(range(1, instancia.n_maquinas + 1)))
+        tarefas = [tarefa for seq in solucao.values() for tarefa in seq]
+        self.assertEqual(sorted(tarefas), list(range(1, instancia.n_jobs + 1)))
+
+    def test_ffd_reproduz_o_original(self):
+        for descricao, instancia in self.instancias:
+            with self.subTest(instancia=descricao):
+                esperado = ffd_original(instancia)
+                self.assertEqual(construtivas.ffd(instancia), esperado)
+                self.assertEqual(solve_with_ffd(instancia), esperado)
+                # Também com uma ordem de alocação qualquer
+                ordem = list(range(1, instancia.n_jobs + 1))
+                random.Random(instancia.n_jobs).shuffle(ordem)
+                self.assertEqual(construtivas.ffd(instancia, ordem), ffd_original(instancia, ordem))
+
+    def test_particao_valida(self):
+        for descricao, instancia in self.instancias:
+            makespans = {}
+            for nome in list(construtivas.HEURISTICAS) + [construtivas.MELHOR]:
+                with self.subTest(instancia=descricao, heuristica=nome):
+                    solucao = construtivas.construir(nome, instancia)
+                    self.assertParticaoValida(solucao, instancia)
+                    makespans[nome] = construtivas.makespan_da_solucao(solucao, instancia)
+                    self.assertEqual(makespans[nome], max(calculate_sequence_time(seq, instancia) for seq in solucao.values()))
+            with self.subTest(instancia=descricao, heuristica=construtivas.MELHOR):
+                self.assertEqual(makespans[construtivas.MELHOR], min(makespans.values()))
+
+    def test_heuristica_desconhecida(self):
+        with self.assertRaises(ValueError):
+            construtivas.construir('nao_existe', self.instancias[0][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
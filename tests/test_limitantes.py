@@ -0,0 +1,129 @@
+# Arquivo: tests/test_limitantes.py
+#
+# Testes dos limitantes inferiores de limitantes.py: o 'ddlb' em lote é
+# idêntico ao calcular_ddlb de cada instância, os limitantes válidos (e o
+# 'melhor') não passam do makespan de nenhuma solução viável, e os resultados
+# não dependem do armazenamento da matriz de setup (float64, float32 ou
+# procedural) nem do tamanho dos blocos em que ela é lida.
+#
+# O 'ddlb' é o DDLB do artigo e pode superar o ótimo com setups assimétricos
+# (ver limitantes.py); por isso ele só é comparado com o calcular_ddlb.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import itertools
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import limitantes
+import construtivas
+from instancia import Instancia
+from run_generator import gerar_cenario, todos_os_codigos
+from local_search2 import calcular_ddlb, calculate_sequence_time, resolver_instancia
+from limitantes import LIMITANTES_VALIDOS, calcular_limitantes, limitantes_da_instancia
+
+VALIDOS = list(LIMITANTES_VALIDOS) + ['melhor']
+# Tolerância para a soma em ordens diferentes
+TOLERANCIA = 1e-9
+
+
+def gerar(codigo, armazenamento='float64', replica=1):
+    return Instancia.de_cenario(gerar_cenario(codigo, replica, 0, armazenamento_setup=armazenamento))
+
+
+def otimo(instancia):
+    """Makespan ótimo por força bruta: todas as ordens das tarefas e dos separadores de máquina."""
+    melhor = np.inf
+    separadores = [0] * (instancia.n_maquinas - 1)
+    for permutacao in set(itertools.permutations(list(range(1, instancia.n_jobs + 1)) + separadores)):
+        sequencias = [[]]
+        for tarefa in permutacao:
+            if tarefa == 0:
+                sequencias.append([])
+            else:
+                sequencias[-1].append(tarefa)
+        melhor = min(melhor, max(calculate_sequence_time(seq, instancia) for seq in sequencias))
+    return melhor
+
+
+def instancia_aleatoria(rng, simetrica):
+    n, m = int(rng.integers(1, 6)), int(rng.integers(1, 4))
+    setup = rng.uniform(0, 100, (n, n))
+    if simetrica:
+        setup = (setup + setup.T) / 2
+    np.fill_diagonal(setup, np.inf)
+    liberacao = rng.uniform(0, 200, n) * rng.integers(0, 2)
+    return Instancia({'n_jobs': n, 'n_maquinas': m}, rng.uniform(1, 100, n), setup, liberacao)
+
+
+class TesteLimitantes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Os 128 códigos em float64 e parte deles nos outros armazenamentos
+        codigos = todos_os_codigos()
+        cls.instancias = {('float64', codigo): gerar(codigo) for codigo in codigos}
+        for armazenamento in ('float32', 'procedural'):
+            cls.instancias.update({(armazenamento, codigo): gerar(codigo, armazenamento) for codigo in codigos[::9]})
+
+    def test_ddlb_igual_ao_calcular_ddlb(self):
+        chaves = list(self.instancias)
+        ddlb = calcular_limitantes([self.instancias[chave] for chave in chaves], ['ddlb'])['ddlb']
+        for chave, valor in zip(chaves, ddlb.tolist()):
+            with self.subTest(instancia=chave):
+                esperado = calcular_ddlb(self.instancias[chave])
+                self.assertEqual(valor, esperado)
+                self.assertEqual(limitantes_da_instancia(self.instancias[chave])['ddlb'], esperado)
+
+    def test_limitantes_validos_abaixo_de_solucoes_viaveis(self):
+        valores = calcular_limitantes(list(self.instancias.values()))
+        for i, (chave, instancia) in enumerate(self.instancias.items()):
+            # O menor makespan entre as heurísticas construtivas (todas são soluções viáveis)
+            viavel = min(construtivas.makespan_da_solucao(heuristica(instancia), instancia)
+                         for heuristica in construtivas.HEURISTICAS.values())
+            if instancia.n_jobs <= 30:
+                viavel = min(viavel, resolver_instancia(instancia)["makespan_final"])
+            for nome in VALIDOS:
+                with self.subTest(instancia=chave, limitante=nome):
+                    self.assertLessEqual(valores[nome][i], viavel + TOLERANCIA)
+            self.assertEqual(valores['melhor'][i], max(valores[nome][i] for nome in LIMITANTES_VALIDOS))
+
+    def test_limitantes_validos_abaixo_do_otimo(self):
+        rng = np.random.default_rng(1)
+        for k in range(40):
+            instancia = instancia_aleatoria(rng, simetrica=k % 2 == 0)
+            valores = limitantes_da_instancia(instancia)
+            melhor_solucao = otimo(instancia)
+            for nome in VALIDOS:
+                with self.subTest(instancia=k, limitante=nome):
+                    self.assertLessEqual(valores[nome], melhor_solucao + TOLERANCIA)
+
+    def test_armazenamento_e_blocos(self):
+        for armazenamento in ('float32', 'procedural'):
+            instancia = gerar('HHHHHHH', armazenamento)
+            # A mesma matriz, lida por inteiro como um array denso
+            setup = instancia.setup.matriz_tarefas() if armazenamento == 'procedural' else instancia.setup[1:]
+            densa = Instancia(instancia.config, instancia.processamento, setup, instancia.liberacao, dtype_setup=setup.dtype)
+            em_lote = calcular_limitantes([instancia, densa])
+            # Blocos de poucas linhas: cada instância é percorrida aos pedaços
+            with mock.patch.object(limitantes, 'BYTES_POR_BLOCO', 4000):
+                em_blocos = calcular_limitantes([instancia, densa])
+            for nome in em_lote:
+                with self.subTest(armazenamento=armazenamento, limitante=nome):
+                    self.assertEqual(em_lote[nome][0], em_lote[nome][1])
+                    np.testing.assert_array_equal(em_lote[nome], em_blocos[nome])
+
+    def test_limitante_desconhecido(self):
+        with self.assertRaises(ValueError):
+            calcular_limitantes([gerar('LLLLLLL')], ['nao_existe'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# Arquivo: tests/test_metaheuristicas.py
+#
+# Teste do portfólio de metaheurísticas (metaheuristicas.resolver_portfolio)
+# com métricas: as avaliações e os movimentos aceitos dos processos chegam à
+# Metricas do processo principal; sem métricas, o portfólio funciona como
+# antes.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instancia import Instancia
+from run_generator import gerar_cenario
+from instrumentacao import Metricas
+from metaheuristicas import ESTRATEGIAS, resolver_portfolio
+from construtivas import makespan_da_solucao
+
+# Duração de cada portfólio do teste, em segundos
+TEMPO_LIMITE = 0.5
+
+
+class TestePortfolio(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.instancia = Instancia.de_cenario(gerar_cenario('HHHHHHH', 1, 0))
+
+    def test_metricas_somam_os_processos(self):
+        metricas = Metricas()
+        resultado = resolver_portfolio(self.instancia, TEMPO_LIMITE, workers=2, seed=1, metricas=metricas)
+        self.assertEqual(len(resultado["processos"]), len(ESTRATEGIAS))
+        self.assertTrue(all(r["erro"] is None for r in resultado["processos"]))
+        self.assertGreater(metricas.total_avaliacoes, 0)
+        self.assertGreater(sum(metricas.aceitos.values()), 0)
+        self.assertIn('busca_local', metricas.fases_s)
+        # A trajetória vai da solução inicial (o FFD) à melhor solução do portfólio
+        self.assertEqual(len(metricas.trajetoria), 2)
+        self.assertGreaterEqual(metricas.trajetoria[0][1], metricas.trajetoria[1][1])
+        self.assertEqual(metricas.trajetoria[1][1], resultado["makespan"])
+        self.assertAlmostEqual(makespan_da_solucao(resultado["solucao"], self.instancia), resultado["makespan"])
+
+    def test_sem_metricas(self):
+        resultado = resolver_portfolio(self.instancia, TEMPO_LIMITE, workers=1, seed=1)
+        self.assertEqual(len(resultado["processos"]), len(ESTRATEGIAS))
+        self.assertTrue(all(r["erro"] is None for r in resultado["processos"]))
+        self.assertAlmostEqual(makespan_da_solucao(resultado["solucao"], self.instancia), resultado["makespan"])
+
+
+if __name__ == "__main__":
+    unittest.main()
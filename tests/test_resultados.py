@@ -0,0 +1,95 @@
+# Arquivo: tests/test_resultados.py
+#
+# Teste da retomada (--resume) pelos arquivos de resultados: um registro
+# final escrito pela metade por uma interrupção não conta como instância
+# resolvida e é descartado antes de anexar os novos registros.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resultados import EscritorResultados, ler_registros, instancias_concluidas
+
+
+def registro(arquivo, status="ok"):
+    return {"arquivo": arquivo, "codigo_cenario": arquivo[:7], "replica": 1, "makespan_inicial": 120.5,
+            "makespan_final": 100.25, "ddlb": 90.0, "razao_ms_ddlb": 1.1139, "iteracoes": 7, "tempo_s": 0.5,
+            "status": status}
+
+
+class TesteRetomada(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def gravar(self, nome, registros):
+        caminho = os.path.join(self.pasta, nome)
+        with EscritorResultados(caminho) as escritor:
+            for r in registros:
+                escritor.escrever(r)
+        return caminho
+
+    def truncar(self, caminho, tamanho):
+        with open(caminho, 'r+b') as f:
+            f.truncate(tamanho)
+
+    def test_registro_truncado(self):
+        registros = [registro("LLLLLLL_1.json"), registro("LLLLLLL_2.json", "tempo_esgotado"), registro("LLLLLLL_3.json")]
+        for nome in ('r.csv', 'r.jsonl'):
+            caminho = self.gravar(nome, registros)
+            completo = os.path.getsize(caminho)
+            ultimo = len(open(caminho, 'rb').read().rstrip(b"\n").rsplit(b"\n", 1)[1]) + 1
+            # Cortes em vários pontos do último registro, inclusive logo antes da quebra de linha final
+            for corte in (5, ultimo // 2, ultimo - 1):
+                with self.subTest(arquivo=nome, corte=corte):
+                    caminho = self.gravar(nome, registros)
+                    self.truncar(caminho, completo - corte)
+                    self.assertEqual(instancias_concluidas(caminho), {"LLLLLLL_1.json", "LLLLLLL_2.json"})
+
+                    # O registro truncado é descartado e o novo começa em linha própria
+                    with EscritorResultados(caminho) as escritor:
+                        escritor.escrever(registro("LLLLLLL_3.json"))
+                    lidos = ler_registros(caminho)
+                    self.assertEqual([r["arquivo"] for r in lidos], ["LLLLLLL_1.json", "LLLLLLL_2.json", "LLLLLLL_3.json"])
+                    self.assertEqual([r["status"] for r in lidos], ["ok", "tempo_esgotado", "ok"])
+                    self.assertEqual(os.path.getsize(caminho), completo)
+                    os.remove(caminho)
+
+    def test_status_concluidos(self):
+        caminho = self.gravar('r.csv', [registro("A_1.json"), registro("A_2.json", "erro: falhou"),
+                                        registro("A_3.json", None), registro("A_4.json", "tempo_esgotado")])
+        self.assertEqual(instancias_concluidas(caminho), {"A_1.json", "A_4.json"})
+
+    def test_erro_com_quebra_de_linha_no_csv(self):
+        # A mensagem de erro tem quebras de linha, que ficam entre aspas no CSV
+        registros = [registro("A_1.json"), registro("A_2.json", "erro: linha 1\nlinha 2\nlinha 3")]
+        caminho = self.gravar('r.csv', registros)
+        self.assertEqual([r["status"] for r in ler_registros(caminho)], ["ok", "erro: linha 1\nlinha 2\nlinha 3"])
+        # Corte logo depois da primeira quebra de linha da mensagem
+        dados = open(caminho, 'rb').read()
+        self.truncar(caminho, dados.index(b"linha 1\n") + len(b"linha 1\n"))
+        self.assertEqual([r["arquivo"] for r in ler_registros(caminho)], ["A_1.json"])
+        with EscritorResultados(caminho) as escritor:
+            escritor.escrever(registro("A_2.json"))
+        self.assertEqual([(r["arquivo"], r["status"]) for r in ler_registros(caminho)], [("A_1.json", "ok"), ("A_2.json", "ok")])
+
+    def test_cabecalho_truncado(self):
+        caminho = self.gravar('r.csv', [])
+        self.truncar(caminho, 10)
+        with EscritorResultados(caminho) as escritor:
+            escritor.escrever(registro("A_1.json"))
+        self.assertEqual([r["arquivo"] for r in ler_registros(caminho)], ["A_1.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
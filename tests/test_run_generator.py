@@ -0,0 +1,87 @@
+# Arquivo: tests/test_run_generator.py
+#
+# Teste da reprodutibilidade do run_generator.py: o mesmo estudo (os 128
+# códigos, com poucas máquinas e tarefas para ser rápido) gerado com 1 e 2
+# processos, em .json e em pacote binário, e retomado com --resume depois de
+# apagar parte das instâncias, deve produzir arquivos idênticos byte a byte.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import sys
+import glob
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Estudo pequeno: 2 réplicas dos 128 códigos, com 3 máquinas e 4 tarefas por máquina
+ARGUMENTOS_ESTUDO = ['--replicas', '2', '--n_maquinas', '3', '--n_medio_jobs_maquina', '4']
+
+
+def gerar(pasta_saida, *argumentos):
+    subprocess.run([sys.executable, os.path.join(RAIZ, 'run_generator.py'), '-y', '--pasta_saida', pasta_saida,
+                    *ARGUMENTOS_ESTUDO, *argumentos],
+                   cwd=RAIZ, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def conteudo_da_pasta(pasta):
+    """Dicionário caminho relativo -> bytes de todos os arquivos da pasta."""
+    conteudo = {}
+    for caminho in sorted(glob.glob(os.path.join(pasta, '**', '*'), recursive=True)):
+        if os.path.isfile(caminho):
+            with open(caminho, 'rb') as f:
+                conteudo[os.path.relpath(caminho, pasta)] = f.read()
+    return conteudo
+
+
+class TesteReprodutibilidadeGerador(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def assertPastasIguais(self, pasta_a, pasta_b):
+        conteudo_a, conteudo_b = conteudo_da_pasta(pasta_a), conteudo_da_pasta(pasta_b)
+        self.assertEqual(sorted(conteudo_a), sorted(conteudo_b))
+        diferentes = [nome for nome in conteudo_a if conteudo_a[nome] != conteudo_b[nome]]
+        self.assertEqual(diferentes, [])
+
+    def test_json_com_1_e_2_processos(self):
+        gerar(self.caminho('um'), '--seed', '7', '--workers', '1')
+        gerar(self.caminho('dois'), '--seed', '7', '--workers', '2')
+        self.assertEqual(len(glob.glob(os.path.join(self.caminho('um'), '*', '*.json'))), 256)
+        self.assertPastasIguais(self.caminho('um'), self.caminho('dois'))
+
+    def test_binario_com_1_e_2_processos(self):
+        gerar(self.caminho('um'), '--seed', '7', '--workers', '1', '--formato', 'binario')
+        gerar(self.caminho('dois'), '--seed', '7', '--workers', '2', '--formato', 'binario')
+        self.assertPastasIguais(self.caminho('um'), self.caminho('dois'))
+
+    def test_resume(self):
+        # Sem --seed: a semente sorteada fica gravada e é reaproveitada no --resume
+        gerar(self.caminho('completo'), '--workers', '2')
+        shutil.copytree(self.caminho('completo'), self.caminho('retomado'))
+        apagados = sorted(glob.glob(os.path.join(self.caminho('retomado'), '*', '*.json')))[::5]
+        for caminho in apagados:
+            os.remove(caminho)
+        gerar(self.caminho('retomado'), '--workers', '2', '--resume')
+        self.assertPastasIguais(self.caminho('completo'), self.caminho('retomado'))
+
+    def test_sementes_diferentes(self):
+        gerar(self.caminho('a'), '--seed', '7', '--cenario', 'HHHHHHH')
+        gerar(self.caminho('b'), '--seed', '8', '--cenario', 'HHHHHHH')
+        self.assertNotEqual(conteudo_da_pasta(self.caminho('a'))[os.path.join('HHHHHHH', 'HHHHHHH_1.json')],
+                            conteudo_da_pasta(self.caminho('b'))[os.path.join('HHHHHHH', 'HHHHHHH_1.json')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# Arquivo: tests/test_servidor_solver.py
+#
+# Teste do servidor_solver.py sem rede externa: inicia o servidor em uma porta
+# livre de 127.0.0.1 (--porta 0), com um único processo e fila de duas
+# tarefas, e percorre pelo ClienteSolver o envio, a consulta, o cancelamento,
+# a resposta 503 com a fila cheia e o encerramento.
+#
+# Uso:
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from cliente_solver import ClienteSolver
+from run_generator import gerar_cenario, salvar_cenario
+
+# Tempo máximo de espera por cada mudança de estado do servidor
+ESPERA_MAXIMA = 60
+
+
+class TesteServidorSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pasta = tempfile.mkdtemp()
+        # Instância pequena, resolvida em milissegundos, e uma grande (400
+        # tarefas), que mantém o processo ocupado até ser cancelada
+        cls.pequena = os.path.join(cls.pasta, 'pequena.json')
+        salvar_cenario(gerar_cenario('LLLLLLL', 1, 0), cls.pequena)
+        cls.grande = os.path.join(cls.pasta, 'grande.json')
+        salvar_cenario(gerar_cenario('HHHHHHH', 1, 0, niveis={'n_maquinas': 20, 'n_medio_jobs_maquina': 20}), cls.grande)
+
+        cls.processo = subprocess.Popen(
+            [sys.executable, os.path.join(RAIZ, 'servidor_solver.py'), '--porta', '0', '--workers', '1', '--max_fila', '2'],
+            cwd=RAIZ, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        linha = cls.processo.stdout.readline()
+        porta = re.search(r'127\.0\.0\.1:(\d+)', linha)
+        if porta is None:
+            cls.processo.kill()
+            raise RuntimeError(f"O servidor não informou a porta: {linha!r}")
+        cls.cliente = ClienteSolver(f'http://127.0.0.1:{porta.group(1)}', tempo_maximo=ESPERA_MAXIMA)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.processo.poll() is None:
+            cls.processo.kill()
+            cls.processo.wait()
+        cls.processo.stdout.close()
+        shutil.rmtree(cls.pasta, ignore_errors=True)
+
+    def aguardar_estado(self, id_tarefa, estados):
+        """Consulta a tarefa até que o seu estado esteja em `estados`."""
+        prazo = time.monotonic() + ESPERA_MAXIMA
+        while time.monotonic() < prazo:
+            resposta = self.cliente.tarefa(id_tarefa)
+            if resposta["estado"] in estados:
+                return resposta
+            time.sleep(0.05)
+        self.fail(f"A tarefa {id_tarefa} não chegou a {estados}; último estado: {resposta['estado']}")
+
+    def test_servidor(self):
+        # Envio sem esperar e consulta até a conclusão
+        resposta = self.cliente.resolver(self.pequena, esperar=False)
+        self.assertNotIn("codigo_http", resposta)
+        self.assertIn(resposta["estado"], ('na_fila', 'executando', 'concluida'))
+        concluida = self.aguardar_estado(resposta["id"], ('concluida', 'erro'))
+        self.assertEqual(concluida["estado"], 'concluida')
+        self.assertEqual(concluida["resultado"]["status"], 'ok')
+        self.assertGreater(concluida["resultado"]["makespan_final"], 0)
+
+        # Envio esperando o resultado
+        resposta = self.cliente.resolver(self.pequena, estrategia='primeira_candidatos')
+        self.assertEqual(resposta["estado"], 'concluida')
+        self.assertEqual(resposta["pedido"]["estrategia"], 'primeira_candidatos')
+
+        # Pedido inválido e tarefa inexistente
+        self.assertEqual(self.cliente.resolver(os.path.join(self.pasta, 'nao_existe.json'))["codigo_http"], 400)
+        self.assertEqual(self.cliente.tarefa('999')["codigo_http"], 404)
+
+        # Uma tarefa em execução e outra na fila ocupam as duas vagas: o próximo pedido recebe 503
+        em_execucao = self.cliente.resolver(self.grande, esperar=False, tempo_limite=ESPERA_MAXIMA)["id"]
+        self.aguardar_estado(em_execucao, ('executando',))
+        na_fila = self.cliente.resolver(self.grande, esperar=False, tempo_limite=ESPERA_MAXIMA)["id"]
+        self.assertEqual(self.cliente.tarefa(na_fila)["estado"], 'na_fila')
+        self.assertEqual(self.cliente.resolver(self.pequena, esperar=False)["codigo_http"], 503)
+        estado = self.cliente.estado()
+        self.assertEqual((estado["executando"], estado["na_fila"], estado["vagas_livres"]), (1, 1, 0))
+
+        # Cancelamento da tarefa na fila e da tarefa em execução. A da fila
+        # pode já ter sido entregue ao processo, e então só é descartada
+        # quando ele fica livre; a em execução devolve a melhor solução até ali
+        self.assertIn(self.cliente.cancelar(na_fila)["estado"], ('cancelando', 'cancelada'))
+        self.assertIn(self.cliente.cancelar(em_execucao)["estado"], ('cancelando', 'cancelada'))
+        cancelada = self.aguardar_estado(em_execucao, ('cancelada',))
+        self.assertEqual(cancelada["resultado"]["status"], 'cancelada')
+        self.assertLess(cancelada["resultado"]["tempo_s"], ESPERA_MAXIMA)
+        self.assertNotIn("resultado", self.aguardar_estado(na_fila, ('cancelada',)))
+
+        # Com as vagas liberadas, a fila volta a aceitar pedidos
+        self.assertEqual(self.cliente.estado()["vagas_livres"], 2)
+        self.assertEqual(self.cliente.resolver(self.pequena)["estado"], 'concluida')
+
+        # Encerramento: o processo do servidor termina sozinho
+        self.assertEqual(self.cliente.encerrar()["mensagem"], "Servidor encerrado.")
+        self.assertEqual(self.processo.wait(timeout=ESPERA_MAXIMA), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+# Arquivo: vizinhanca_vetorizada.py
+
+from functools import lru_cache
+
+import numpy as np
+
+from avaliacao_incremental import TRANSFERENCIA, TROCA_INTER, TROCA_INTRA
+
+
+def tempos_em_lote(instancia, sequencias, concl=None, ultima=None):
+    """
+    Calcula o tempo de conclusão de várias sequências de uma só vez.
+
+    O tempo de conclusão é a recorrência max-plus
+        C_k = max(C_{k-1}, r[j_k]) + s[j_{k-1}][j_k] + p[j_k],
+    aplicada coluna a coluna sobre todas as linhas do array 2-D `sequencias`
+    (B sequências de mesmo tamanho L, com ids de tarefa de 1 a N_JOBS). As
+    operações são feitas na mesma ordem de `calculate_sequence_time`, então os
+    resultados são idênticos aos do cálculo escalar.
+
+    `concl` e `ultima` (arrays de tamanho B) permitem continuar o cálculo a
+    partir de um prefixo já conhecido; por padrão a máquina parte do estado
+    inicial (tempo 0, linha 0 da matriz de setup).
+    """
+    sequencias = np.asarray(sequencias, dtype=np.intp)
+    n_seq = sequencias.shape[0]
+    concl = np.zeros(n_seq) if concl is None else np.asarray(concl, dtype=np.float64)
+    ultima = np.zeros(n_seq, dtype=np.intp) if ultima is None else np.asarray(ultima, dtype=np.intp)
+    setup, proc, lib = instancia.setup, instancia.processamento, instancia.liberacao
+    for coluna in range(sequencias.shape[1]):
+        tarefas = sequencias[:, coluna]
+        concl = np.maximum(concl, lib[tarefas - 1]) + setup[ultima, tarefas - 1] + proc[tarefas - 1]
+        ultima = tarefas
+    return concl
+
+
+def _maior_tempo_exceto_pares(tempos):
+    """outros[a, b]: maior tempo entre as máquinas diferentes de a e b (0 se não houver)."""
+    m = tempos.size
+    excluidas = np.eye(m, dtype=bool)[:, None, :] | np.eye(m, dtype=bool)[None, :, :]
+    return np.where(excluidas, -np.inf, tempos[None, None, :]).max(axis=2, initial=0)
+
+
+@lru_cache(maxsize=None)
+def _indices_sem_cada_posicao(k):
+    """Linha i: as posições 0..k-1 sem a posição i (array k x k-1)."""
+    return np.array([[c for c in range(k) if c != i] for i in range(k)], dtype=np.intp).reshape(k, k - 1)
+
+
+@lru_cache(maxsize=None)
+def _indices_troca_intra(k):
+    """Linha de cada par (i, j), i < j em ordem de linha: permutação das posições com i e j trocadas."""
+    pos_i, pos_j = np.triu_indices(k, k=1)
+    linhas = np.arange(pos_i.size)
+    indices = np.tile(np.arange(k, dtype=np.intp), (pos_i.size, 1))
+    indices[linhas, pos_i], indices[linhas, pos_j] = pos_j, pos_i
+    return indices, pos_i, pos_j
+
+
+class _Lotes:
+    """
+    Agrupa as sequências candidatas por tamanho para que todas as de mesmo
+    tamanho sejam avaliadas em uma única varredura de `tempos_em_lote`.
+    """
+    def __init__(self, instancia):
+        self.instancia = instancia
+        self.pendentes = {}
+        self.resultados = {}
+
+    def registrar(self, sequencias):
+        tamanho = sequencias.shape[1]
+        grupo = self.pendentes.setdefault(tamanho, [])
+        inicio = sum(len(s) for s in grupo)
+        grupo.append(sequencias)
+        return tamanho, inicio, inicio + len(sequencias)
+
+    def calcular(self):
+        for tamanho, grupo in self.pendentes.items():
+            self.resultados[tamanho] = tempos_em_lote(self.instancia, np.concatenate(grupo))
+
+    def __getitem__(self, referencia):
+        tamanho, inicio, fim = referencia
+        return self.resultados[tamanho][inicio:fim]
+
+
+def buscar_melhor_movimento(avaliador):
+    """
+    Versão vetorizada de AvaliadorIncremental.buscar_melhor_movimento: cada
+    vizinhança é avaliada como um conjunto de operações sobre arrays em vez
+    de um laço Python por vizinho. Todas as sequências candidatas de mesmo
+    tamanho, de todas as vizinhanças, são calculadas em uma única varredura.
+
+    Os valores de cada vizinhança são reunidos na mesma ordem de varredura da
+    busca local original; o vizinho escolhido é a primeira ocorrência do menor
+    makespan (np.argmin), e entre vizinhanças a comparação é estrita, na ordem
+    transferência, troca inter, troca intra. Isso reproduz exatamente o
+    vizinho escolhido pela regra de melhor melhoria.
+    """
+    instancia = avaliador.instancia
+    setup, proc, lib = instancia.setup, instancia.processamento, instancia.liberacao
+    ids = avaliador.machine_ids
+    seqs = [np.array(avaliador.solucao[m_id], dtype=np.intp) for m_id in ids]
+    tempos = np.array([avaliador.tempo_maquina(m_id) for m_id in ids], dtype=np.float64)
+    if tempos.size == 0:
+        return None
+
+    melhor_makespan = tempos.max()
+    criticas = np.flatnonzero(tempos == melhor_makespan)
+    if criticas.size > 2:
+        return None
+    criticas = set(criticas.tolist())
+    outros = _maior_tempo_exceto_pares(tempos)
+    ultimas = np.array([seq[-1] if seq.size else 0 for seq in seqs], dtype=np.intp)
+    m = len(ids)
+    lotes = _Lotes(instancia)
+
+    # --- Montagem das sequências candidatas de cada vizinhança ---
+    transferencias = []
+    for a in range(m):
+        k = seqs[a].size
+        destinos = [b for b in range(m) if b != a and criticas <= {a, b}]
+        if k == 0 or not destinos: continue
+        transferencias.append((a, np.array(destinos, dtype=np.intp), lotes.registrar(seqs[a][_indices_sem_cada_posicao(k)])))
+
+    trocas_inter = []
+    for a in range(m):
+        for b in range(a + 1, m):
+            k1, k2 = seqs[a].size, seqs[b].size
+            if k1 == 0 or k2 == 0 or not criticas <= {a, b}: continue
+            # Linha (i, j) de cada matriz: sequência com a posição trocada
+            novas_1 = np.repeat(seqs[a][None, :], k1 * k2, axis=0)
+            novas_1[np.arange(k1 * k2), np.repeat(np.arange(k1), k2)] = np.tile(seqs[b], k1)
+            novas_2 = np.repeat(seqs[b][None, :], k1 * k2, axis=0)
+            novas_2[np.arange(k1 * k2), np.tile(np.arange(k2), k1)] = np.repeat(seqs[a], k2)
+            trocas_inter.append((a, b, k2, lotes.registrar(novas_1), lotes.registrar(novas_2)))
+
+    trocas_intra = []
+    for a in range(m):
+        k = seqs[a].size
+        if k < 2 or not criticas <= {a}: continue
+        indices, pos_i, pos_j = _indices_troca_intra(k)
+        trocas_intra.append((a, pos_i, pos_j, lotes.registrar(seqs[a][indices])))
+
+    lotes.calcular()
+    if avaliador.contar:
+        avaliador.avaliacoes[TRANSFERENCIA] += sum(len(destinos) * seqs[a].size for a, destinos, _ in transferencias)
+        avaliador.avaliacoes[TROCA_INTER] += sum(ref_1[2] - ref_1[1] for _, _, _, ref_1, _ in trocas_inter)
+        avaliador.avaliacoes[TROCA_INTRA] += sum(pos_i.size for _, pos_i, _, _ in trocas_intra)
+    melhor_movimento = None
+
+    # Vizinhança 1: Transferência (ordem m_from, m_to, i)
+    for a, destinos, ref_from in transferencias:
+        k = seqs[a].size
+        novo_from = lotes[ref_from]
+        tarefas = seqs[a] - 1
+        novo_to = (np.maximum(tempos[destinos][:, None], lib[tarefas][None, :])
+                   + setup[ultimas[destinos][:, None], tarefas[None, :]] + proc[tarefas][None, :])
+        valores = np.maximum(np.maximum(outros[a, destinos][:, None], novo_from[None, :]), novo_to)
+        pos = int(np.argmin(valores))
+        if valores.flat[pos] < melhor_makespan:
+            melhor_makespan = valores.flat[pos]
+            linha, i = divmod(pos, k)
+            melhor_movimento = (TRANSFERENCIA, ids[a], i, ids[int(destinos[linha])])
+
+    # Vizinhança 2: Troca Inter-Máquinas (ordem m1 < m2, i, j)
+    for a, b, k2, ref_1, ref_2 in trocas_inter:
+        valores = np.maximum(np.maximum(outros[a, b], lotes[ref_1]), lotes[ref_2])
+        pos = int(np.argmin(valores))
+        if valores[pos] < melhor_makespan:
+            melhor_makespan = valores[pos]
+            i, j = divmod(pos, k2)
+            melhor_movimento = (TROCA_INTER, ids[a], i, ids[b], j)
+
+    # Vizinhança 3: Troca Intra-Máquina (ordem m, i < j)
+    for a, pos_i, pos_j, ref in trocas_intra:
+        valores = np.maximum(outros[a, a], lotes[ref])
+        pos = int(np.argmin(valores))
+        if valores[pos] < melhor_makespan:
+            melhor_makespan = valores[pos]
+            melhor_movimento = (TROCA_INTRA, ids[a], int(pos_i[pos]), int(pos_j[pos]))
+
+    if melhor_movimento is None:
+        return None
+    return float(melhor_makespan), melhor_movimento